@@ -16,6 +16,7 @@ INCOMPLETE_BASE_DELAY = 5       # Base delay for incomplete exit backoff (second
 CONTEXT_THRESHOLD = 85          # % context fill to trigger wrap-up warning
 MIN_SUCCESSOR_TIME = 10 * 60    # Don't spawn successor with <10 min remaining
 CONTEXT_WINDOW = 200000         # Opus 4.6 context window size
+WAKE_TOKEN_BUDGET = 4000        # Max estimated tokens injected per wake message
 
 # Log settings
 LOG_MAX_SIZE = 512000           # 500KB
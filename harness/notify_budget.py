@@ -0,0 +1,130 @@
+"""Token-budgeted wake messages.
+
+A wake after a long sleep can carry dozens of Slack channels. Instead of
+pasting everything into the resumed session, rank the pieces by priority
+and recency, keep what fits the budget, trim the rest to their newest
+lines and summarize anything that still doesn't fit ("+37 more in #general").
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from notify_format import format_notifications
+from notify_units import Unit, split_units
+
+MIN_CLIP_CHARS = 40     # Below this, show a unit's head alone rather than a clipped line
+FOOTER_RESERVE = 160    # Chars of budget held back for the omission footer
+SEPARATOR = "\n\n---\n\n"
+
+# Lower sorts first. Reminders and direct chat outrank channel chatter.
+PRIORITY = {"reminder": 0, "chat": 1, "slack": 2, "email": 3}
+_OTHER = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap local token estimate: ~4 UTF-8 bytes per token."""
+    return (len(text.encode("utf-8")) + 3) // 4
+
+
+@dataclass
+class BudgetedWake:
+    """Result of formatting notifications under a budget."""
+    text: str
+    size: int
+    dropped_size: int = 0
+    omitted: list[str] = field(default_factory=list)
+    slack_shown: dict[str, set[str]] = field(default_factory=dict)  # Rendered ts per channel
+
+
+def _fit(unit: Unit, remaining: int, measure: Callable[[str], int]) -> tuple[str, int] | None:
+    """Largest rendering of unit that fits remaining, with its kept line count.
+
+    Drops the oldest lines first. When not even one whole line fits, that
+    line is clipped to the budget left instead of dropping it.
+    """
+    for keep in range(len(unit.lines), 0, -1):
+        text = unit.render(keep)
+        if measure(text) <= remaining:
+            return text, keep
+    if unit.lines:  # Start from a proportional guess, shrink until it fits
+        whole = unit.render(1)
+        clip = len(whole) * remaining // max(measure(whole), 1)
+        while clip >= MIN_CLIP_CHARS:
+            text = unit.render(1, clip)
+            if measure(text) <= remaining:
+                return text, 1
+            clip = clip * 9 // 10
+    text = unit.render(0)
+    return (text, 0) if text.strip() and measure(text) <= remaining else None
+
+
+def _assemble(kept: list[tuple[Unit, str, int]]) -> list[str]:
+    """Group kept units back into the usual wake-message sections."""
+    parts, slack = [], []
+    for unit, text, _ in kept:
+        if unit.kind == "slack":
+            slack.append(text)
+        else:
+            parts.append(text.lstrip("\n"))
+    if slack:
+        parts.append("New Slack messages:\n" + "\n\n".join(slack))
+    return parts
+
+
+def format_budgeted(notifications: list, budget: int,
+                    measure: Callable[[str], int] = estimate_tokens,
+                    unit: str = "tokens") -> BudgetedWake:
+    """Format notifications so the result fits within budget.
+
+    budget is in the units of measure — tokens by default, or characters
+    with measure=len, unit="chars". Output is identical to
+    format_notifications() when everything fits.
+    """
+    full = format_notifications(notifications)
+    units = split_units(notifications)
+    if measure(full) <= budget:
+        return BudgetedWake(full, measure(full),
+                            slack_shown=_slack_shown((u, len(u.lines)) for u in units))
+
+    units.sort(key=lambda u: (PRIORITY.get(u.kind, _OTHER), -u.recency))
+    remaining = max(budget - measure("x" * FOOTER_RESERVE), 0)
+    kept, omitted = [], []
+    for u in units:  # Once a unit doesn't fit, nothing ranked below it goes ahead
+        fit = None if omitted else _fit(u, remaining, measure)
+        if fit is None:
+            omitted.append(u)
+            continue
+        kept.append((u, *fit))
+        remaining -= measure(fit[0]) + measure(SEPARATOR)
+
+    while True:  # Footer and section headers are estimates; trim until it fits
+        dropped = sum(measure(u.render(len(u.lines))) for u in omitted)
+        dropped += sum(max(measure(u.render(len(u.lines))) - measure(t), 0) for u, t, _ in kept)
+        text = _render(kept, omitted, dropped, unit)
+        if measure(text) <= budget or not kept:
+            break
+        omitted.insert(0, kept.pop()[0])  # Keep the footer in rank order
+    return BudgetedWake(text, measure(text), dropped, [_label(u) for u in omitted],
+                        _slack_shown((u, keep) for u, _, keep in kept))
+
+
+def _slack_shown(kept) -> dict[str, set[str]]:
+    return {u.key: u.shown(keep) for u, keep in kept if u.kind == "slack"}
+
+
+def _label(u: Unit) -> str:
+    return u.head.strip().rstrip(":") or f"{u.kind} (check unread to view)"
+
+
+def _render(kept: list, omitted: list[Unit], dropped: int, unit: str) -> str:
+    parts = _assemble(kept)
+    if omitted:
+        labels = [_label(u) for u in omitted]
+        parts.append(f"(+{len(labels)} more notification(s) not shown: "
+                     + ", ".join(labels[:10]) + (", …" if len(labels) > 10 else "") + ")")
+    text = SEPARATOR.join(parts)
+    if dropped:
+        text += f"\n\n(Wake message trimmed to budget: ~{dropped} {unit} dropped.)"
+    return text
@@ -2,6 +2,98 @@
 
 from __future__ import annotations
 
+# Slack message ts values already delivered in a wake, per channel id.
+# Lives as long as the harness process, like SleepManager's dedup keys.
+_delivered_ts: dict[str, set[str]] = {}
+
+
+def _slack_key(ch: dict) -> str:
+    return ch.get("id") or ch.get("name", "?")
+
+
+def drop_delivered_slack(notifications: list) -> list:
+    """Strip Slack previews already shown in earlier wakes.
+
+    Returns a copy of notifications where each Slack channel keeps only
+    messages not delivered before, with the rest counted in "seen". Nothing
+    is marked delivered here; see mark_delivered_slack.
+    """
+    out = []
+    for n in notifications:
+        if n.get("source") != "slack" or not n.get("channels"):
+            out.append(n)
+            continue
+        channels = []
+        for ch in n["channels"]:
+            msgs = ch.get("messages")
+            if not msgs:
+                channels.append(ch)
+                continue
+            delivered = _delivered_ts.get(_slack_key(ch), set())
+            fresh = [m for m in msgs if m.get("ts") not in delivered]
+            seen = max(ch.get("unread", len(msgs)) - len(fresh), 0)
+            channels.append(dict(ch, messages=fresh, seen=seen))
+        out.append(dict(n, channels=channels))
+    return out
+
+
+def _shown_ts(ch: dict, shown: dict[str, set[str]] | None) -> set[str]:
+    """ts of the channel's previews the wake showed (all if shown is None).
+
+    Previews without text render nothing, so they count as shown.
+    """
+    msgs = ch.get("messages") or []
+    if shown is None:
+        return {m.get("ts") for m in msgs}
+    rendered = shown.get(_slack_key(ch), set())
+    return {m.get("ts") for m in msgs if m.get("ts") in rendered or not m.get("text", "").strip()}
+
+
+def mark_delivered_slack(notifications: list, shown: dict[str, set[str]] | None = None) -> None:
+    """Record the Slack previews in shown (ts per channel, all if None) as delivered.
+
+    Call with the ts the wake message actually rendered, so previews a
+    budget left out or trimmed away are still new on the next wake.
+    """
+    for n in notifications:
+        if n.get("source") != "slack":
+            continue
+        for ch in n.get("channels", []):
+            if ch.get("messages"):
+                key = _slack_key(ch)
+                # Only the current previews can come back, so that's all we keep
+                current = {m.get("ts") for m in ch["messages"]}
+                _delivered_ts[key] = (_delivered_ts.get(key, set()) | _shown_ts(ch, shown)) & current
+
+
+def slack_read_cursors(notifications: list, shown: dict[str, set[str]] | None = None) -> dict[str, str]:
+    """Read cursor per Slack channel id: the newest ts with every preview up to it delivered.
+
+    shown is the ts rendered per channel (all if None); previews delivered
+    in earlier wakes count too. A channel whose oldest preview is still
+    unseen is not acked.
+    """
+    cursors = {}
+    for n in notifications:
+        if n.get("source") != "slack":
+            continue
+        for ch in n.get("channels", []):
+            done = _shown_ts(ch, shown) | _delivered_ts.get(_slack_key(ch), set())
+            ts = ""
+            for m in sorted(ch.get("messages") or [], key=lambda m: m.get("ts", "")):
+                if m.get("ts") not in done:
+                    break
+                ts = m.get("ts", "")
+            if ch.get("id") and ts:
+                cursors[ch["id"]] = ts
+    return cursors
+
+
+def reset_delivered_slack() -> None:
+    """Forget delivered Slack messages (e.g. for a fresh session)."""
+    _delivered_ts.clear()
+
+
 def _format_slack_channel(ch: dict) -> str:
     """Format a single Slack channel with its message previews."""
     name = ch.get("name", ch.get("id", "?"))
@@ -11,7 +103,9 @@ def _format_slack_channel(ch: dict) -> str:
         text = m.get("text", "").strip()
         if text:
             lines.append(f"  <@{user}>: {text}")
-    if not ch.get("messages"):
+    if ch.get("seen"):
+        lines.append(f"  (+{ch['seen']} older unread already shown)")
+    elif not ch.get("messages"):
         lines.append(f"  ({ch.get('unread', 0)} new message(s))")
     return "\n".join(lines)
 
@@ -0,0 +1,101 @@
+"""Rankable pieces of a wake message, for notify_budget.
+
+Each reminder, chat batch and Slack channel becomes one Unit: a head line
+plus body lines that can be dropped (oldest first) or clipped to fit.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from notify_format import format_email, format_unknown
+
+
+@dataclass
+class Unit:
+    """One rankable piece of a wake message (a reminder, a Slack channel...)."""
+    kind: str
+    recency: float
+    head: str
+    lines: list[str]
+    more: str = ""          # Label used in "+N more <label>"
+    keep_newest: bool = True
+    key: str = ""           # Slack channel id
+    stub: str = ""          # Stands in for an empty head when no line fits
+    stamps: list[str] = field(default_factory=list)  # Slack ts per line, "" for notes
+
+    def _pick(self, items: list, keep: int) -> list:
+        return (items[-keep:] if self.keep_newest else items[:keep]) if keep else []
+
+    def shown(self, keep: int) -> set[str]:
+        """Slack ts of the messages render(keep) shows."""
+        return {ts for ts in self._pick(self.stamps, keep) if ts}
+
+    def render(self, keep: int, clip: int | None = None) -> str:
+        lines = self._pick(self.lines, keep)
+        if clip is not None:  # Only with keep=1: cut the one line short
+            lines = [_clip(line, clip) for line in lines]
+        text = "\n".join([self.head, *lines]) if lines else self.head or self.stub
+        dropped = len(self.lines) - len(lines)
+        return text + (f"\n  (+{dropped} more {self.more})" if dropped else "")
+
+
+def _epoch(value) -> float:
+    """Best-effort timestamp → epoch seconds (Slack ts or ISO string)."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return 0.0
+
+
+def _clip(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[:limit] + "…"
+
+
+def _slack_channels(n: dict) -> list[dict]:
+    if n.get("type") == "slack":  # wake-trigger shape, see format_slack
+        return [{"id": m.get("channel_id", "?"), "name": m.get("channel_name", ""),
+                 "unread": m.get("unread", 0)} for m in n.get("messages", [])]
+    return n.get("channels", [])
+
+
+def split_units(notifications: list) -> list[Unit]:
+    """Split notifications into rankable units."""
+    units = []
+    for n in notifications:
+        ntype, source = n.get("type", "unknown"), n.get("source", "chat")
+        if ntype == "reminder":
+            units.append(Unit("reminder", _epoch(n.get("trigger_time")),
+                               f"⏰ REMINDER (ID {n.get('id', '?')}):\n",
+                               n.get("message", "(no message)").strip().splitlines(),
+                               "line(s)", keep_newest=False))
+        elif ntype == "slack" or (ntype == "message" and source == "slack"):
+            for ch in _slack_channels(n):
+                name = ch.get("name") or ch.get("id", "?")
+                msgs = [m for m in ch.get("messages", []) if m.get("text", "").strip()]
+                lines = [f"  <@{m.get('user', '?')}>: {m['text'].strip()}" for m in msgs]
+                stamps = [m.get("ts", "") for m in msgs]
+                if ch.get("seen"):
+                    lines.append(f"  (+{ch['seen']} older unread already shown)")
+                    stamps.append("")
+                elif not ch.get("messages"):
+                    lines, stamps = [f"  ({ch.get('unread', 0)} new message(s))"], [""]
+                recency = max((_epoch(m.get("ts")) for m in msgs), default=0.0)
+                units.append(Unit("slack", recency, f"#{name}:", lines, f"in #{name}",
+                                  key=ch.get("id") or ch.get("name", "?"), stamps=stamps))
+        elif ntype == "message":
+            msgs = n.get("messages") or []
+            lines = [m.get("content", "").strip() for m in msgs]
+            recency = max((_epoch(m.get("timestamp")) for m in msgs), default=0.0)
+            check = "New chat message (check unread to view)"
+            units.append(Unit("chat", recency, "" if lines else check, lines,
+                              "chat message(s)", stub=check))
+        else:
+            fmt = format_email if ntype == "email" else format_unknown
+            units.append(Unit(ntype, 0.0, fmt([n])[0], []))
+    return units
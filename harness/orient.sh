@@ -55,8 +55,8 @@ if [ "$UNREAD_COUNT" -gt 0 ] 2>/dev/null; then
 fi
 
 # Pending reminders
-PENDING=$(curl -s --max-time 2 "http://127.0.0.1:${NOTIF_PORT}/pending" 2>/dev/null)
-PENDING_COUNT=$(echo "$PENDING" | python3 -c "import sys,json; print(len(json.load(sys.stdin)))" 2>/dev/null || echo 0)
+PENDING=$(curl -s --max-time 2 "http://127.0.0.1:${NOTIF_PORT}/pending?count=1" 2>/dev/null)
+PENDING_COUNT=$(echo "$PENDING" | python3 -c "import sys,json; print(json.load(sys.stdin)['count'])" 2>/dev/null || echo 0)
 if [ "$PENDING_COUNT" -gt 0 ] 2>/dev/null; then
     echo -e "\033[1;33mReminders:\033[0m $PENDING_COUNT due"
 fi
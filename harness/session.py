@@ -18,12 +18,14 @@ from datetime import datetime
 
 from config import (
     CONTEXT_THRESHOLD, INCOMPLETE_BASE_DELAY, MAX_INCOMPLETE_RETRIES,
-    SLEEP_POLL_INTERVAL, Timer, log, set_status,
+    SLEEP_POLL_INTERVAL, WAKE_TOKEN_BUDGET, Timer, log, set_status,
 )
-from notify_format import format_notifications
+from notify_budget import format_budgeted
+from notify_format import drop_delivered_slack, mark_delivered_slack, slack_read_cursors
 
 NOTIFICATIONS_PORT = os.environ.get("RELAYGENT_NOTIFICATIONS_PORT", "8083")
 NOTIFICATIONS_CACHE = "/tmp/relaygent-notifications-cache.json"
+MAX_CACHE_STALE = 60  # Force wake if cache file hasn't updated in this many seconds
 
 
 @dataclass
@@ -33,9 +35,6 @@ class SleepResult:
     wake_message: str = ""
 
 
-MAX_CACHE_STALE = 60  # Force wake if cache file hasn't updated in this many seconds
-
-
 class SleepManager:
     """Handles sleep polling using cached notification file."""
 
@@ -59,7 +58,6 @@ class SleepManager:
             if new_timestamps:
                 self._seen_timestamps.update(notif_timestamps)
                 new_notifications.append(notif)
-
         return new_notifications
 
     def _extract_timestamps(self, notif: dict) -> set:
@@ -85,12 +83,13 @@ class SleepManager:
 
         return timestamps
 
-    def _ack_slack(self) -> None:
-        """Tell notifications server to advance Slack read marker."""
+    def _ack_slack(self, notifications: list, shown: dict[str, set[str]]) -> None:
+        """Advance the Slack read cursors of the channels shown in the wake."""
+        cursors = slack_read_cursors(notifications, shown)
         try:
             ack_url = f"http://127.0.0.1:{NOTIFICATIONS_PORT}/notifications/ack-slack"
-            req = urllib.request.Request(ack_url, method="POST", data=b"")
-            urllib.request.urlopen(req, timeout=3)
+            body = json.dumps({"channels": cursors}).encode()  # {} acks nothing
+            urllib.request.urlopen(urllib.request.Request(ack_url, method="POST", data=body), timeout=3)
         except (urllib.error.URLError, OSError):
             pass  # Best-effort
 
@@ -140,13 +139,14 @@ class SleepManager:
         if not woken:
             return SleepResult(woken=False)
 
-        # Ack Slack notifications so they don't re-trigger on next sleep
+        wake = format_budgeted(drop_delivered_slack(notifications), WAKE_TOKEN_BUDGET)
+        mark_delivered_slack(notifications, wake.slack_shown)
+        # Ack shown Slack channels so they don't re-trigger on next sleep
         if any(n.get("source") == "slack" for n in notifications):
-            self._ack_slack()
-
-        wake_message = format_notifications(notifications)
-        current_time = datetime.now().strftime("%H:%M:%S %Z")
-        wake_message += f"\n\nCurrent time: {current_time}"
+            self._ack_slack(notifications, wake.slack_shown)
+        if wake.dropped_size:
+            log(f"Wake message trimmed to budget (~{wake.dropped_size} tokens dropped)")
+        wake_message = f"{wake.text}\n\nCurrent time: {datetime.now():%H:%M:%S %Z}"
 
         set_status("working")
         log("Waking agent...")
@@ -0,0 +1,118 @@
+"""Tests for token-budgeted wake messages."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from notify_budget import estimate_tokens, format_budgeted
+from notify_format import format_notifications
+
+
+def slack_notif(channels=3, per_channel=30, text="status update " * 8):
+    chs = [{"id": f"C{i}", "name": f"ch{i}", "unread": per_channel,
+            "messages": [{"user": "U1", "text": f"{text}{j}", "ts": f"17000000{i:02d}.{j:06d}"}
+                         for j in range(per_channel)]}
+           for i in range(channels)]
+    return {"type": "message", "source": "slack", "count": channels * per_channel, "channels": chs}
+
+
+class TestEstimateTokens:
+    def test_roughly_four_chars_per_token(self):
+        assert estimate_tokens("a" * 400) == 100
+
+    def test_empty(self):
+        assert estimate_tokens("") == 0
+
+    def test_multibyte_counts_more(self):
+        assert estimate_tokens("é" * 100) > estimate_tokens("e" * 100)
+
+
+class TestFormatBudgeted:
+    def test_identical_when_under_budget(self):
+        notifs = [{"type": "reminder", "id": 1, "message": "Do the thing"},
+                  {"type": "message", "messages": [{"content": "Hi"}]}]
+        result = format_budgeted(notifs, 4000)
+        assert result.text == format_notifications(notifs)
+        assert result.dropped_size == 0 and result.omitted == []
+
+    def test_fits_budget(self):
+        result = format_budgeted([slack_notif(channels=10)], 500)
+        assert result.size <= 500
+        assert result.dropped_size > 0
+
+    def test_reports_dropped_size(self):
+        result = format_budgeted([slack_notif(channels=10)], 500)
+        assert f"~{result.dropped_size} tokens dropped" in result.text
+
+    def test_truncated_channel_keeps_newest(self):
+        result = format_budgeted([slack_notif(channels=1)], 300)
+        assert "more in #ch0" in result.text
+        assert "status update " * 8 + "29" in result.text  # newest kept
+        assert "update 0\n" not in result.text  # oldest dropped
+
+    def test_omitted_channels_summarized(self):
+        result = format_budgeted([slack_notif(channels=10)], 500)
+        assert result.omitted
+        assert "more notification(s) not shown" in result.text
+        assert "#ch0" in result.omitted  # oldest channel ranked last
+
+    def test_newest_channel_ranked_first(self):
+        result = format_budgeted([slack_notif(channels=10)], 500)
+        assert "#ch9:" in result.text
+
+    def test_reminder_outranks_slack(self):
+        notifs = [slack_notif(channels=10),
+                  {"type": "reminder", "id": 7, "message": "Deploy at noon"}]
+        result = format_budgeted(notifs, 300)
+        assert "Deploy at noon" in result.text
+        assert result.text.index("REMINDER") < result.text.index("Slack") \
+            if "Slack" in result.text else True
+
+    def test_chat_outranks_slack(self):
+        notifs = [slack_notif(channels=10),
+                  {"type": "message", "source": "chat", "messages": [{"content": "ping from owner"}]}]
+        result = format_budgeted(notifs, 200)
+        assert "ping from owner" in result.text
+
+    def test_char_budget(self):
+        result = format_budgeted([slack_notif(channels=5)], 2000, measure=len, unit="chars")
+        assert len(result.text) <= 2000
+        assert "chars dropped" in result.text
+
+    def test_long_message_clipped(self):
+        notifs = [{"type": "message", "source": "slack", "channels": [
+            {"id": "C1", "name": "logs", "messages": [{"user": "U1", "text": "x" * 50000, "ts": "1"}]}]}]
+        result = format_budgeted(notifs, 1000)
+        assert "#logs:" in result.text
+        assert "…" in result.text
+
+    def test_long_chat_kept_whole_when_budget_allows(self):
+        chat = "please review the release notes " * 48  # ~1.5k chars
+        notifs = [slack_notif(channels=40),
+                  {"type": "message", "source": "chat", "messages": [{"content": chat}]}]
+        result = format_budgeted(notifs, 4000)
+        assert chat.strip() in result.text
+
+    def test_clipped_line_uses_remaining_budget(self):
+        notifs = [{"type": "reminder", "id": 1, "message": "y" * 5000}]
+        result = format_budgeted(notifs, 1000)
+        assert result.size <= 1000
+        assert "y" * 2000 + "…" in result.text
+
+    def test_lower_priority_never_jumps_ahead(self):
+        notifs = [slack_notif(channels=40), {"type": "reminder", "id": 1, "message": "y" * 5000},
+                  {"type": "message", "source": "chat", "messages": [{"content": "z" * 1500}]}]
+        result = format_budgeted(notifs, 300)
+        assert result.size <= 300
+        assert "New Slack messages" not in result.text
+        assert "check unread" in result.text  # Chat still flagged, ahead of Slack
+
+    def test_wake_trigger_slack_shape(self):
+        notifs = [{"type": "slack", "messages": [
+            {"channel_id": f"C{i}", "channel_name": f"room{i}", "unread": 3} for i in range(200)]}]
+        result = format_budgeted(notifs, 300)
+        assert result.size <= 300
+        assert "room" in result.text
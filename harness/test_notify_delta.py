@@ -0,0 +1,156 @@
+"""Tests for delta-only Slack formatting across wakes."""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from notify_budget import format_budgeted
+from notify_format import (
+    drop_delivered_slack, format_notifications, mark_delivered_slack, reset_delivered_slack,
+    slack_read_cursors,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_state():
+    reset_delivered_slack()
+    yield
+    reset_delivered_slack()
+
+
+def slack(channel="C1", name="general", texts=("one",), unread=None):
+    msgs = [{"user": "U1", "text": t, "ts": f"1700000000.{i:06d}"} for i, t in enumerate(texts)]
+    return {"type": "message", "source": "slack", "count": len(msgs),
+            "channels": [{"id": channel, "name": name,
+                          "unread": len(msgs) if unread is None else unread, "messages": msgs}]}
+
+
+def deliver(notifs):
+    """One wake that shows everything: strip, then mark as delivered."""
+    out = drop_delivered_slack(notifs)
+    mark_delivered_slack(notifs)
+    return out
+
+
+class TestDropDeliveredSlack:
+    def test_first_wake_shows_everything(self):
+        text = format_notifications(deliver([slack(texts=("a", "b", "c"))]))
+        assert "a" in text and "b" in text and "c" in text
+        assert "already shown" not in text
+
+    def test_second_wake_shows_only_new(self):
+        deliver([slack(texts=("first", "second", "third"))])
+        text = format_notifications(deliver(
+            [slack(texts=("first", "second", "third", "fourth"))]))
+        assert "fourth" in text
+        assert "first" not in text and "third" not in text
+        assert "+3 older unread already shown" in text
+
+    def test_channels_tracked_independently(self):
+        deliver([slack("C1", "general", ("hello",))])
+        text = format_notifications(deliver([slack("C2", "dev", ("hello",))]))
+        assert "<@U1>: hello" in text
+
+    def test_repeat_payload_only_counts(self):
+        deliver([slack(texts=("x", "y"))])
+        text = format_notifications(deliver([slack(texts=("x", "y"))]))
+        assert "<@U1>" not in text
+        assert "+2 older unread already shown" in text
+
+    def test_does_not_mutate_input(self):
+        notifs = [slack(texts=("a",))]
+        deliver(notifs)
+        deliver(notifs)
+        assert len(notifs[0]["channels"][0]["messages"]) == 1
+
+    def test_non_slack_untouched(self):
+        notifs = [{"type": "reminder", "id": 1, "message": "hi"},
+                  {"type": "message", "source": "chat", "messages": [{"content": "yo"}]}]
+        assert deliver(notifs) == notifs
+
+    def test_channels_without_previews_untouched(self):
+        notif = {"type": "message", "source": "slack",
+                 "channels": [{"id": "C1", "name": "general", "unread": 4}]}
+        assert "(4 new message(s))" in format_notifications(deliver([notif]))
+
+    def test_reset_forgets(self):
+        deliver([slack(texts=("again",))])
+        reset_delivered_slack()
+        text = format_notifications(deliver([slack(texts=("again",))]))
+        assert "<@U1>: again" in text
+
+
+    def test_strip_alone_marks_nothing(self):
+        drop_delivered_slack([slack(texts=("a",))])
+        assert "<@U1>: a" in format_notifications(deliver([slack(texts=("a",))]))
+
+    def test_channels_left_out_by_budget_stay_new(self):
+        notifs = [slack(f"C{i}", f"ch{i}", (f"message {i} " * 40,)) for i in range(10)]
+        assert format_budgeted(notifs[:1], 500).slack_shown == {"C0": {"1700000000.000000"}}
+        wake = format_budgeted(drop_delivered_slack(notifs), 500)
+        assert 0 < len(wake.slack_shown) < 10
+        mark_delivered_slack(notifs, wake.slack_shown)
+        again = drop_delivered_slack(notifs)
+        for n in again:
+            ch = n["channels"][0]
+            shown = bool(wake.slack_shown.get(ch["id"]))
+            assert (ch["seen"], len(ch["messages"])) == ((1, 0) if shown else (0, 1))
+
+    def test_trimmed_channel_marks_only_rendered_previews(self):
+        notifs = [slack(texts=[f"msg{i} " * 60 for i in range(5)])]
+        wake = format_budgeted(drop_delivered_slack(notifs), 300)
+        assert "more in #general" in wake.text and "msg4" in wake.text
+        shown = wake.slack_shown["C1"]
+        assert "1700000000.000004" in shown and "1700000000.000000" not in shown
+        mark_delivered_slack(notifs, wake.slack_shown)
+        ch = drop_delivered_slack(notifs)[0]["channels"][0]
+        assert {m["ts"] for m in ch["messages"]} == {m["ts"] for m in
+                                                     notifs[0]["channels"][0]["messages"]} - shown
+        assert ch["seen"] == len(shown)
+        assert slack_read_cursors(notifs, wake.slack_shown) == {}  # msg0 still unseen
+
+
+class TestSlackReadCursors:
+    def test_newest_ts_per_channel(self):
+        notifs = [slack("C1", texts=("a", "b")), slack("C2", texts=("x",)),
+                  {"type": "reminder", "id": 1, "message": "hi"}]
+        assert slack_read_cursors(notifs) == {
+            "C1": "1700000000.000001", "C2": "1700000000.000000"}
+
+    def test_channels_without_previews_are_not_acked(self):
+        notif = slack(texts=())
+        assert slack_read_cursors([notif]) == {}
+
+    def test_stops_before_first_unseen_preview(self):
+        notifs = [slack(texts=("a", "b", "c"))]
+        shown = {"C1": {"1700000000.000000", "1700000000.000002"}}
+        assert slack_read_cursors(notifs, shown) == {"C1": "1700000000.000000"}
+
+    def test_only_shown_channels(self):
+        notifs = [slack("C1", texts=("a",)), slack("C2", texts=("b",))]
+        assert slack_read_cursors(notifs, {"C2": {"1700000000.000000"}}) == {
+            "C2": "1700000000.000000"}
+
+
+def test_wake_acks_only_channels_in_the_budgeted_text(tmp_path, monkeypatch):
+    import session
+    notifs = [slack(f"C{i}", f"ch{i}", (f"message {i} " * 40,)) for i in range(10)]
+    cache = tmp_path / "cache.json"
+    cache.write_text(json.dumps(notifs))
+    monkeypatch.setattr(session, "NOTIFICATIONS_CACHE", str(cache))
+    monkeypatch.setattr(session, "WAKE_TOKEN_BUDGET", 500)
+    timer = MagicMock()
+    timer.is_expired.return_value = False
+    with patch("session.set_status"), patch("session.log"), \
+            patch("urllib.request.urlopen") as urlopen:
+        wake = session.SleepManager(timer).auto_sleep_and_wake().wake_message
+    acked = json.loads(urlopen.call_args[0][0].data)["channels"]
+    assert 0 < len(acked) < 10
+    assert {f"C{i}" for i in range(10) if f"#ch{i}:" in wake} == set(acked)
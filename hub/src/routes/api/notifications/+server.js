@@ -2,6 +2,7 @@ import { json } from '@sveltejs/kit';
 
 const NOTIF_PORT = process.env.RELAYGENT_NOTIFICATIONS_PORT || '8083';
 const NOTIF_URL = `http://127.0.0.1:${NOTIF_PORT}`;
+const PAGE_SIZE = 200; // Soonest reminders listed; the total comes from count=1
 
 async function proxy(path, method = 'GET', body = null) {
 	const opts = { method, headers: { 'Content-Type': 'application/json' } };
@@ -10,13 +11,15 @@ async function proxy(path, method = 'GET', body = null) {
 	return res.json();
 }
 
-/** GET /api/notifications — list upcoming reminders */
+/** GET /api/notifications — the soonest upcoming reminders and their total */
 export async function GET() {
 	try {
-		const reminders = await proxy('/upcoming');
-		return json({ reminders });
+		const [reminders, count] = await Promise.all([
+			proxy(`/upcoming?limit=${PAGE_SIZE}`), proxy('/upcoming?count=1'),
+		]);
+		return json({ reminders, total: count.count });
 	} catch (e) {
-		return json({ reminders: [], error: 'Notifications service unreachable' });
+		return json({ reminders: [], total: 0, error: 'Notifications service unreachable' });
 	}
 }
 
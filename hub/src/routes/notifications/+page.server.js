@@ -1,12 +1,15 @@
 const NOTIF_PORT = process.env.RELAYGENT_NOTIFICATIONS_PORT || '8083';
 const NOTIF_URL = `http://127.0.0.1:${NOTIF_PORT}`;
+const PAGE_SIZE = 200;
 
 export async function load() {
 	try {
-		const res = await fetch(`${NOTIF_URL}/upcoming`);
-		const reminders = await res.json();
-		return { reminders, error: null };
+		const [page, count] = await Promise.all([
+			fetch(`${NOTIF_URL}/upcoming?limit=${PAGE_SIZE}`).then(r => r.json()),
+			fetch(`${NOTIF_URL}/upcoming?count=1`).then(r => r.json()),
+		]);
+		return { reminders: page, total: count.count, error: null };
 	} catch {
-		return { reminders: [], error: 'Notifications service unreachable' };
+		return { reminders: [], total: 0, error: 'Notifications service unreachable' };
 	}
 }
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Benchmark JSON encoding on the hot paths: stdlib/jsonify vs fastjson.
+
+Usage: python3 bench_json.py [--channels N] [--rows N] [--iterations N]
+
+Measures, per iteration:
+    pending   a /notifications/pending payload with N Slack channels of 5
+              previews each, via jsonify() and via fastjson.response()
+    history   a conversations.history response parsed by slack_api
+    listing   /upcoming-style rows built as dicts and jsonify()'d vs
+              rendered by SQLite's json_object() and joined (listing.fetch)
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("RELAYGENT_DATA_DIR", tempfile.mkdtemp(prefix="relaygent-bench-"))
+
+from flask import jsonify  # noqa: E402
+
+import db  # noqa: E402
+import fastjson  # noqa: E402
+import listing  # noqa: E402
+import notif_config  # noqa: E402
+
+
+def _slack_payload(channels):
+    text = "Deploy finished — see the dashboard for details <@U123> :tada: " * 3
+    return [{"type": "message", "source": "slack", "count": channels * 5, "channels": [
+        {"id": f"C{i:06d}", "name": f"channel-{i}", "unread": 5, "messages": [
+            {"user": f"U{j:05d}", "text": text, "ts": f"17000000{i:02d}.{j:06d}"}
+            for j in range(5)]} for i in range(channels)]}]
+
+
+def _history(n=10):
+    return json.dumps({"ok": True, "has_more": False, "messages": [
+        {"type": "message", "user": "U00001", "text": "hello " * 40, "ts": f"1700000000.{i:06d}",
+         "blocks": [{"type": "rich_text", "elements": [{"type": "text", "text": "hi"}]}]}
+        for i in range(n)]}).encode()
+
+
+def _time(fn, iterations):
+    fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def _dict_listing(conn, opts):
+    rows = conn.execute("SELECT * FROM reminders ORDER BY trigger_time, id LIMIT ?",
+                        (opts["limit"],)).fetchall()
+    return jsonify([{f: r[f] for f in opts["fields"]} for r in rows]).get_data()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--channels", type=int, default=100)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    print(f"orjson available: {fastjson.ORJSON_AVAILABLE}")
+
+    payload, body, n = _slack_payload(args.channels), _history(), args.iterations
+    db.init_db()
+    with db.get_db() as conn:
+        conn.executemany("INSERT INTO reminders (trigger_time, message) VALUES (?, ?)",
+                         [(f"2030-01-01T00:{i % 60:02d}:00", f"bench reminder {i}")
+                          for i in range(args.rows)])
+        conn.commit()
+    opts = listing.parse_args({"limit": str(min(args.rows, listing.MAX_LIMIT))})
+    with notif_config.app.app_context(), db.get_db() as conn:
+        cases = [
+            (f"pending, {args.channels * 5} previews", lambda: jsonify(payload).get_data(),
+             lambda: fastjson.response(payload).get_data()),
+            ("conversations.history parse", lambda: json.loads(body),
+             lambda: fastjson.loads(body)),
+            (f"listing, {opts['limit']} rows", lambda: _dict_listing(conn, opts),
+             lambda: listing.fetch(conn, "1", (), "trigger_time", opts)),
+        ]
+        for label, before, after in cases:
+            old, new = _time(before, n), _time(after, n)
+            print(f"{label:>32}: {old:8.3f} ms -> {new:8.3f} ms  ({old / new:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Benchmark /notifications/pending?fast=1 throughput with and without pooling.
+
+Usage: python3 bench_pending.py [--requests N] [--reminders N]
+
+Runs against a throwaway database through Flask's test client, with the
+hub chat check stubbed out so only the reminder/SQLite path is measured.
+
+    original  the pre-pooling get_db(): connect + journal_mode per call
+    unpooled  POOL_SIZE=0: a new connection per call, running all of _PRAGMAS
+    pooled    the default pool
+"""
+
+import argparse
+import contextlib
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("RELAYGENT_DATA_DIR", tempfile.mkdtemp(prefix="relaygent-bench-"))
+
+import notif_config  # noqa: E402
+import db  # noqa: E402
+import reminders  # noqa: E402, F401 — registers reminder routes
+import routes  # noqa: E402
+
+_POOLED = db.get_db
+
+
+def _seed(count):
+    future = (datetime.now() + timedelta(days=30)).isoformat()
+    with db.get_db() as conn:
+        conn.executemany(
+            "INSERT INTO reminders (trigger_time, message) VALUES (?, ?)",
+            [(future, f"bench {i}") for i in range(count)],
+        )
+        conn.commit()
+
+
+@contextlib.contextmanager
+def _original_get_db():
+    """get_db() before pooling: a fresh connection and journal_mode per call."""
+    os.makedirs(os.path.dirname(notif_config.DB_PATH), exist_ok=True)
+    conn = sqlite3.connect(notif_config.DB_PATH, timeout=5)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode = WAL")
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def _use_get_db(impl):
+    """Point every loaded module's get_db (db.get_db and `from db import`) at impl."""
+    current = {db.get_db, _original_get_db, _POOLED}
+    for module in list(sys.modules.values()):
+        if getattr(module, "get_db", None) in current:
+            module.get_db = impl
+
+
+def _run(client, requests):
+    start = time.perf_counter()
+    for _ in range(requests):
+        resp = client.get("/notifications/pending?fast=1")
+        assert resp.status_code == 200
+    return requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--reminders", type=int, default=50)
+    args = parser.parse_args()
+
+    routes._collect_chat_messages = lambda notifications: None
+    db.init_db()
+    _seed(args.reminders)
+    client = notif_config.app.test_client()
+    pool_size = db.POOL_SIZE
+    for label, impl, size in (("original", _original_get_db, 0),
+                              ("unpooled", _POOLED, 0),
+                              ("pooled", _POOLED, pool_size)):
+        db.close_all()
+        db.POOL_SIZE = size
+        _use_get_db(impl)
+        _run(client, 100)  # warm-up
+        rps = _run(client, args.requests)
+        print(f"{label:>9}: {rps:8.0f} req/s  ({args.requests} requests, "
+              f"{args.reminders} reminders)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Benchmark: per-call Slack API latency, urllib vs the pooled client.
+
+Usage: python3 bench_slack_http.py [--calls N] [--workers N]
+
+Starts the mock Slack API over TLS with a throwaway self-signed cert
+(needs the openssl CLI) and times N conversations.history calls through
+urllib.request.urlopen (a new TCP + TLS handshake per call) and through
+slack_http (pooled keep-alive connections, gzip). Prints JSON.
+"""
+
+import argparse
+import json
+import os
+import ssl
+import sys
+import tempfile
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import slack_http  # noqa: E402
+from slack_mock import MockSlack, self_signed_cert  # noqa: E402
+
+
+def _urllib_get(url, ctx):
+    req = urllib.request.Request(url, headers={"Authorization": "Bearer xoxp-bench"})
+    with urllib.request.urlopen(req, timeout=5, context=ctx) as resp:
+        return json.loads(resp.read())
+
+
+def _pooled_get(url, ctx):
+    return json.loads(slack_http.get(url, {"Authorization": "Bearer xoxp-bench"}).body)
+
+
+def _measure(fetch, mock, calls, workers, ctx):
+    urls = [f"{mock.url}/conversations.history?channel=C{i % 20:02d}&limit=10"
+            for i in range(calls)]
+    before = mock.connections
+    latencies = []
+
+    def timed(url):
+        start = time.perf_counter()
+        fetch(url, ctx)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(timed, urls))
+    total = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "p50_ms": round(latencies[len(latencies) // 2], 3),
+        "p99_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))], 3),
+        "total_s": round(total, 3),
+        "connections": mock.connections - before,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cert = self_signed_cert(tmp)
+        ctx = ssl.create_default_context(cafile=cert[0])
+        slack_http.SSL_CONTEXT = ctx
+        with MockSlack(tls=cert) as mock:
+            report = {
+                "calls": args.calls, "workers": args.workers,
+                "urllib": _measure(_urllib_get, mock, args.calls, args.workers, ctx),
+                "pooled": _measure(_pooled_get, mock, args.calls, args.workers, ctx),
+            }
+    report["p50_speedup"] = round(report["urllib"]["p50_ms"] / report["pooled"]["p50_ms"], 1)
+    print(json.dumps(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Measure notifications service cold start against a threshold.
+
+Usage: python3 bench_startup.py [--runs N] [--max-import-ms MS] [--max-healthy-ms MS]
+
+    import   `python -X importtime -c "import serve"`: the cumulative import
+             time of serve (every route module), median of N runs, with
+             the heaviest packages listed
+    healthy  wall time from spawning `python serve.py` to the first 200
+             from GET /health, median of N runs
+
+Exits non-zero when either median is above its threshold. The service
+runs against a throwaway data directory; Slack and croniter stay unloaded
+until first used, so neither shows up here.
+"""
+
+import argparse
+import http.client
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from loadtest_serve import _free_port
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| *(\S+)")
+
+
+def _importtime(env):
+    """(total µs for serve, {top-level package: self µs summed over its modules})."""
+    err = subprocess.run([sys.executable, "-X", "importtime", "-c", "import serve"],
+                         cwd=HERE, env=env, capture_output=True, text=True, check=True).stderr
+    total, modules = 0, {}
+    for own, cumulative, name in _LINE.findall(err):
+        if name == "serve":
+            total = int(cumulative)
+        package = name.split(".")[0]
+        modules[package] = modules.get(package, 0) + int(own)
+    return total, modules
+
+
+def _healthy(env, timeout=15):
+    """Seconds from spawning serve.py to its first healthy response."""
+    port = _free_port()
+    env = dict(env, RELAYGENT_NOTIFICATIONS_PORT=str(port))
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "serve.py"], cwd=HERE, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+                conn.request("GET", "/health")
+                if conn.getresponse().status == 200:
+                    return time.perf_counter() - start
+            except OSError:
+                time.sleep(0.005)
+        raise SystemExit("service did not become healthy")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-import-ms", type=float, default=250.0)
+    parser.add_argument("--max-healthy-ms", type=float, default=300.0)
+    args = parser.parse_args()
+
+    env = dict(os.environ, RELAYGENT_DATA_DIR=tempfile.mkdtemp(prefix="relaygent-start-"))
+    imports = [_importtime(env) for _ in range(args.runs)]
+    import_ms = statistics.median(t for t, _ in imports) / 1000
+    heaviest = sorted(imports[-1][1].items(), key=lambda kv: -kv[1])[:8]
+    healthy_ms = statistics.median(_healthy(env) for _ in range(args.runs)) * 1000
+
+    print(f"import serve: {import_ms:7.1f} ms (max {args.max_import_ms:.0f})")
+    for name, us in heaviest:
+        print(f"  {name:<24} {us / 1000:7.1f} ms")
+    print(f"first /health: {healthy_ms:6.1f} ms (max {args.max_healthy_ms:.0f})")
+    if import_ms > args.max_import_ms or healthy_ms > args.max_healthy_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Relaygent Notifications — bulk reminder operations.
+
+POST /reminders/bulk applies a list of create, delete and snooze
+operations in one BEGIN IMMEDIATE transaction (one commit, one WAL
+fsync) and answers with a result per operation, in order:
+
+    {"operations": [
+        {"op": "create", "trigger_time": "...", "message": "...", "recurrence": "..."},
+        {"op": "delete", "id": 12},
+        {"op": "snooze", "id": 13, "until": "2026-03-01T09:00:00"},
+        {"op": "snooze", "id": 14, "minutes": 30}
+     ],
+     "atomic": false}
+
+Invalid operations (and deletes or snoozes of unknown ids) get an error
+result and the rest are still applied — unless "atomic" is true, in which
+case any failure rolls back the whole batch and nothing is applied.
+
+Snoozing moves a reminder's next fire time and re-arms it if it already
+fired; a one-off reminder's trigger_time moves with it.
+"""
+
+from datetime import datetime, timedelta
+
+import metrics
+from db import get_db
+from flask import jsonify, request
+from notif_config import app
+from reminders import REMINDER_CHANGES, validate_reminder
+from schedule import next_fire_at, parse_local
+from scheduler import scheduler
+
+MAX_OPERATIONS = 1000
+MAX_SNOOZE_MINUTES = 366 * 24 * 60
+
+
+def _snooze_until(op):
+    """The ISO time a snooze operation moves to, or raises ValueError."""
+    if "until" in op:
+        try:
+            # Stored naive local, like create: firing compares next_fire_at as text
+            return parse_local(op["until"]).isoformat()
+        except (ValueError, TypeError):
+            raise ValueError("until must be valid ISO datetime") from None
+    minutes = op.get("minutes")
+    if isinstance(minutes, bool) or not isinstance(minutes, (int, float)) \
+            or not 0 < minutes <= MAX_SNOOZE_MINUTES:
+        raise ValueError(f"snooze needs until or minutes (0 < minutes <= {MAX_SNOOZE_MINUTES})")
+    return (datetime.now() + timedelta(minutes=minutes)).isoformat()
+
+
+def _target_id(op):
+    rid = op.get("id")
+    if isinstance(rid, bool) or not isinstance(rid, int):
+        raise ValueError("id must be an integer")
+    return rid
+
+
+def _apply(conn, op, deadlines):
+    """Apply one operation. Returns its result; raises ValueError if invalid."""
+    kind = op.get("op") if isinstance(op, dict) else None
+    if kind == "create":
+        error, fields = validate_reminder(op)
+        if error:
+            raise ValueError(error)
+        trigger_time, message, recurrence = fields
+        fire_at = next_fire_at(trigger_time, recurrence)
+        rid = conn.execute(
+            "INSERT INTO reminders (trigger_time, message, recurrence, next_fire_at) "
+            "VALUES (?, ?, ?, ?)", (trigger_time, message, recurrence, fire_at),
+        ).lastrowid
+        deadlines.append((rid, fire_at))
+        return {"status": "created", "id": rid}
+    if kind == "delete":
+        rid = _target_id(op)
+        if conn.execute("DELETE FROM reminders WHERE id = ?", (rid,)).rowcount == 0:
+            raise ValueError("reminder not found")
+        deadlines.append((rid, None))
+        return {"status": "deleted", "id": rid}
+    if kind == "snooze":
+        rid, until = _target_id(op), _snooze_until(op)
+        updated = conn.execute(
+            "UPDATE reminders SET fired = 0, next_fire_at = ?, trigger_time = "
+            "CASE WHEN recurrence IS NULL THEN ? ELSE trigger_time END WHERE id = ?",
+            (until, until, rid),
+        ).rowcount
+        if updated == 0:
+            raise ValueError("reminder not found")
+        deadlines.append((rid, until))
+        return {"status": "snoozed", "id": rid, "next_fire_at": until}
+    raise ValueError("op must be create, delete or snooze")
+
+
+@app.route("/reminders/bulk", methods=["POST"])
+def bulk_reminders():
+    """Apply create/delete/snooze operations in one transaction."""
+    data = request.get_json(silent=True)
+    ops = data.get("operations") if isinstance(data, dict) else None
+    if not isinstance(ops, list) or not ops:
+        return jsonify({"error": "operations must be a non-empty list"}), 400
+    if len(ops) > MAX_OPERATIONS:
+        return jsonify({"error": f"at most {MAX_OPERATIONS} operations per request"}), 400
+    atomic = data.get("atomic") is True
+
+    results, deadlines = [], []
+    with get_db() as conn, metrics.DB_QUERY.time(query="bulk"):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for op in ops:
+                try:
+                    results.append(_apply(conn, op, deadlines))
+                except ValueError as e:
+                    results.append({"status": "error", "error": str(e)})
+            failed = sum(r["status"] == "error" for r in results)
+            if atomic and failed:
+                conn.rollback()
+                results = [r if r["status"] == "error" else {"status": "rolled_back"}
+                           for r in results]
+                return jsonify({"results": results, "applied": 0, "failed": failed}), 400
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+    scheduler.schedule_many(deadlines)
+    for action in ("created", "deleted", "snoozed"):
+        count = sum(r["status"] == action for r in results)
+        if count:
+            REMINDER_CHANGES.inc(count, action=action)
+    return jsonify({"results": results, "applied": len(results) - failed, "failed": failed})
@@ -0,0 +1,114 @@
+"""Relaygent Notifications — concurrent slow-collector execution.
+
+Slow collectors (Slack, email...) call external APIs. They run on a
+bounded thread pool, each with its own deadline, so one sluggish source
+neither delays the others nor pushes a full poll past the poller's 15s
+--max-time.
+
+A collector that misses its deadline keeps running in the background.
+Meanwhile the poll serves whatever it has appended so far ("partial"),
+or else its last good result, marked stale. A later poll for the same
+collector waits on that in-flight run instead of starting another.
+"""
+
+import concurrent.futures
+import logging
+import os
+import threading
+import time
+
+import events
+import metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DEADLINE = float(os.environ.get("RELAYGENT_COLLECTOR_DEADLINE", "10"))
+DEADLINES = {}  # name -> seconds, overrides DEFAULT_DEADLINE
+MAX_WORKERS = int(os.environ.get("RELAYGENT_COLLECTOR_WORKERS", "4"))
+
+_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=MAX_WORKERS, thread_name_prefix="collector"
+)
+_lock = threading.Lock()
+_inflight = {}    # name -> (Future, list being filled)
+_last_good = {}   # name -> (time.time() of completion, [notifications])
+_durations = {}   # name -> seconds its last completed run took
+
+
+def run_collector(name, collector, found=None):
+    """Run one collector to completion, recording and publishing its result."""
+    found = [] if found is None else found
+    began = time.monotonic()
+    collector(found)
+    elapsed = time.monotonic() - began
+    with _lock:
+        _last_good[name] = (time.time(), list(found))
+        _durations[name] = elapsed
+    metrics.COLLECTOR_DURATION.observe(elapsed, collector=name)
+    events.publish_state(name, found[0] if found else None)
+    return found
+
+
+def _submit(name, collector):
+    with _lock:
+        running = _inflight.get(name)
+        if running and not running[0].done():
+            return running
+        found = []
+        future = _executor.submit(run_collector, name, collector, found)
+        _inflight[name] = (future, found)
+        return future, found
+
+
+def _stale(name):
+    with _lock:
+        when, found = _last_good.get(name, (None, []))
+    if when is None:
+        return []
+    age = round(time.time() - when, 1)
+    return [dict(n, stale=True, stale_seconds=age) for n in found]
+
+
+def run_all(collectors, notifications):
+    """Run collectors concurrently; append results. Returns per-collector metadata.
+
+    Metadata maps name -> {"ms": elapsed, "status": ok|partial|stale|error}.
+    """
+    start = time.monotonic()
+    running = [(name, *_submit(name, fn)) for name, fn in collectors]
+    meta = {}
+    for name, future, found in sorted(
+            running, key=lambda r: DEADLINES.get(r[0], DEFAULT_DEADLINE)):
+        deadline = start + DEADLINES.get(name, DEFAULT_DEADLINE)
+        try:
+            notifications.extend(future.result(timeout=max(deadline - time.monotonic(), 0)))
+            status = "ok"
+            elapsed = _durations.get(name, time.monotonic() - start)
+        except concurrent.futures.TimeoutError:
+            logger.warning("Collector %s missed its deadline", name)
+            partial = list(found)
+            status = "partial" if partial else "stale"
+            notifications.extend(
+                [dict(n, partial=True) for n in partial] if partial else _stale(name))
+        except Exception:
+            logger.exception(f"Failed in {name}")
+            status = "error"
+            notifications.extend(_stale(name))
+        if status != "ok":
+            elapsed = time.monotonic() - start
+        meta[name] = {"ms": round(elapsed * 1000, 1), "status": status}
+        metrics.COLLECTOR_RUNS.inc(collector=name, status=status)
+    return meta
+
+
+def _result_ages():
+    with _lock:
+        when = {name: w for name, (w, _) in _last_good.items()}
+    now = time.time()
+    return {(name,): round(now - w, 3) for name, w in when.items()}
+
+
+metrics.Gauge(
+    "relaygent_collector_result_age_seconds",
+    "Seconds since each slow collector last completed (age of its cached result).",
+    ("collector",), fn=_result_ages)
@@ -1,23 +1,99 @@
-"""Relaygent Notifications — database helpers."""
+"""Relaygent Notifications — database helpers.
 
+Connections are pooled: each one is opened and configured once (WAL,
+pragmas, statement cache) and handed to a single thread at a time by
+get_db(). The Flask server spawns a thread per request, so a plain
+thread-local cache would rarely be reused.
+"""
+
+import atexit
 import contextlib
 import os
 import sqlite3
+import threading
+
+import notif_config
+from schedule import next_fire_at
+
+POOL_SIZE = 8            # Idle connections kept around; 0 disables pooling
+STATEMENT_CACHE = 256    # Per-connection prepared statement cache (default 128)
+
+# Tuned for a small, hot database with many tiny reads and few writes.
+_PRAGMAS = (
+    "PRAGMA auto_vacuum = INCREMENTAL",  # New files only; maintenance.py converts old ones
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",   # Durable across app crashes in WAL mode
+    "PRAGMA cache_size = -8192",     # 8 MiB page cache
+    "PRAGMA mmap_size = 67108864",   # 64 MiB memory-mapped reads
+    "PRAGMA temp_store = MEMORY",
+)
+
+_idle = []  # [(db_path, conn)], used LIFO so the warmest connection is reused
+_lock = threading.Lock()
+
 
-from notif_config import DB_PATH
+def _connect(path):
+    """Open and configure a new connection."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(
+        path, timeout=5, check_same_thread=False,
+        cached_statements=STATEMENT_CACHE,
+    )
+    conn.row_factory = sqlite3.Row
+    for pragma in _PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def _acquire(path):
+    with _lock:
+        while _idle:
+            idle_path, conn = _idle.pop()
+            if idle_path == path:
+                return conn
+            conn.close()  # DB_PATH changed (tests) — drop stale connection
+    return _connect(path)
+
+
+def _release(path, conn):
+    try:
+        if conn.in_transaction:
+            conn.rollback()
+    except sqlite3.Error:
+        conn.close()
+        return
+    with _lock:
+        if len(_idle) < POOL_SIZE:
+            _idle.append((path, conn))
+            return
+    conn.close()
 
 
 @contextlib.contextmanager
 def get_db():
-    """Yield a SQLite connection that is closed when the context exits."""
-    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
-    conn = sqlite3.connect(DB_PATH, timeout=5)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode = WAL")
+    """Yield a pooled SQLite connection, returned to the pool on exit.
+
+    Uncommitted changes are rolled back when the context exits.
+    """
+    path = notif_config.DB_PATH
+    conn = _acquire(path)
     try:
         yield conn
     finally:
-        conn.close()
+        _release(path, conn)
+
+
+def close_all():
+    """Close every idle pooled connection (called at shutdown)."""
+    with _lock:
+        conns = [conn for _, conn in _idle]
+        _idle.clear()
+    for conn in conns:
+        with contextlib.suppress(sqlite3.Error):
+            conn.close()
+
+
+atexit.register(close_all)
 
 
 def init_db():
@@ -29,11 +105,46 @@ def init_db():
                 message TEXT NOT NULL,
                 created_at TEXT DEFAULT CURRENT_TIMESTAMP,
                 fired INTEGER DEFAULT 0,
-                recurrence TEXT DEFAULT NULL
+                recurrence TEXT DEFAULT NULL,
+                next_fire_at TEXT DEFAULT NULL
             )
         """)
-        with contextlib.suppress(sqlite3.OperationalError):
-            conn.execute(
-                "ALTER TABLE reminders ADD COLUMN recurrence TEXT DEFAULT NULL"
+        for column in ("recurrence", "next_fire_at"):
+            with contextlib.suppress(sqlite3.OperationalError):
+                conn.execute(
+                    f"ALTER TABLE reminders ADD COLUMN {column} TEXT DEFAULT NULL"
+                )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_reminders_due "
+            "ON reminders (fired, next_fire_at)"
+        )
+        # Keyset pages of /upcoming: (trigger_time, id) order, rowid implied
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_reminders_upcoming "
+            "ON reminders (fired, trigger_time)"
+        )
+        _backfill_next_fire(conn)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS slack_cursors (
+                channel_id TEXT PRIMARY KEY,
+                last_read_ts TEXT NOT NULL,
+                updated_at TEXT DEFAULT CURRENT_TIMESTAMP
             )
+        """)
         conn.commit()
+
+
+def _backfill_next_fire(conn):
+    """Migration: compute next_fire_at for rows created before it existed."""
+    rows = conn.execute(
+        "SELECT id, trigger_time, recurrence FROM reminders "
+        "WHERE fired = 0 AND next_fire_at IS NULL"
+    ).fetchall()
+    updates = [
+        (next_fire_at(r["trigger_time"], r["recurrence"]), r["id"])
+        for r in rows
+    ]
+    conn.executemany(
+        "UPDATE reminders SET next_fire_at = ? WHERE id = ?",
+        [u for u in updates if u[0] is not None],
+    )
@@ -0,0 +1,97 @@
+"""Relaygent Notifications — in-process event bus for /notifications/stream.
+
+Events are kept in a bounded ring buffer so subscribers can resume from
+the last id they saw. Ids look like "<boot>-<seq>": after a restart the
+boot prefix changes and a resuming client is told to resync instead of
+silently missing events.
+
+Two kinds of publishers:
+    publish(kind, data)       — discrete events (a reminder fired)
+    publish_state(kind, data) — a source's current state (chat unread,
+                                Slack channels); only emitted on change
+"""
+
+import collections
+import threading
+import time
+
+import fastjson
+
+BUFFER_SIZE = 1000
+
+BOOT_ID = format(int(time.time()), "x")
+
+_buffer = collections.deque(maxlen=BUFFER_SIZE)  # [(seq, kind, data)]
+_seq = 0
+_states = {}      # kind -> JSON of last published state
+_refreshed = {}   # kind -> time.monotonic() of last state refresh
+_cond = threading.Condition()
+
+
+def publish(kind, data):
+    """Append an event and wake subscribers. Returns its id."""
+    global _seq
+    with _cond:
+        _seq += 1
+        _buffer.append((_seq, kind, data))
+        _cond.notify_all()
+        return f"{BOOT_ID}-{_seq}"
+
+
+def publish_state(kind, data):
+    """Record a source's current state; publish only if it changed.
+
+    data is the source's notification dict, or None when it has nothing
+    pending (published as {"source": kind, "count": 0}).
+    """
+    data = data or {"type": "message", "source": kind, "count": 0}
+    encoded = fastjson.dumps(data, sort_keys=True)
+    with _cond:
+        _refreshed[kind] = time.monotonic()
+        if _states.get(kind, _empty(kind)) == encoded:
+            return None
+        _states[kind] = encoded
+    return publish(kind, data)
+
+
+def _empty(kind):
+    return fastjson.dumps({"type": "message", "source": kind, "count": 0}, sort_keys=True)
+
+
+def refreshed_ago(kind):
+    """Seconds since kind's state was last refreshed (inf if never)."""
+    with _cond:
+        last = _refreshed.get(kind)
+    return float("inf") if last is None else time.monotonic() - last
+
+
+def head():
+    """Id of the latest event; subscribers start here by default."""
+    with _cond:
+        return f"{BOOT_ID}-{_seq}"
+
+
+def parse_id(event_id):
+    """Map a client's last event id to a sequence number.
+
+    Returns (seq, gap): gap is True when events after that id may have
+    been lost (unknown boot, malformed id, or evicted from the buffer).
+    """
+    boot, _, seq = (event_id or "").partition("-")
+    with _cond:
+        if boot != BOOT_ID or not seq.isdigit():
+            return _seq, True
+        seq = min(int(seq), _seq)
+        oldest = _buffer[0][0] if _buffer else _seq + 1
+        return seq, seq < oldest - 1
+
+
+def wait_since(seq, timeout):
+    """Block until events newer than seq exist (or timeout); return them."""
+    with _cond:
+        _cond.wait_for(lambda: _seq > seq, timeout)
+        return [e for e in _buffer if e[0] > seq]
+
+
+def format_sse(seq, kind, data):
+    return f"id: {BOOT_ID}-{seq}\nevent: {kind}\ndata: {fastjson.dumps(data).decode()}\n\n"
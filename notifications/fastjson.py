@@ -0,0 +1,42 @@
+"""Relaygent Notifications — JSON encoding for the hot paths.
+
+/notifications/pending is polled every second and can carry hundreds of
+Slack message previews; the Slack collector parses a history response per
+active channel. When orjson is installed it is used for both (several
+times faster than the stdlib encoder and decoder); otherwise the stdlib
+json module is used with the same compact output. Install it with
+`pip install orjson`.
+"""
+
+import json
+
+from flask import Response
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def dumps(obj, sort_keys=False):
+    """Encode obj as compact UTF-8 JSON bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False,
+                      sort_keys=sort_keys).encode()
+
+
+def loads(data):
+    """Decode JSON from bytes or str. Raises ValueError on invalid input."""
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+
+def response(obj, status=200):
+    """A JSON response, like jsonify() but through the fast encoder."""
+    return raw_response(dumps(obj), status)
+
+
+def raw_response(body, status=200):
+    """A response for an already-encoded JSON body."""
+    return Response(body, status=status, mimetype="application/json")
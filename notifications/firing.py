@@ -0,0 +1,104 @@
+"""Relaygent Notifications — firing due reminders.
+
+Shared by the scheduler thread and the per-poll fallback in routes.py.
+"""
+
+import time
+from datetime import timedelta
+
+import events
+import metrics
+from notif_config import CRONITER_AVAILABLE
+from schedule import advance
+
+STALE_AFTER = timedelta(hours=1)  # Overdue one-offs older than this fire silently
+FIRE_CHUNK = 500                  # Max ids per SELECT ... IN (...)
+
+REMINDERS_FIRED = metrics.Counter(
+    "relaygent_reminders_fired_total", "Reminders fired by the scheduler or a poll.")
+
+
+def fire_due(conn, now, ids=None):
+    """Fire every due reminder (optionally only those in ids).
+
+    Selecting and updating happen in one BEGIN IMMEDIATE transaction: all
+    state changes are applied with executemany and a single commit (one
+    WAL fsync), and a concurrent poller blocks on the write lock until we
+    commit, then sees those rows as already fired.
+
+    Returns (notifications, reschedules); reschedules is a list of
+    (id, next_fire_at) for recurring reminders.
+    """
+    start = time.perf_counter()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        rows = _select_due(conn, now, ids)
+        notifications, advanced, fired = _plan_fires(rows, now)
+        conn.executemany(
+            "UPDATE reminders SET fired = 1 WHERE id = ?", fired
+        )
+        conn.executemany(
+            "UPDATE reminders SET trigger_time = ?, next_fire_at = ? "
+            "WHERE id = ?",
+            advanced,
+        )
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    metrics.DB_QUERY.observe(time.perf_counter() - start, query="fire_due")
+    REMINDERS_FIRED.inc(len(notifications))
+    for note in notifications:
+        events.publish("reminder", note)
+    return notifications, [(rid, nxt) for _, nxt, rid in advanced]
+
+
+def _select_due(conn, now, ids):
+    query = (
+        "SELECT id, trigger_time, message, created_at, recurrence "
+        "FROM reminders WHERE fired = 0 AND next_fire_at <= ?"
+    )
+    if ids is None:
+        return conn.execute(
+            query + " ORDER BY next_fire_at", (now.isoformat(),)
+        ).fetchall()
+    rows = []
+    for i in range(0, len(ids), FIRE_CHUNK):
+        chunk = ids[i:i + FIRE_CHUNK]
+        rows += conn.execute(
+            query + f" AND id IN ({','.join('?' * len(chunk))})",
+            (now.isoformat(), *chunk),
+        ).fetchall()
+    order = {rid: i for i, rid in enumerate(ids)}  # Heap (time) order
+    rows.sort(key=lambda r: order[r["id"]])
+    return rows
+
+
+def _plan_fires(rows, now):
+    """Compute notifications and row updates for due rows, without writing.
+
+    Returns (notifications, advanced, fired) where advanced holds
+    (prev_occurrence, next_occurrence, id) and fired holds (id,).
+    """
+    stale_cutoff = (now - STALE_AFTER).isoformat()
+    notifications, advanced, fired = [], [], []
+    for r in rows:
+        note = {
+            "type": "reminder",
+            "id": r["id"],
+            "message": r["message"],
+            "trigger_time": r["trigger_time"],
+            "created_at": r["created_at"],
+        }
+        if r["recurrence"]:
+            if not CRONITER_AVAILABLE:
+                continue
+            prev_occ, next_occ = advance(r["recurrence"], now)
+            advanced.append((prev_occ, next_occ, r["id"]))
+            note["trigger_time"] = prev_occ
+        else:
+            fired.append((r["id"],))
+            if r["trigger_time"] < stale_cutoff:
+                continue
+        notifications.append(note)
+    return notifications, advanced, fired
@@ -0,0 +1,197 @@
+"""Relaygent Notifications — append-only delivery history.
+
+Every notification handed out by /notifications/pending is recorded once
+per source key (an unacknowledged chat or Slack item repeated on every poll
+is stored a single time) with its delivery time and, where known, latency.
+
+Rows live in one table per local day (history_YYYYMMDD), indexed by
+delivery time and by source. Retention drops whole day tables older than
+RETENTION_DAYS (no row-by-row DELETE, no scan, reminders untouched)
+whenever a new day's table is created.
+
+GET /notifications/history?since=&until=&source=&limit=&after_id= lists
+deliveries in time order (a Link header points at the next page);
+stats=1 instead returns per-source counts and latency figures plus
+deliveries per hour, for looking at wake frequency.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import urllib.parse
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from flask import jsonify, request
+
+import notif_config
+from db import get_db
+from notif_config import app
+
+RETENTION_DAYS = int(os.environ.get("RELAYGENT_HISTORY_RETENTION_DAYS", "30"))
+PREFIX = "history_"
+SEEN_LIMIT = 4096        # Recently recorded keys remembered to skip repeat inserts
+DEFAULT_LIMIT, MAX_LIMIT = 500, 5000
+
+_lock = threading.Lock()
+_seen = OrderedDict()
+_tables = set()  # (DB_PATH, table) partitions known to exist
+
+
+def _table(day):
+    return f"{PREFIX}{day:%Y%m%d}"
+
+
+def _ensure(conn, table, now):
+    if (notif_config.DB_PATH, table) in _tables:
+        return
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {table} (id INTEGER PRIMARY KEY, "
+                 "delivered_at TEXT NOT NULL, source TEXT NOT NULL, item_key TEXT NOT NULL, "
+                 "occurred_at TEXT, latency_s REAL, summary TEXT)")
+    conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_time ON {table} (delivered_at)")
+    conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {table}_source "
+                 f"ON {table} (source, item_key)")
+    _tables.add((notif_config.DB_PATH, table))
+    prune(conn, now)
+
+
+def partitions(conn):
+    """Existing day tables, oldest first."""
+    return [r[0] for r in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name GLOB ? "
+        "ORDER BY name", (PREFIX + "[0-9]*",))]
+
+
+def prune(conn, now=None):
+    """Drop day tables older than RETENTION_DAYS. Returns the dropped names."""
+    oldest = _table((now or datetime.now()) - timedelta(days=RETENTION_DAYS))
+    dropped = [t for t in partitions(conn) if t < oldest]
+    for table in dropped:
+        conn.execute(f"DROP TABLE {table}")
+        _tables.discard((notif_config.DB_PATH, table))
+    return dropped
+
+
+def _entries(note, now):
+    """(source, key, occurred_at, latency_s, summary) rows for one notification."""
+    source = note.get("source") or note.get("type", "unknown")
+    if note.get("type") == "reminder":
+        occurred = note.get("trigger_time")
+        try:
+            latency = (now - datetime.fromisoformat(occurred)).total_seconds()
+        except (TypeError, ValueError):
+            latency = None
+        return [("reminder", f"{note.get('id')}@{occurred}", occurred, latency,
+                 note.get("message", "")[:200])]
+    if source == "slack":
+        rows = []
+        for ch in note.get("channels", []):
+            newest = ch["messages"][-1]["ts"] if ch.get("messages") else ""
+            latency = now.timestamp() - float(newest) if newest else None
+            rows.append(("slack", f"{ch.get('id')}:{newest}", newest, latency,
+                         f"#{ch.get('name', '')} {ch.get('unread', 0)} unread"))
+        return rows
+    messages = note.get("messages") or []
+    occurred = messages[-1].get("timestamp") if messages else None
+    digest = hashlib.sha1(json.dumps(note, sort_keys=True, default=str).encode()).hexdigest()
+    return [(source, digest[:16], occurred, None, f"{note.get('count', len(messages))} item(s)")]
+
+
+def record(notifications, now=None):
+    """Store deliveries not recorded before. Returns how many rows were added."""
+    now = now or datetime.now()
+    rows = [e for note in notifications for e in _entries(note, now)]
+    with _lock:
+        rows = [r for r in rows if (r[0], r[1]) not in _seen]
+    if not rows:
+        return 0
+    table = _table(now)
+    with get_db() as conn:
+        _ensure(conn, table, now)
+        added = conn.executemany(
+            f"INSERT OR IGNORE INTO {table} (delivered_at, source, item_key, occurred_at, "
+            f"latency_s, summary) VALUES (?, ?, ?, ?, ?, ?)",
+            [(now.isoformat(), *r) for r in rows]).rowcount
+        conn.commit()
+    with _lock:
+        for r in rows:
+            _seen[(r[0], r[1])] = True
+        while len(_seen) > SEEN_LIMIT:
+            _seen.popitem(last=False)
+    return added
+
+
+def reset():
+    """Forget recorded keys and known partitions."""
+    with _lock:
+        _seen.clear()
+        _tables.clear()
+
+
+def _covering(conn, since, until):
+    return [t for t in partitions(conn) if _table(since) <= t <= _table(until)]
+
+
+def query(conn, since, until, source=None, after_id=None, limit=DEFAULT_LIMIT):
+    """Deliveries in [since, until) in (delivered_at, id) order."""
+    rows = []
+    for table in _covering(conn, since, until):
+        clauses = ["delivered_at < ?", "delivered_at >= ?" if after_id is None
+                   else "(delivered_at, id) > (?, ?)"]
+        params = [until.isoformat(), since.isoformat()]
+        params += [] if after_id is None else [after_id]
+        if source:
+            clauses.append("source = ?")
+            params.append(source)
+        rows += [dict(r) for r in conn.execute(
+            f"SELECT * FROM {table} WHERE {' AND '.join(clauses)} "
+            f"ORDER BY delivered_at, id LIMIT ?", (*params, limit - len(rows)))]
+        if len(rows) >= limit:
+            break
+    return rows
+
+
+def stats(conn, since, until):
+    """Per-source counts and latency, and deliveries per hour, in [since, until)."""
+    totals, per_hour = {}, {}
+    bounds = (since.isoformat(), until.isoformat())
+    for table in _covering(conn, since, until):
+        for source, n, lat_sum, lat_n, lat_max in conn.execute(
+                f"SELECT source, count(*), total(latency_s), count(latency_s), "
+                f"max(latency_s) FROM {table} WHERE delivered_at >= ? AND delivered_at < ? "
+                f"GROUP BY source", bounds):
+            t = totals.setdefault(source, [0, 0.0, 0, lat_max])
+            t[0], t[1], t[2] = t[0] + n, t[1] + lat_sum, t[2] + lat_n
+            t[3] = max((v for v in (t[3], lat_max) if v is not None), default=None)
+        per_hour.update(conn.execute(
+            f"SELECT substr(delivered_at, 1, 13), count(*) FROM {table} "
+            f"WHERE delivered_at >= ? AND delivered_at < ? GROUP BY 1", bounds).fetchall())
+    sources = {s: {"count": n, "latency_avg_s": round(ls / ln, 3) if ln else None,
+                   "latency_max_s": mx} for s, (n, ls, ln, mx) in totals.items()}
+    return {"sources": sources, "per_hour": per_hour}
+
+
+@app.route("/notifications/history", methods=["GET"])
+def get_history():
+    """Delivered notifications in a time range, or stats over it (stats=1)."""
+    now, args = datetime.now(), request.args
+    try:
+        since = datetime.fromisoformat(args["since"]) if args.get("since") else now - timedelta(1)
+        until = datetime.fromisoformat(args["until"]) if args.get("until") else now + timedelta(1)
+        limit = int(args.get("limit", DEFAULT_LIMIT))
+        after_id = int(args["after_id"]) if "after_id" in args else None
+    except ValueError:
+        return jsonify({"error": "since/until must be ISO datetimes, limit/after_id integers"}), 400
+    if not 1 <= limit <= MAX_LIMIT:
+        return jsonify({"error": f"limit must be between 1 and {MAX_LIMIT}"}), 400
+    with get_db() as conn:
+        if args.get("stats") == "1":
+            return jsonify(stats(conn, since, until))
+        rows = query(conn, since, until, args.get("source"), after_id, limit + 1)
+    resp = jsonify(rows[:limit])
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        nxt = urllib.parse.urlencode(dict(args, since=last["delivered_at"], after_id=last["id"]))
+        resp.headers["Link"] = f'<{request.path}?{nxt}>; rel="next"'
+    return resp
@@ -0,0 +1,90 @@
+"""Relaygent Notifications — cheap change detection for hub chat.
+
+The hub keeps chat in a local SQLite database (data/hub-chat/chat.db).
+Rather than asking the hub over HTTP every second (which decrypts every
+unread message each time), we hold one read-only connection to that file
+and watch PRAGMA data_version, which changes whenever another connection
+commits. Only then is the unread set re-summarized with a single
+aggregate query; message bodies are fetched from the hub only when that
+summary changes.
+
+If the database isn't reachable (hub on another machine, not created
+yet), unread_signature() returns None and callers fall back to HTTP.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+
+import notif_config
+
+logger = logging.getLogger(__name__)
+
+CHAT_DB_PATH = os.environ.get(
+    "RELAYGENT_HUB_CHAT_DB",
+    os.path.join(notif_config.DATA_DIR, "hub-chat", "chat.db"),
+)
+
+_SIGNATURE_SQL = (
+    "SELECT count(*), max(id), total(id) FROM messages "
+    "WHERE role = 'human' AND read = 0"
+)
+
+_lock = threading.Lock()
+_conn = None
+_conn_path = None
+_version = None
+_signature = None
+
+
+def _connection():
+    global _conn, _conn_path
+    if _conn is not None and _conn_path == CHAT_DB_PATH:
+        return _conn
+    _close()
+    if not os.path.exists(CHAT_DB_PATH):
+        return None
+    _conn = sqlite3.connect(
+        f"file:{CHAT_DB_PATH}?mode=ro", uri=True, timeout=1,
+        check_same_thread=False, isolation_level=None,
+    )
+    _conn_path = CHAT_DB_PATH
+    return _conn
+
+
+def unread_signature():
+    """(count, max id, id sum) of unread human messages, or None if unknown.
+
+    Costs one PRAGMA per call while nothing has been committed to the
+    chat database.
+    """
+    global _version, _signature
+    with _lock:
+        try:
+            conn = _connection()
+            if conn is None:
+                return None
+            version = conn.execute("PRAGMA data_version").fetchone()[0]
+            if version != _version or _signature is None:
+                # fetchall() finishes the statement so no read transaction lingers
+                _signature = tuple(conn.execute(_SIGNATURE_SQL).fetchall()[0])
+                _version = version
+            return _signature
+        except sqlite3.Error as e:
+            logger.debug("Hub chat database unavailable: %s", e)
+            _close()
+            return None
+
+
+def _close():
+    global _conn, _conn_path, _version, _signature
+    if _conn is not None:
+        _conn.close()
+    _conn = _conn_path = _version = _signature = None
+
+
+def reset():
+    """Close the watcher connection and forget cached state."""
+    with _lock:
+        _close()
@@ -0,0 +1,90 @@
+"""Local mock of the hub's chat, for tests and benchmarks.
+
+Keeps chat in a SQLite database with the hub's messages schema (so
+hub_chat can watch it) and serves GET /api/chat?mode=unread from it over
+HTTP/1.1 keep-alive. Point the service at it with RELAYGENT_HUB_CHAT_DB
+and RELAYGENT_HUB_PORT.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS messages (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        role TEXT NOT NULL,
+        content TEXT NOT NULL,
+        created_at TEXT NOT NULL DEFAULT (datetime('now')),
+        read INTEGER NOT NULL DEFAULT 0
+    )
+"""
+
+
+class MockHub:
+    """A hub chat stand-in on 127.0.0.1. Use as a context manager."""
+
+    def __init__(self, directory, unread=0):
+        self.db_path = os.path.join(directory, "chat.db")
+        self.requests = 0
+        with closing(self._connect()) as conn:
+            conn.execute(SCHEMA)
+        for i in range(unread):
+            self.send(f"message {i}")
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+
+    @property
+    def port(self):
+        return self._server.server_port
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, isolation_level=None)
+
+    def send(self, content, role="human"):
+        """Add a chat message; assistant messages are stored as read."""
+        with closing(self._connect()) as conn:
+            conn.execute("INSERT INTO messages (role, content, read) VALUES (?, ?, ?)",
+                         (role, content, int(role == "assistant")))
+
+    def unread(self):
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT created_at, content FROM messages "
+                                "WHERE role = 'human' AND read = 0 ORDER BY id").fetchall()
+        return {"count": len(rows),
+                "messages": [{"created_at": t, "content": c} for t, c in rows]}
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        hub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                hub.requests += 1
+                found = self.path.startswith("/api/chat")
+                body = json.dumps(hub.unread() if found else {"error": "not found"}).encode()
+                self.send_response(200 if found else 404)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
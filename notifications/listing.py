@@ -0,0 +1,101 @@
+"""Relaygent Notifications — bounded reminder listings for /pending and /upcoming.
+
+Both endpoints accept:
+
+    limit=N                 at most N rows (default DEFAULT_LIMIT, max MAX_LIMIT)
+    after_time=T&after_id=I rows strictly after (T, I) in listing order;
+                            after_time alone means strictly after T
+    fields=a,b              only these columns in each row (see FIELDS)
+    count=1                 {"count": N} for the filter instead of rows
+
+Pages are keyset-paginated on (sort column, id), so each page is an index
+range scan no matter how deep it is. The body stays a JSON array; when
+more rows follow, a Link header (rel="next") carries the next page's URL.
+"""
+
+import urllib.parse
+
+from flask import jsonify
+
+import fastjson
+import metrics
+from db import get_db
+
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 1000
+FIELDS = ("id", "trigger_time", "message", "created_at", "recurrence", "next_fire_at")
+
+
+class ListingError(ValueError):
+    """Invalid listing query parameters (answered with 400)."""
+
+
+def parse_args(args):
+    """Validate listing query parameters. Raises ListingError."""
+    try:
+        limit = int(args.get("limit", DEFAULT_LIMIT))
+        after_id = int(args["after_id"]) if "after_id" in args else None
+    except ValueError:
+        raise ListingError("limit and after_id must be integers") from None
+    if not 1 <= limit <= MAX_LIMIT:
+        raise ListingError(f"limit must be between 1 and {MAX_LIMIT}")
+    after_time = args.get("after_time")
+    if after_id is not None and after_time is None:
+        raise ListingError("after_id requires after_time")
+    fields = FIELDS
+    if args.get("fields"):
+        fields = tuple(dict.fromkeys(args["fields"].split(",")))
+        unknown = set(fields) - set(FIELDS)
+        if unknown:
+            raise ListingError(f"unknown fields: {', '.join(sorted(unknown))}")
+    return {"limit": limit, "after_time": after_time, "after_id": after_id,
+            "fields": fields, "count": args.get("count") == "1"}
+
+
+def fetch(conn, where, params, sort, opts):
+    """One page as a JSON array body, and the (time, id) cursor of the next page.
+
+    SQLite renders each row with json_object(), so no per-row dict or
+    encoder pass happens in Python; the rows are only joined.
+    """
+    clauses, params = [where], list(params)
+    if opts["after_id"] is not None:
+        clauses.append(f"({sort}, id) > (?, ?)")
+        params += [opts["after_time"], opts["after_id"]]
+    elif opts["after_time"] is not None:
+        clauses.append(f"{sort} > ?")
+        params.append(opts["after_time"])
+    row_json = ", ".join(f"'{f}', {f}" for f in opts["fields"])
+    cur = conn.cursor()
+    cur.row_factory = None  # Plain tuples; the pool's connections default to Row
+    rows = cur.execute(
+        f"SELECT json_object({row_json}), {sort}, id FROM reminders "
+        f"WHERE {' AND '.join(clauses)} ORDER BY {sort}, id LIMIT ?",
+        (*params, opts["limit"] + 1),
+    ).fetchall()
+    cursor = None
+    if len(rows) > opts["limit"]:
+        rows = rows[:opts["limit"]]
+        cursor = rows[-1][1:]
+    return "[" + ",".join(r[0] for r in rows) + "]", cursor
+
+
+def count(conn, where, params):
+    return conn.execute(f"SELECT count(*) FROM reminders WHERE {where}", params).fetchone()[0]
+
+
+def respond(request, where, params, sort, query):
+    """The listing response for a request: a page of rows, or the count."""
+    try:
+        opts = parse_args(request.args)
+    except ListingError as e:
+        return jsonify({"error": str(e)}), 400
+    with get_db() as conn, metrics.DB_QUERY.time(query=query):
+        if opts["count"]:
+            return jsonify({"count": count(conn, where, params)})
+        body, cursor = fetch(conn, where, params, sort, opts)
+    resp = fastjson.raw_response(body)
+    if cursor is not None:
+        args = dict(request.args, after_time=cursor[0], after_id=cursor[1])
+        resp.headers["Link"] = f'<{request.path}?{urllib.parse.urlencode(args)}>; rel="next"'
+    return resp
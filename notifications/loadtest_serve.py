@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Load test: fast-path latency while a slow poll is in flight.
+
+Usage: python3 loadtest_serve.py [--server serve|dev] [--slow SECONDS]
+                                 [--clients N] [--max-p99-ms MS]
+
+Starts the notifications service on a free port with a throwaway data dir
+and an injected slow collector that sleeps --slow seconds (standing in
+for a sluggish Slack API). While full polls hit it, N clients hammer
+/notifications/pending?fast=1 over keep-alive connections. Prints latency
+percentiles as JSON and exits 1 if p99 exceeds --max-p99-ms.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+_BOOT = """
+import sys, time
+sys.path.insert(0, {here!r})
+import routes
+routes._slow_collectors[:] = [("slow", lambda n: time.sleep({slow}))]
+if {dev}:
+    import server, db, scheduler
+    db.init_db(); scheduler.scheduler.start()
+    server.app.run(host="127.0.0.1", port={port})
+else:
+    import serve
+    serve.main()
+"""
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_healthy(port, timeout=15):
+    end = time.time() + timeout
+    while time.time() < end:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise SystemExit("service did not become healthy")
+
+
+def _fast_client(port, stop, latencies):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    while not stop.is_set():
+        start = time.perf_counter()
+        conn.request("GET", "/notifications/pending?fast=1")
+        resp = conn.getresponse()
+        resp.read()
+        latencies.append(time.perf_counter() - start)
+        if resp.getheader("Connection", "").lower() == "close":
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+
+
+def _slow_poll(port, slow):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=slow + 30)
+    conn.request("GET", "/notifications/pending")
+    conn.getresponse().read()
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--server", choices=["serve", "dev"], default="serve")
+    parser.add_argument("--slow", type=float, default=3.0)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--max-p99-ms", type=float, default=100.0)
+    args = parser.parse_args()
+
+    port = _free_port()
+    env = dict(os.environ, RELAYGENT_NOTIFICATIONS_PORT=str(port),
+               RELAYGENT_DATA_DIR=tempfile.mkdtemp(prefix="relaygent-load-"),
+               RELAYGENT_HUB_PORT=str(_free_port()))  # Nothing listens: chat check fails fast
+    boot = _BOOT.format(here=HERE, slow=args.slow, dev=args.server == "dev", port=port)
+    proc = subprocess.Popen([sys.executable, "-c", boot], env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        _wait_healthy(port)
+        stop, latencies = threading.Event(), []
+        slow = [threading.Thread(target=_slow_poll, args=(port, args.slow)) for _ in range(2)]
+        fast = [threading.Thread(target=_fast_client, args=(port, stop, latencies))
+                for _ in range(args.clients)]
+        for t in slow + fast:
+            t.start()
+        for t in slow:
+            t.join()
+        stop.set()
+        for t in fast:
+            t.join()
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+    ms = [v * 1000 for v in latencies]
+    report = {
+        "server": args.server, "slow_poll_s": args.slow, "clients": args.clients,
+        "requests": len(ms), "rps": round(len(ms) / args.slow, 1),
+        "p50_ms": round(_percentile(ms, 50), 2), "p99_ms": round(_percentile(ms, 99), 2),
+        "max_ms": round(max(ms), 2), "shutdown_exit_code": proc.returncode,
+    }
+    print(json.dumps(report))
+    sys.exit(0 if report["p99_ms"] <= args.max_p99_ms else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""Benchmark suite: reminder and collector paths under a seeded database.
+
+Usage: python3 loadtest_suite.py [--reminders N] [--recurring FRACTION] [--saturate]
+           [--duration SECONDS] [--output FILE] [--baseline FILE] [--tolerance F]
+
+Seeds a throwaway database with N reminders (one-off and recurring, a few
+already due), starts serve.py against it with a mocked hub (hub_mock) and
+Slack (slack_mock), then drives every scenario concurrently for --duration s:
+
+    pending_fast     GET /notifications/pending?fast=1   the 1s poll
+    pending_full     GET /notifications/pending          Slack included
+    upcoming         GET /upcoming
+    reminder_create  POST /reminder
+    reminder_delete  DELETE /reminder/<id>               of the one just created
+
+Scenarios run at realistic fixed rates by default; --saturate sends
+back-to-back instead to measure throughput. Paced latencies are measured
+from each request's scheduled send time, so a stalled server shows up in
+p99 rather than silently lowering the rate. Prints one JSON report
+(p50/p99/max ms, rps, errors per scenario, plus startup time). With
+--baseline, exits 1 if any p99 grew, or saturated rps fell, by more than
+--tolerance relative to that earlier report.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = tempfile.mkdtemp(prefix="relaygent-suite-")
+os.environ["RELAYGENT_DATA_DIR"] = DATA_DIR
+sys.path.insert(0, HERE)
+
+import db  # noqa: E402
+from hub_mock import MockHub  # noqa: E402
+from loadtest_serve import _free_port, _percentile, _wait_healthy  # noqa: E402
+from schedule import next_fire_at  # noqa: E402
+from slack_mock import MockSlack  # noqa: E402
+
+EXPRESSIONS = ["*/5 * * * *", "0 9 * * *", "0 */2 * * *", "30 8 * * 1-5",
+               "0 0 * * 0", "15 14 1 * *", "*/15 9-17 * * 1-5", "0 12 * * *"]
+
+# name: (clients, requests per second across all clients when paced)
+SCENARIOS = {"pending_fast": (4, 40), "pending_full": (1, 0.5),
+             "upcoming": (1, 2), "reminder_crud": (2, 10)}
+
+
+def seed(count, recurring, due=20):
+    """Insert count reminders; roughly `due` of the one-offs are already due."""
+    db.init_db()
+    now, rng, rows = datetime.now(), random.Random(0), []
+    for i in range(count):
+        if rng.random() < recurring:
+            expr, anchor = rng.choice(EXPRESSIONS), now.isoformat()
+        else:  # The first `due` are overdue; the rest spread over a year
+            minutes = -i - 1 if i < due else rng.randint(1, 525600)
+            expr, anchor = None, (now + timedelta(minutes=minutes)).isoformat()
+        rows.append((anchor, f"suite reminder {i}", expr, next_fire_at(anchor, expr)))
+    with db.get_db() as conn:
+        conn.executemany("INSERT INTO reminders (trigger_time, message, recurrence, "
+                         "next_fire_at) VALUES (?, ?, ?, ?)", rows)
+        conn.commit()
+    db.close_all()
+
+
+def _steps(name):
+    """Yield (label, method, path, body, expected status) for one iteration."""
+    if name == "reminder_crud":
+        when = (datetime.now() + timedelta(days=1)).isoformat()
+        recurrence = random.choice([None, None, random.choice(EXPRESSIONS)])
+        body = {"trigger_time": when, "message": "suite crud",
+                **({"recurrence": recurrence} if recurrence else {})}
+        rid = yield "reminder_create", "POST", "/reminder", body, 201
+        yield "reminder_delete", "DELETE", f"/reminder/{rid}", None, 200
+    else:
+        path = {"pending_fast": "/notifications/pending?fast=1",
+                "pending_full": "/notifications/pending", "upcoming": "/upcoming"}[name]
+        yield name, "GET", path, None, 200
+
+
+def _client(port, name, interval, stop, results):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    scheduled = time.perf_counter()
+    while not stop.is_set():
+        if interval:
+            time.sleep(max(0.0, scheduled - time.perf_counter()))
+        start = scheduled if interval else time.perf_counter()
+        steps, sent = _steps(name), None
+        try:
+            while True:
+                label, method, path, body, expect = steps.send(sent)
+                conn.request(method, path, json.dumps(body) if body else None,
+                             {"Content-Type": "application/json"} if body else {})
+                resp = conn.getresponse()
+                data = resp.read()
+                results.append((label, time.perf_counter() - start, resp.status == expect))
+                sent = json.loads(data).get("id") if label == "reminder_create" else None
+                start = time.perf_counter()
+        except StopIteration:
+            pass
+        except (OSError, http.client.HTTPException, ValueError):
+            results.append((name, time.perf_counter() - start, False))
+            conn.close()
+        scheduled += interval
+
+
+def _summarize(results, duration):
+    report = {}
+    for label in sorted({r[0] for r in results}):
+        ms = [r[1] * 1000 for r in results if r[0] == label]
+        report[label] = {
+            "requests": len(ms), "errors": sum(1 for r in results if r[0] == label and not r[2]),
+            "rps": round(len(ms) / duration, 1), "p50_ms": round(_percentile(ms, 50), 2),
+            "p99_ms": round(_percentile(ms, 99), 2), "max_ms": round(max(ms), 2)}
+    return report
+
+
+def regressions(report, baseline, tolerance):
+    """Scenarios whose p99 (or saturated rps) got worse than baseline allows."""
+    found = []
+    for label, base in baseline["scenarios"].items():
+        cur = report["scenarios"].get(label)
+        if cur is None:
+            continue
+        if cur["p99_ms"] > base["p99_ms"] * (1 + tolerance) + 1:  # 1ms absolute slack
+            found.append(f"{label}: p99 {base['p99_ms']} -> {cur['p99_ms']} ms")
+        if report["saturate"] and cur["rps"] < base["rps"] * (1 - tolerance):
+            found.append(f"{label}: {base['rps']} -> {cur['rps']} req/s")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reminders", type=int, default=10000)
+    parser.add_argument("--recurring", type=float, default=0.3)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--saturate", action="store_true")
+    parser.add_argument("--output")
+    parser.add_argument("--baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    seed(args.reminders, args.recurring)
+    slack_dir = os.path.join(DATA_DIR, ".relaygent", "slack")  # HOME is DATA_DIR
+    os.makedirs(slack_dir)
+    with open(os.path.join(slack_dir, "token.json"), "w") as f:
+        json.dump({"access_token": "xoxp-suite"}, f)
+    port = _free_port()
+    with MockHub(DATA_DIR, unread=1) as hub, MockSlack(channels=20, latest_hints=True) as slack:
+        env = dict(os.environ, HOME=DATA_DIR, RELAYGENT_NOTIFICATIONS_PORT=str(port),
+                   RELAYGENT_HUB_PORT=str(hub.port), RELAYGENT_HUB_CHAT_DB=hub.db_path,
+                   RELAYGENT_SLACK_API_BASE=slack.url)
+        started = time.perf_counter()
+        proc = subprocess.Popen([sys.executable, os.path.join(HERE, "serve.py")], env=env,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            _wait_healthy(port, timeout=120)
+            startup = time.perf_counter() - started
+            stop, results, threads = threading.Event(), [], []
+            for name, (clients, rate) in SCENARIOS.items():
+                interval = 0 if args.saturate else clients / rate
+                threads += [threading.Thread(target=_client,
+                                             args=(port, name, interval, stop, results))
+                            for _ in range(clients)]
+            for t in threads:
+                t.start()
+            time.sleep(args.duration)
+            stop.set()
+            for t in threads:
+                t.join()
+        finally:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+    report = {"reminders": args.reminders, "recurring": args.recurring,
+              "duration_s": args.duration, "saturate": args.saturate,
+              "startup_s": round(startup, 3), "scenarios": _summarize(results, args.duration)}
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(json.dumps(report, indent=2))
+    if args.baseline:
+        with open(args.baseline) as f:
+            found = regressions(report, json.load(f), args.tolerance)
+        for line in found:
+            print("REGRESSION", line, file=sys.stderr)
+        sys.exit(1 if found else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""Relaygent Notifications — background SQLite maintenance.
+
+The database takes a steady trickle of small writes, so without care the
+WAL file keeps growing between automatic checkpoints, deleted pages sit
+on the freelist and the query planner works from stale (or no) ANALYZE
+statistics. A daemon thread wakes every TICK seconds and, only while the
+service is idle (no request in flight and none for IDLE_GAP seconds; open
+event streams don't count), runs whichever of these is due:
+
+    passive checkpoint     every CHECKPOINT_INTERVAL
+    truncating checkpoint  when the WAL passes WAL_TRUNCATE_BYTES, or every
+                           TRUNCATE_INTERVAL; skipped rather than waited for
+                           if readers are active (short busy timeout)
+    incremental vacuum     every VACUUM_INTERVAL, releasing free pages
+    ANALYZE                every ANALYZE_INTERVAL, sampled (analysis_limit)
+    history pruning        with the vacuum, so old days go even if no
+                           delivery creates a new day's table
+
+Databases created before auto_vacuum=INCREMENTAL get a one-off VACUUM the
+first time they are idle. Sizes and last-run times are reported by
+status(), GET /notifications/maintenance and as /metrics gauges.
+"""
+
+import logging
+import os
+import threading
+import time
+
+from flask import g, jsonify, request
+
+import history
+import metrics
+import notif_config
+from db import get_db
+from notif_config import app
+
+logger = logging.getLogger(__name__)
+
+TICK = 5
+IDLE_GAP = 0.5
+CHECKPOINT_INTERVAL = 60
+TRUNCATE_INTERVAL = 900
+WAL_TRUNCATE_BYTES = 4 * 1024 * 1024
+VACUUM_INTERVAL = 3600
+ANALYZE_INTERVAL = 6 * 3600
+CHECKPOINT_BUSY_MS = 100
+_LONG_LIVED = {"/notifications/stream"}
+
+_activity = threading.Lock()
+_in_flight = 0
+_last_request = 0.0
+
+
+@app.before_request
+def _request_started():
+    global _in_flight
+    if request.path not in _LONG_LIVED:
+        g.maintenance_counted = True
+        with _activity:
+            _in_flight += 1
+
+
+@app.teardown_request
+def _request_finished(exc):
+    global _in_flight, _last_request
+    # Teardown can run twice for one request (test client context preservation)
+    if g.pop("maintenance_counted", False):
+        with _activity:
+            _in_flight -= 1
+            _last_request = time.monotonic()
+
+
+def idle():
+    with _activity:
+        return _in_flight == 0 and time.monotonic() - _last_request >= IDLE_GAP
+
+
+def sizes():
+    """Database, WAL and free-page sizes in bytes."""
+    path = notif_config.DB_PATH
+    wal = path + "-wal"
+    with get_db() as conn:
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    return {"db_bytes": os.path.getsize(path) if os.path.exists(path) else 0,
+            "wal_bytes": os.path.getsize(wal) if os.path.exists(wal) else 0,
+            "free_bytes": free * page_size}
+
+
+def checkpoint(mode="PASSIVE"):
+    """Run a WAL checkpoint. Returns (busy, wal frames, frames checkpointed)."""
+    with get_db() as conn:
+        conn.execute(f"PRAGMA busy_timeout = {CHECKPOINT_BUSY_MS}")
+        try:
+            return tuple(conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone())
+        finally:
+            conn.execute("PRAGMA busy_timeout = 5000")  # sqlite3.connect(timeout=5)
+
+
+def vacuum():
+    """Release free pages (converting the file to incremental auto_vacuum once)."""
+    with get_db() as conn:
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")  # Takes effect only through a full VACUUM
+        else:
+            # Frees one page per step and returns no rows, so run it to completion
+            conn.executescript("PRAGMA incremental_vacuum;")
+        history.prune(conn)
+        conn.commit()
+
+
+def analyze():
+    with get_db() as conn:
+        conn.execute("PRAGMA analysis_limit = 1000")
+        conn.execute("ANALYZE")
+        conn.commit()
+
+
+MAINTENANCE_RUNS = metrics.Counter(
+    "relaygent_db_maintenance_runs_total", "Completed database maintenance tasks.",
+    ("task",))
+metrics.Gauge("relaygent_db_size_bytes", "Database, WAL and free-page bytes.", ("file",),
+              fn=lambda: {(k[:-6],): v for k, v in sizes().items()})
+
+
+class DbMaintenance:
+    """Runs due maintenance tasks from a daemon thread while the service is idle."""
+
+    def __init__(self):
+        self._stop = threading.Event()
+        self._thread = None
+        self.last_run = {}  # task -> time.time() of its last completed run
+
+    def _due(self, task, interval, now):
+        return now - self.last_run.get(task, 0) >= interval
+
+    def run_due(self, now=None):
+        """Run every task whose interval has passed. Returns the names run."""
+        now = time.time() if now is None else now
+        ran = []
+        if self._due("checkpoint", CHECKPOINT_INTERVAL, now):
+            checkpoint("PASSIVE")
+            ran.append("checkpoint")
+        if self._due("truncate", TRUNCATE_INTERVAL, now) or \
+                sizes()["wal_bytes"] > WAL_TRUNCATE_BYTES:
+            if checkpoint("TRUNCATE")[0] == 0:  # Not busy; otherwise retried next tick
+                ran.append("truncate")
+        if self._due("vacuum", VACUUM_INTERVAL, now):
+            vacuum()
+            ran.append("vacuum")
+        if self._due("analyze", ANALYZE_INTERVAL, now):
+            analyze()
+            ran.append("analyze")
+        for task in ran:
+            self.last_run[task] = now
+            MAINTENANCE_RUNS.inc(task=task)
+        return ran
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="db-maintenance", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=10)
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(TICK):
+            if not idle():
+                continue
+            try:
+                ran = self.run_due()
+            except Exception:
+                logger.exception("Database maintenance failed")
+                continue
+            if ran:
+                logger.debug("Database maintenance ran %s", ", ".join(ran))
+
+    def status(self):
+        return dict(sizes(), last_run=dict(self.last_run))
+
+
+maintenance = DbMaintenance()
+
+
+@app.route("/notifications/maintenance", methods=["GET"])
+def maintenance_status():
+    """Database sizes and when each maintenance task last ran."""
+    return jsonify(maintenance.status())
@@ -16,6 +16,7 @@ import { tools } from "./mcp-tools.mjs";
 
 const API_PORT = process.env.RELAYGENT_NOTIFICATIONS_PORT || "8083";
 const API_URL = `http://127.0.0.1:${API_PORT}`;
+const LIST_LIMIT = 100; // list_reminders shows the soonest this many
 
 async function apiCall(path, method = "GET", body = null) {
   const options = {
@@ -50,20 +51,35 @@ server.setRequestHandler(CallToolRequestSchema, async (request) => {
         const recur = args.recurrence ? ` (recurring: ${args.recurrence})` : "";
         return text(`Reminder set (ID: ${result.id}). Will trigger at ${args.trigger_time}${recur}: "${args.message}"`);
       }
+      case "set_reminders": {
+        const operations = args.reminders.map(r => ({ op: "create", ...r }));
+        const result = await apiCall("/reminders/bulk", "POST", { operations });
+        if (result.error) return text(`Error: ${result.error}`);
+        const lines = result.results.map((r, i) => r.status === "created"
+          ? `- [${r.id}] ${args.reminders[i].trigger_time}: ${args.reminders[i].message}`
+          : `- failed (${r.error}): ${args.reminders[i].message}`);
+        return text(`Set ${result.applied} of ${operations.length} reminders:\n${lines.join("\n")}`);
+      }
       case "list_reminders": {
-        const reminders = await apiCall("/upcoming");
+        const reminders = await apiCall(
+          `/upcoming?limit=${LIST_LIMIT}&fields=id,trigger_time,recurrence,message`);
         if (reminders.length === 0) return text("No pending reminders.");
         const list = reminders.map(r => {
           const recur = r.recurrence ? ` [${r.recurrence}]` : "";
           return `- [${r.id}] ${r.trigger_time}${recur}: ${r.message}`;
         }).join("\n");
-        return text(`Pending reminders:\n${list}`);
+        let more = "";
+        if (reminders.length === LIST_LIMIT) {
+          const { count } = await apiCall("/upcoming?count=1");
+          more = `\n(showing the first ${LIST_LIMIT} of ${count})`;
+        }
+        return text(`Pending reminders:\n${list}${more}`);
       }
       case "cancel_reminder":
         await apiCall(`/reminder/${args.id}`, "DELETE");
         return text(`Reminder ${args.id} cancelled.`);
       case "get_pending_triggers": {
-        const pending = await apiCall("/pending");
+        const pending = await apiCall(`/pending?limit=${LIST_LIMIT}&fields=id,message`);
         if (pending.length === 0) return text("No triggers due.");
         const list = pending.map(r => `- [${r.id}] ${r.message}`).join("\n");
         return text(`Due now:\n${list}`);
@@ -25,6 +25,29 @@ export const tools = [
       required: ["trigger_time", "message"],
     },
   },
+  {
+    name: "set_reminders",
+    description: "Set many reminders in one call (one transaction). Each item takes the same fields as set_reminder. Prefer this over repeated set_reminder calls when scheduling several check-ins.",
+    inputSchema: {
+      type: "object",
+      properties: {
+        reminders: {
+          type: "array",
+          description: "Reminders to create: [{trigger_time, message, recurrence?}, ...]",
+          items: {
+            type: "object",
+            properties: {
+              trigger_time: { type: "string" },
+              message: { type: "string" },
+              recurrence: { type: "string" },
+            },
+            required: ["trigger_time", "message"],
+          },
+        },
+      },
+      required: ["reminders"],
+    },
+  },
   {
     name: "list_reminders",
     description: "List all pending (unfired) reminders",
@@ -1,5 +1,6 @@
 """Relaygent Notifications — configuration and app setup."""
 
+import importlib.util
 import logging
 import os
 
@@ -16,8 +17,5 @@ _REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = os.environ.get("RELAYGENT_DATA_DIR", os.path.join(_REPO_DIR, "data"))
 DB_PATH = os.path.join(DATA_DIR, "reminders.db")
 
-try:
-    from croniter import croniter  # noqa: F401
-    CRONITER_AVAILABLE = True
-except ImportError:
-    CRONITER_AVAILABLE = False
+# Checked without importing: croniter (and dateutil) load on first use
+CRONITER_AVAILABLE = importlib.util.find_spec("croniter") is not None
@@ -2,37 +2,36 @@
 
 from datetime import datetime
 
+import listing
+import metrics
 from notif_config import CRONITER_AVAILABLE, app
 from db import get_db
 from flask import jsonify, request
+from schedule import compile_cron, next_fire_at
+from scheduler import scheduler
 
-if CRONITER_AVAILABLE:
-    from croniter import croniter
+REMINDER_CHANGES = metrics.Counter(
+    "relaygent_reminder_changes_total", "Reminders created, deleted, snoozed or fired via the API.",
+    ("action",))
 
 
 @app.route("/pending", methods=["GET"])
 def get_pending():
-    """Return all pending (unfired) reminders that are due."""
-    now = datetime.now().isoformat()
-    with get_db() as conn:
-        rows = conn.execute(
-            "SELECT id, trigger_time, message, created_at, recurrence "
-            "FROM reminders WHERE fired = 0 AND trigger_time <= ? "
-            "ORDER BY trigger_time",
-            (now,),
-        ).fetchall()
-    return jsonify([dict(r) for r in rows])
+    """Return pending (unfired) reminders that are due, soonest first.
+
+    Paginated and projectable; see listing.py for the query parameters.
+    """
+    return listing.respond(request, "fired = 0 AND next_fire_at <= ?",
+                           (datetime.now().isoformat(),), "next_fire_at", "pending")
 
 
 @app.route("/upcoming", methods=["GET"])
 def get_upcoming():
-    """Return all unfired reminders (due or not)."""
-    with get_db() as conn:
-        rows = conn.execute(
-            "SELECT id, trigger_time, message, created_at, recurrence "
-            "FROM reminders WHERE fired = 0 ORDER BY trigger_time"
-        ).fetchall()
-    return jsonify([dict(r) for r in rows])
+    """Return unfired reminders (due or not), by trigger time.
+
+    Paginated and projectable; see listing.py for the query parameters.
+    """
+    return listing.respond(request, "fired = 0", (), "trigger_time", "upcoming")
 
 
 MAX_MESSAGE_LEN = 2000
@@ -52,39 +51,49 @@ def _validate_cron(value):
     if not CRONITER_AVAILABLE:
         return True  # Can't validate without croniter, allow it
     try:
-        croniter(value)
+        compile_cron(value)
         return True
     except (ValueError, TypeError, KeyError):
         return False
 
 
-@app.route("/reminder", methods=["POST"])
-def create_reminder():
-    """Create a new reminder. JSON: {trigger_time, message, recurrence?}"""
-    data = request.get_json()
-    if not data or "trigger_time" not in data or "message" not in data:
-        return jsonify({"error": "trigger_time and message required"}), 400
-
+def validate_reminder(data):
+    """Check a create payload. Returns (error message or None, fields tuple)."""
+    if not isinstance(data, dict) or "trigger_time" not in data or "message" not in data:
+        return "trigger_time and message required", None
     trigger_time = data["trigger_time"]
     message = data["message"]
     recurrence = data.get("recurrence")
-
     if not isinstance(trigger_time, str) or not _validate_iso(trigger_time):
-        return jsonify({"error": "trigger_time must be valid ISO datetime"}), 400
+        return "trigger_time must be valid ISO datetime", None
     if not isinstance(message, str) or len(message) > MAX_MESSAGE_LEN:
-        return jsonify({"error": f"message must be string, max {MAX_MESSAGE_LEN} chars"}), 400
+        return f"message must be string, max {MAX_MESSAGE_LEN} chars", None
     if recurrence is not None:
         if not isinstance(recurrence, str) or not _validate_cron(recurrence):
-            return jsonify({"error": "recurrence must be valid cron expression"}), 400
+            return "recurrence must be valid cron expression", None
+    return None, (trigger_time, message, recurrence)
+
+
+@app.route("/reminder", methods=["POST"])
+def create_reminder():
+    """Create a new reminder. JSON: {trigger_time, message, recurrence?}"""
+    error, fields = validate_reminder(request.get_json())
+    if error:
+        return jsonify({"error": error}), 400
+    trigger_time, message, recurrence = fields
 
-    with get_db() as conn:
+    fire_at = next_fire_at(trigger_time, recurrence)
+    with get_db() as conn, metrics.DB_QUERY.time(query="create"):
         cursor = conn.execute(
-            "INSERT INTO reminders (trigger_time, message, recurrence) "
-            "VALUES (?, ?, ?)",
-            (trigger_time, message, recurrence),
+            "INSERT INTO reminders "
+            "(trigger_time, message, recurrence, next_fire_at) "
+            "VALUES (?, ?, ?, ?)",
+            (trigger_time, message, recurrence, fire_at),
         )
         conn.commit()
         reminder_id = cursor.lastrowid
+    scheduler.schedule(reminder_id, fire_at)
+    REMINDER_CHANGES.inc(action="created")
 
     result = {"id": reminder_id, "status": "created"}
     if recurrence:
@@ -95,64 +104,47 @@ def create_reminder():
 @app.route("/reminder/<int:reminder_id>", methods=["DELETE"])
 def delete_reminder(reminder_id):
     """Delete/cancel a reminder."""
-    with get_db() as conn:
+    with get_db() as conn, metrics.DB_QUERY.time(query="delete"):
         cursor = conn.execute(
             "DELETE FROM reminders WHERE id = ?", (reminder_id,)
         )
         conn.commit()
         if cursor.rowcount == 0:
             return jsonify({"error": "reminder not found"}), 404
+    scheduler.cancel(reminder_id)
+    REMINDER_CHANGES.inc(action="deleted")
     return jsonify({"status": "deleted"})
 
 
 @app.route("/reminder/<int:reminder_id>/fire", methods=["POST"])
 def fire_reminder(reminder_id):
     """Mark a reminder as fired. Recurring reminders get rescheduled."""
-    with get_db() as conn:
+    with get_db() as conn, metrics.DB_QUERY.time(query="fire"):
         row = conn.execute(
             "SELECT recurrence, trigger_time FROM reminders WHERE id = ?",
             (reminder_id,),
         ).fetchone()
 
         if row and row["recurrence"] and CRONITER_AVAILABLE:
-            cron = croniter(row["recurrence"], datetime.now())
-            next_time = cron.get_next(datetime).isoformat()
+            cron = compile_cron(row["recurrence"])
+            next_time = cron.next(datetime.now()).isoformat()
             conn.execute(
-                "UPDATE reminders SET trigger_time = ? WHERE id = ?",
-                (next_time, reminder_id),
+                "UPDATE reminders SET trigger_time = ?, next_fire_at = ? "
+                "WHERE id = ?",
+                (next_time, next_time, reminder_id),
             )
             conn.commit()
+            scheduler.schedule(reminder_id, next_time)
+            REMINDER_CHANGES.inc(action="fired")
             return jsonify({
                 "status": "rescheduled", "next_trigger": next_time,
             })
-        conn.execute(
+        updated = conn.execute(
             "UPDATE reminders SET fired = 1 WHERE id = ?",
             (reminder_id,),
-        )
+        ).rowcount
         conn.commit()
+        scheduler.cancel(reminder_id)
+        if updated:  # Unknown ids still answer "fired" but aren't counted
+            REMINDER_CHANGES.inc(action="fired")
         return jsonify({"status": "fired"})
-
-
-def is_recurring_reminder_due(recurrence, last_trigger_time):
-    """Check if recurring reminder should fire now.
-
-    Compares most recent cron occurrence against last_trigger_time.
-    If the last occurrence is newer than when we last fired, it's due.
-    No time window — reminders can't be missed due to polling gaps.
-
-    Returns (is_due, prev_occurrence_iso).
-    """
-    if not CRONITER_AVAILABLE:
-        return False, ""
-
-    now = datetime.now()
-    cron = croniter(recurrence, now)
-    prev_occurrence = cron.get_prev(datetime)
-
-    # Only fire if this occurrence hasn't been fired yet
-    if last_trigger_time:
-        last_trigger_dt = datetime.fromisoformat(last_trigger_time)
-        if last_trigger_dt >= prev_occurrence:
-            return False, ""
-
-    return True, prev_occurrence.isoformat()
@@ -3,13 +3,22 @@
 import json
 import logging
 import os
+import time
 import urllib.request
-from datetime import datetime, timedelta
-
+from datetime import datetime
+
+import collectors
+import events
+import fastjson
+import history
+import hub_chat
+import metrics
 from notif_config import app
 from db import get_db
-from flask import jsonify, request
-from reminders import is_recurring_reminder_due
+from flask import Response, g, jsonify, request
+from werkzeug.utils import import_string
+from firing import fire_due
+from scheduler import scheduler
 
 logger = logging.getLogger(__name__)
 
@@ -25,109 +34,153 @@ def get_notifications():
         fast=1 — only check fast local sources (DB reminders + hub chat).
                  Skips slow external APIs (Slack, email). Used by the
                  notification-poller daemon which polls every 1s.
+
+    The X-Relaygent-Collectors header carries per-collector timings and,
+    for slow collectors, a status (ok, partial, stale or error).
+
+    Responses carry an ETag of the notification set. A client sending it
+    back in If-None-Match gets an empty 304 while the set is unchanged.
     """
     fast_mode = request.args.get("fast") == "1"
     skip_sources = set(request.args.get("skip", "").split(",")) - {""}
-    notifications = []
-    try:
-        _collect_due_reminders(notifications)
-    except Exception:
-        logger.exception("Failed to collect due reminders")
+    notifications, timings = [], {}
+    for name, collect in (("reminders", _collect_due_reminders),
+                          ("chat", _collect_chat_messages)):
+        start = time.monotonic()
+        try:
+            collect(notifications)
+        except Exception:
+            logger.exception(f"Failed to collect {name}")
+        elapsed = time.monotonic() - start
+        metrics.COLLECTOR_DURATION.observe(elapsed, collector=name)
+        timings[name] = {"ms": round(elapsed * 1000, 1)}
+    if not fast_mode:
+        timings.update(collectors.run_all(
+            [(n, c) for n, c in _slow_collectors if n not in skip_sources],
+            notifications,
+        ))
     try:
-        _collect_chat_messages(notifications)
+        history.record(notifications)
     except Exception:
-        logger.exception("Failed to collect chat messages")
-    if not fast_mode:
-        for name, collector in _slow_collectors:
-            if name in skip_sources:
-                continue
-            try:
-                collector(notifications)
-            except Exception:
-                logger.exception(f"Failed in {name}")
-    return jsonify(notifications)
+        logger.exception("Failed to record notification history")
+    resp = fastjson.response(notifications)
+    resp.headers["X-Relaygent-Collectors"] = json.dumps(timings, separators=(",", ":"))
+    resp.add_etag()
+    return resp.make_conditional(request)
 
 
-# Slow collectors — external API calls, skipped in fast mode.
+# Slow collectors — external API calls, skipped in fast mode. They run
+# concurrently with per-collector deadlines; see collectors.py.
 # Each entry is (name, function). Use ?skip=name to skip specific collectors.
 _slow_collectors = []
 
 
 def _collect_due_reminders(notifications):
-    """Add due reminders (one-off and recurring) to notifications list."""
-    now = datetime.now()
-    now_iso = now.isoformat()
-    stale_cutoff = (now - timedelta(hours=1)).isoformat()
+    """Add due reminders (one-off and recurring) to notifications list.
 
+    With the scheduler running this just drains its ready queue. Otherwise
+    rows whose precomputed next_fire_at has passed are read via the
+    (fired, next_fire_at) index and fired here in one transaction.
+    """
+    if scheduler.running:
+        notifications.extend(scheduler.drain())
+        return
     with get_db() as conn:
-        rows = conn.execute(
-            "SELECT id, trigger_time, message, created_at, recurrence "
-            "FROM reminders WHERE fired = 0 ORDER BY trigger_time"
-        ).fetchall()
-
-        for r in rows:
-            if r["recurrence"]:
-                is_due, prev_occ = is_recurring_reminder_due(
-                    r["recurrence"], r["trigger_time"]
-                )
-                if is_due:
-                    conn.execute(
-                        "UPDATE reminders SET trigger_time = ? WHERE id = ?",
-                        (prev_occ, r["id"]),
-                    )
-                    conn.commit()
-                    notifications.append({
-                        "type": "reminder",
-                        "id": r["id"],
-                        "message": r["message"],
-                        "trigger_time": prev_occ,
-                        "created_at": r["created_at"],
-                    })
-            elif r["trigger_time"] <= now_iso:
-                conn.execute(
-                    "UPDATE reminders SET fired = 1 WHERE id = ?",
-                    (r["id"],),
-                )
-                conn.commit()
-                if r["trigger_time"] >= stale_cutoff:
-                    notifications.append({
-                        "type": "reminder",
-                        "id": r["id"],
-                        "message": r["message"],
-                        "trigger_time": r["trigger_time"],
-                        "created_at": r["created_at"],
-                    })
+        fired, _ = fire_due(conn, datetime.now())
+    notifications.extend(fired)
+
+
+_chat_cache = {"signature": None, "notif": None}
 
 
 def _collect_chat_messages(notifications):
-    """Check hub chat for unread messages."""
-    try:
-        url = f"http://{HUB_HOST}:{HUB_PORT}/api/chat?mode=unread"
-        req = urllib.request.Request(url, method="GET")
-        with urllib.request.urlopen(req, timeout=2) as resp:
-            data = json.loads(resp.read().decode())
-        if data.get("count", 0) > 0:
-            messages = []
-            for m in data.get("messages", []):
-                messages.append({
-                    "timestamp": m.get("created_at", ""),
-                    "content": m.get("content", ""),
-                })
-            notifications.append({
-                "type": "message",
-                "source": "chat",
-                "count": data["count"],
-                "messages": messages,
-            })
-    except (urllib.error.URLError, json.JSONDecodeError, OSError):
-        logger.warning("Failed to check hub chat for unread messages", exc_info=True)
-
-
-import slack_collector  # noqa: E402
-
-_slow_collectors.append(("slack", slack_collector.collect))
+    """Check hub chat for unread messages.
+
+    The hub is only asked for message bodies when hub_chat reports that
+    the unread set changed (or can't tell); otherwise the last result is
+    reused. No unread messages means no request at all.
+    """
+    signature = hub_chat.unread_signature()
+    if signature is not None and signature == _chat_cache["signature"]:
+        notif = _chat_cache["notif"]
+    elif signature is not None and signature[0] == 0:
+        notif = None
+    else:
+        try:
+            notif = _fetch_chat_messages()
+        except (urllib.error.URLError, json.JSONDecodeError, OSError):
+            logger.warning("Failed to check hub chat for unread messages", exc_info=True)
+            return
+    _chat_cache.update(signature=signature, notif=notif)
+    if notif:
+        notifications.append(notif)
+    events.publish_state("chat", notif)
+
+
+def _fetch_chat_messages():
+    """GET unread messages from the hub. Returns a notification or None."""
+    url = f"http://{HUB_HOST}:{HUB_PORT}/api/chat?mode=unread"
+    req = urllib.request.Request(url, method="GET")
+    with urllib.request.urlopen(req, timeout=2) as resp:
+        data = json.loads(resp.read().decode())
+    if data.get("count", 0) <= 0:
+        return None
+    messages = []
+    for m in data.get("messages", []):
+        messages.append({
+            "timestamp": m.get("created_at", ""),
+            "content": m.get("content", ""),
+        })
+    return {
+        "type": "message",
+        "source": "chat",
+        "count": data["count"],
+        "messages": messages,
+    }
+
+
+def _lazy(target):
+    """A stand-in for "module.attr" that imports the module on first call.
+
+    Optional sources pull in their own HTTP/TLS stacks; deferring them
+    keeps restarts fast, and a source that is never polled never loads.
+    """
+    def call(*args, **kwargs):
+        return import_string(target)(*args, **kwargs)
+    call.__name__ = target.rpartition(".")[2]
+    return call
+
+
+_slow_collectors.append(("slack", _lazy("slack_collector.collect")))
+app.add_url_rule("/notifications/ack-slack", view_func=_lazy("slack_collector.ack_slack"),
+                 methods=["POST"])
+app.add_url_rule("/notifications/slack/limits",
+                 view_func=_lazy("slack_collector.slack_limits"), methods=["GET"])
 
 
 @app.route("/health", methods=["GET"])
 def health():
     return jsonify({"status": "ok"})
+
+
+@app.route("/metrics", methods=["GET"])
+def metrics_endpoint():
+    """Prometheus text exposition of the service's metrics."""
+    return Response(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
+
+@app.before_request
+def _start_request_timer():
+    g.request_start = time.perf_counter()
+
+
+@app.after_request
+def _record_request(response):
+    start = g.get("request_start")
+    if start is not None:
+        # The URL rule, not the path, keeps label cardinality bounded
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        metrics.HTTP_DURATION.observe(time.perf_counter() - start, route=route)
+        metrics.HTTP_REQUESTS.inc(route=route, method=request.method,
+                                  status=response.status_code)
+    return response
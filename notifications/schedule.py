@@ -0,0 +1,104 @@
+"""Relaygent Notifications — reminder fire-time computation.
+
+Every unfired reminder stores next_fire_at, the local ISO time it is next
+due. One-off reminders fire at their trigger_time; recurring reminders at
+the first cron occurrence after their last fire. Keeping this precomputed
+lets the poller find due reminders with an index range scan.
+
+Cron expressions are parsed once and kept in a bounded LRU. Each compiled
+schedule also keeps a short table of consecutive occurrences, so prev/next
+lookups near "now" are a bisect instead of a croniter walk.
+"""
+
+import bisect
+import functools
+import threading
+from datetime import datetime
+
+from notif_config import CRONITER_AVAILABLE
+
+CRON_CACHE_SIZE = 256   # Distinct expressions kept compiled
+OCCURRENCE_TABLE = 32   # Occurrences precomputed per expression
+
+
+class CompiledCron:
+    """A parsed cron expression with a table of nearby occurrences.
+
+    prev(t) and next(t) match croniter(expr, t).get_prev/get_next: the
+    latest occurrence strictly before t and the first strictly after it.
+    """
+
+    def __init__(self, expr):
+        from croniter import croniter  # Deferred: keeps it off the startup path
+
+        self.expr = expr
+        self._cron = croniter(expr)  # Parses (and validates) once
+        self._table = []
+        self._lock = threading.Lock()
+
+    def _covers(self, t):
+        return self._table and self._table[0] < t < self._table[-1]
+
+    def _rebuild(self, t):
+        """Fill the table with the occurrence before t and the ones after."""
+        self._cron.set_current(t, force=True)
+        table = [self._cron.get_prev(datetime)]
+        table += [self._cron.get_next(datetime) for _ in range(OCCURRENCE_TABLE)]
+        self._table = table
+
+    def prev(self, t):
+        with self._lock:
+            if not self._covers(t):
+                self._rebuild(t)
+            return self._table[bisect.bisect_left(self._table, t) - 1]
+
+    def next(self, t):
+        with self._lock:
+            if not self._covers(t):
+                self._rebuild(t)
+            return self._table[bisect.bisect_right(self._table, t)]
+
+
+@functools.lru_cache(maxsize=CRON_CACHE_SIZE)
+def compile_cron(expr):
+    """Return the cached CompiledCron for expr. Raises on invalid input."""
+    return CompiledCron(expr)
+
+
+def parse_local(value):
+    """Parse an ISO datetime, converting aware values to naive local time."""
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is not None:
+        dt = dt.astimezone().replace(tzinfo=None)
+    return dt
+
+
+def next_fire_at(trigger_time, recurrence=None):
+    """Return the ISO time a reminder should next fire, or None if never.
+
+    For recurring reminders trigger_time is the last fired occurrence (or
+    the creation anchor), so the next fire is the occurrence after it.
+    """
+    try:
+        start = parse_local(trigger_time)
+    except (ValueError, TypeError):
+        return None if recurrence else trigger_time
+    if not recurrence:
+        return start.isoformat()
+    if not CRONITER_AVAILABLE:
+        return None
+    try:
+        return compile_cron(recurrence).next(start).isoformat()
+    except (ValueError, TypeError, KeyError):
+        return None
+
+
+def advance(recurrence, now=None):
+    """Return (prev_occurrence_iso, next_occurrence_iso) around now.
+
+    Used at fire time: prev becomes the recorded trigger_time, next the
+    new next_fire_at. Missed occurrences collapse into one fire.
+    """
+    now = now or datetime.now()
+    cron = compile_cron(recurrence)
+    return cron.prev(now).isoformat(), cron.next(now).isoformat()
@@ -0,0 +1,177 @@
+"""Relaygent Notifications — in-process reminder scheduler.
+
+Keeps a min-heap of (fire time, reminder id) loaded from the database at
+startup and updated on create, delete and fire. A background thread sleeps
+until the earliest deadline, fires what is due (marking one-offs fired and
+advancing recurring reminders) and pushes the resulting notifications
+onto a ready queue that /notifications/pending drains. When idle it makes
+no database queries at all.
+
+When the scheduler is not running (tests, imports outside server.py) the
+routes fall back to querying due reminders on each poll.
+"""
+
+import heapq
+import logging
+import threading
+import time
+from datetime import datetime
+
+from db import get_db
+from firing import FIRE_CHUNK, fire_due
+from schedule import parse_local
+
+logger = logging.getLogger(__name__)
+
+RETRY_DELAY = 1  # Seconds before due ids that failed to fire are tried again
+
+
+class ReminderScheduler:
+    """Min-heap of upcoming reminder deadlines with a firing thread."""
+
+    def __init__(self):
+        self._heap = []       # [(epoch, id)]; entries may be stale
+        self._current = {}    # id -> epoch of its live heap entry
+        self._ready = []      # Fired notifications awaiting drain()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stop = False
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def load(self):
+        """(Re)load all unfired reminders from the database."""
+        with get_db() as conn:
+            rows = conn.execute(
+                "SELECT id, next_fire_at FROM reminders "
+                "WHERE fired = 0 AND next_fire_at IS NOT NULL"
+            ).fetchall()
+        with self._cond:
+            self._current = {}
+            for r in rows:
+                self._current[r["id"]] = _epoch(r["next_fire_at"])
+            self._heap = [(t, rid) for rid, t in self._current.items()]
+            heapq.heapify(self._heap)
+            self._cond.notify()
+
+    def schedule(self, reminder_id, fire_at):
+        """Add or move a reminder's deadline (fire_at is an ISO string or None)."""
+        self.schedule_many([(reminder_id, fire_at)])
+
+    def schedule_many(self, deadlines):
+        """schedule() for many (reminder_id, fire_at) pairs under one lock."""
+        with self._cond:
+            for reminder_id, fire_at in deadlines:
+                if fire_at is None:
+                    self._current.pop(reminder_id, None)
+                    continue
+                when = _epoch(fire_at)
+                self._current[reminder_id] = when
+                heapq.heappush(self._heap, (when, reminder_id))
+            self._cond.notify()
+
+    def cancel(self, reminder_id):
+        """Forget a reminder (its heap entry is discarded lazily)."""
+        with self._cond:
+            self._current.pop(reminder_id, None)
+
+    def drain(self):
+        """Return and clear the ready notifications."""
+        with self._cond:
+            ready, self._ready = self._ready, []
+        return ready
+
+    def start(self):
+        self.load()
+        self._stop = False
+        self._thread = threading.Thread(
+            target=self._run, name="reminder-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self._thread = None
+
+    def _requeue(self, entries):
+        """Put (epoch, id) entries back unless the id was rescheduled meanwhile."""
+        with self._cond:
+            for when, rid in entries:
+                if rid not in self._current:
+                    self._current[rid] = when
+                    heapq.heappush(self._heap, (when, rid))
+            self._cond.notify()
+
+    def _pop_due(self):
+        """Wait for the next deadline; return the due (epoch, id) entries."""
+        with self._cond:
+            while not self._stop:
+                while self._heap and self._current.get(self._heap[0][1]) != self._heap[0][0]:
+                    heapq.heappop(self._heap)  # Cancelled or moved
+                timeout = self._heap[0][0] - time.time() if self._heap else None
+                if timeout is not None and timeout <= 0:
+                    break
+                self._cond.wait(timeout)
+            due, now = [], time.time()
+            while self._heap and self._heap[0][0] <= now:
+                when, rid = heapq.heappop(self._heap)
+                if self._current.get(rid) == when:
+                    del self._current[rid]
+                    due.append((when, rid))
+            return due
+
+    def _run(self):
+        while not self._stop:
+            due = self._pop_due()
+            if not due:
+                continue
+            try:
+                self._fire(due)
+            except Exception:
+                # e.g. "database is locked": keep the ids, or they'd never fire
+                logger.exception("Reminder scheduler failed to fire %s", [r for _, r in due])
+                self._requeue(due)
+                time.sleep(RETRY_DELAY)
+
+    def _fire(self, due):
+        ids = [rid for _, rid in due]
+        with get_db() as conn:
+            notifications, reschedules = fire_due(conn, datetime.now(), ids)
+            moved = {rid for rid, _ in reschedules}
+            missed = _unfired(conn, [rid for rid in ids if rid not in moved])
+        self.schedule_many(reschedules)
+        if missed:
+            # Not selected by fire_due (e.g. its row changed meanwhile): go back to
+            # the stored deadline, but not sooner than RETRY_DELAY to avoid spinning
+            logger.warning("Reminders %s were due but not fired; rescheduling",
+                           [rid for rid, _ in missed])
+            retry = time.time() + RETRY_DELAY
+            self._requeue([(max(_epoch(at), retry), rid) for rid, at in missed])
+        with self._cond:
+            self._ready.extend(notifications)
+
+
+def _unfired(conn, ids):
+    """(id, next_fire_at) for those of ids that are still unfired and scheduled."""
+    rows = []
+    for i in range(0, len(ids), FIRE_CHUNK):
+        chunk = ids[i:i + FIRE_CHUNK]
+        rows += conn.execute(
+            "SELECT id, next_fire_at FROM reminders WHERE fired = 0 "
+            f"AND next_fire_at IS NOT NULL AND id IN ({','.join('?' * len(chunk))})",
+            chunk,
+        ).fetchall()
+    return [(r["id"], r["next_fire_at"]) for r in rows]
+
+
+def _epoch(iso):
+    return parse_local(iso).timestamp()
+
+
+scheduler = ReminderScheduler()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Relaygent Notifications — production server entry point.
+
+server.py runs Flask's development server. This serves the same app with
+waitress (a bounded worker-thread pool with HTTP/1.1 keep-alive) when it is
+installed, falling back to werkzeug's threaded HTTP/1.1 server otherwise.
+Either way a slow poll runs on its own thread and never blocks the fast
+/notifications/pending?fast=1 path.
+
+Everything runs in one process: the reminder scheduler and event stream
+keep in-memory state, so "workers" are threads, not processes.
+
+Environment:
+    RELAYGENT_NOTIFICATIONS_PORT     listen port (default 8083)
+    RELAYGENT_BIND_HOST              listen address (default 127.0.0.1)
+    RELAYGENT_NOTIFICATIONS_THREADS  waitress worker threads (default 16);
+                                     each open event stream holds one
+    RELAYGENT_NOTIFICATIONS_KEEPALIVE  idle keep-alive timeout, seconds (default 75)
+
+SIGTERM/SIGINT stop accepting connections, give in-flight requests a few
+seconds to finish, then stop the background threads and close database connections.
+"""
+
+import logging
+import os
+import signal
+import threading
+
+import server  # noqa: F401 — registers every route
+import db
+from notif_config import app
+from maintenance import maintenance
+from scheduler import scheduler
+
+logger = logging.getLogger(__name__)
+
+try:
+    from waitress.server import create_server
+    WAITRESS_AVAILABLE = True
+except ImportError:
+    WAITRESS_AVAILABLE = False
+
+
+def _settings():
+    return {
+        "host": os.environ.get("RELAYGENT_BIND_HOST", "127.0.0.1"),
+        "port": int(os.environ.get("RELAYGENT_NOTIFICATIONS_PORT", "8083")),
+        "threads": int(os.environ.get("RELAYGENT_NOTIFICATIONS_THREADS", "16")),
+        "keepalive": int(os.environ.get("RELAYGENT_NOTIFICATIONS_KEEPALIVE", "75")),
+    }
+
+
+def _serve_waitress(cfg):
+    srv = create_server(
+        app, host=cfg["host"], port=cfg["port"], threads=cfg["threads"],
+        channel_timeout=cfg["keepalive"], ident="relaygent-notifications",
+    )
+
+    def stop(signum, frame):
+        raise SystemExit(0)  # waitress.run() drains its workers on SystemExit
+
+    signal.signal(signal.SIGTERM, stop)
+    logger.info("Notifications serving on %s:%d (waitress, %d threads)",
+                cfg["host"], cfg["port"], cfg["threads"])
+    srv.run()
+    srv.close()
+
+
+def _serve_werkzeug(cfg):
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    WSGIRequestHandler.protocol_version = "HTTP/1.1"  # Keep-alive
+    srv = make_server(cfg["host"], cfg["port"], app, threaded=True)
+    srv.timeout = cfg["keepalive"]
+
+    def stop(signum, frame):
+        # shutdown() blocks until serve_forever() returns — not from this thread
+        threading.Thread(target=srv.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    logger.info("Notifications serving on %s:%d (werkzeug threaded; "
+                "install waitress for a bounded worker pool)", cfg["host"], cfg["port"])
+    srv.serve_forever()
+    srv.server_close()
+
+
+def main():
+    db.init_db()
+    scheduler.start()
+    maintenance.start()
+    cfg = _settings()
+    try:
+        if WAITRESS_AVAILABLE:
+            _serve_waitress(cfg)
+        else:
+            _serve_werkzeug(cfg)
+    finally:
+        maintenance.stop()
+        scheduler.stop()
+        db.close_all()
+        logger.info("Notifications server stopped")
+
+
+if __name__ == "__main__":
+    main()
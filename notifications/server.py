@@ -7,12 +7,18 @@ Aggregates reminders and optional messaging sources into a unified endpoint.
 import os
 
 import reminders  # noqa: F401 — /pending, /upcoming, /reminder routes
+import bulk  # noqa: F401 — /reminders/bulk
 import routes  # noqa: F401 — /notifications/pending, /health routes
+import stream  # noqa: F401 — /notifications/stream (SSE)
 from notif_config import app
 from db import init_db
+from maintenance import maintenance
+from scheduler import scheduler
 
 if __name__ == "__main__":
     init_db()
+    scheduler.start()
+    maintenance.start()
     port = int(os.environ.get("RELAYGENT_NOTIFICATIONS_PORT", "8083"))
     host = os.environ.get("RELAYGENT_BIND_HOST", "127.0.0.1")
     app.run(host=host, port=port, debug=False)
@@ -22,6 +22,8 @@ const APP_TOKEN_PATH = path.join(os.homedir(), ".relaygent", "slack", "app-token
 const USER_TOKEN_PATH = path.join(os.homedir(), ".relaygent", "slack", "token.json");
 const CACHE_FILE = "/tmp/relaygent-slack-socket-cache.json";
 const LAST_ACK_FILE = path.join(os.homedir(), ".relaygent", "slack", ".last_check_ts");
+// Per-channel read cursors mirrored by the notifications service on ack
+const READ_CURSORS_FILE = path.join(os.homedir(), ".relaygent", "slack", "read_cursors.json");
 const MAX_MESSAGES = 50;
 
 function loadAppToken() {
@@ -56,6 +58,14 @@ function getLastAckTs() {
   }
 }
 
+function getReadCursors() {
+  try {
+    return JSON.parse(fs.readFileSync(READ_CURSORS_FILE, "utf-8"));
+  } catch {
+    return {};
+  }
+}
+
 function log(msg) {
   const ts = new Date().toLocaleString("en-US", { timeZone: "America/Los_Angeles" });
   console.log(`[${ts}] ${msg}`);
@@ -66,6 +76,7 @@ let selfUid = null;
 async function backfill(web) {
   const cache = readCache();
   const lastAck = getLastAckTs();
+  const cursors = getReadCursors();
   const msgs = cache.messages || [];
   const lastCachedTs = msgs.length ? Math.max(...msgs.map(m => parseFloat(m.ts || "0"))) : 0;
   const oldest = Math.max(lastAck, lastCachedTs);
@@ -79,11 +90,12 @@ async function backfill(web) {
   let added = 0;
   const skipSubtypes = new Set(["channel_join","bot_message","message_changed","message_deleted"]);
   for (const ch of channels) {
+    const since = Math.max(oldest, parseFloat(cursors[ch.id] || "0"));
     try {
-      const hist = await web.conversations.history({ channel: ch.id, oldest: String(oldest), limit: 5 });
+      const hist = await web.conversations.history({ channel: ch.id, oldest: String(since), limit: 5 });
       for (const m of (hist.messages || []).reverse()) {
         if (m.user === selfUid) continue;
-        if (parseFloat(m.ts) <= oldest) continue;
+        if (parseFloat(m.ts) <= since) continue;
         if (msgs.find(x => x.ts === m.ts)) continue;
         if (m.subtype && skipSubtypes.has(m.subtype)) continue;
         const channelName = ch.name || ch.id;
@@ -0,0 +1,91 @@
+"""Slack Web API call layer: rate limiting, pooled HTTP, 429 handling.
+
+Every Slack request in the service goes through call(), which takes a
+token from the shared per-method limiter, sends the request over a pooled
+keep-alive connection and records per-method outcome counts and latency
+for GET /metrics.
+"""
+
+import http.client
+import logging
+import os
+import time
+import urllib.parse
+
+import fastjson
+import metrics
+import slack_http
+from slack_limits import limiter
+
+logger = logging.getLogger(__name__)
+
+SLACK_API_BASE = os.environ.get("RELAYGENT_SLACK_API_BASE", "https://slack.com/api")
+
+SLACK_CALLS = metrics.Counter(
+    "relaygent_slack_api_calls_total",
+    "Slack Web API calls by method and outcome "
+    "(ok, not_ok, deferred, rate_limited, http_error, network_error, invalid_json).",
+    ("method", "outcome"))
+SLACK_DURATION = metrics.Histogram(
+    "relaygent_slack_api_duration_seconds",
+    "Slack Web API round-trip time for calls that were sent, by method.",
+    ("method",))
+
+
+def _limiter_blocked():
+    return {(m,): s["blocked_for"] for m, s in limiter.metrics().items()}
+
+
+metrics.Gauge("relaygent_slack_blocked_seconds",
+              "Seconds left in a method's 429 Retry-After window.",
+              ("method",), fn=_limiter_blocked)
+
+
+def call(token, method, params=None):
+    """Call a Slack Web API method. Returns parsed JSON or None.
+
+    Takes a token from the shared per-method rate limiter first; with none
+    available the call is deferred (None) rather than waited for. A 429
+    defers the method for its Retry-After window — nothing sleeps in the
+    request thread. Requests go over pooled keep-alive connections.
+    """
+    if not limiter.acquire(method):
+        logger.debug("Slack API %s deferred by rate limiter", method)
+        SLACK_CALLS.inc(method=method, outcome="deferred")
+        return None
+    url = f"{SLACK_API_BASE}/{method}"
+    if params:
+        url += "?" + urllib.parse.urlencode(params)
+    start = time.perf_counter()
+    try:
+        resp = slack_http.get(url, {"Authorization": f"Bearer {token}"}, timeout=5)
+    except (OSError, http.client.HTTPException) as e:
+        logger.warning("Slack API %s network error: %s", method, e)
+        SLACK_CALLS.inc(method=method, outcome="network_error")
+        return None
+    finally:
+        SLACK_DURATION.observe(time.perf_counter() - start, method=method)
+    if resp.status == 429:
+        retry_after = resp.headers.get("Retry-After", "")
+        retry_after = int(retry_after) if retry_after.isdigit() else 5
+        limiter.rate_limited(method, retry_after)
+        logger.info("Slack API %s rate limited, deferring for %ds", method, retry_after)
+        SLACK_CALLS.inc(method=method, outcome="rate_limited")
+        return None
+    if resp.status != 200:
+        logger.warning("Slack API %s HTTP %d", method, resp.status)
+        SLACK_CALLS.inc(method=method, outcome="http_error")
+        return None
+    try:
+        data = fastjson.loads(resp.body)
+    except ValueError:
+        logger.warning("Slack API %s returned invalid JSON", method)
+        SLACK_CALLS.inc(method=method, outcome="invalid_json")
+        return None
+    if not data.get("ok"):
+        logger.debug("Slack API %s returned ok=false: %s",
+                     method, data.get("error", "unknown"))
+        SLACK_CALLS.inc(method=method, outcome="not_ok")
+        return None
+    SLACK_CALLS.inc(method=method, outcome="ok")
+    return data
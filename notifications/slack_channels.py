@@ -0,0 +1,164 @@
+"""Slack channel listing and per-channel activity cache.
+
+Most channels have nothing new on most polls, so the collector only
+fetches history for channels that may have changed:
+
+- When the listing carries a channel's latest message ts, history is
+  fetched only if that ts is newer than both the read cursor and the
+  newest message already seen there.
+- Otherwise (Slack omits ``latest`` for many conversation types) a
+  channel that keeps coming back empty is re-checked less often, backing
+  off from every poll up to QUIET_MAX_INTERVAL. Any new message resets
+  it to every poll. DMs and group DMs never back off, so a direct
+  message is still noticed within one slow poll.
+
+The last fetched summary of every channel is cached, so skipped channels
+with still-unacknowledged messages keep showing up in each poll.
+
+Each channel also has its own read cursor (the newest ts acknowledged)
+in the slack_cursors table, so acking one channel never hides unseen
+messages in another and history requests only fetch that channel's delta.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+from db import get_db
+
+LIST_PAGE_SIZE = 200       # conversations.list maximum is 1000; Slack recommends <= 200
+MAX_LIST_PAGES = 20
+QUIET_BASE_INTERVAL = 10   # Seconds; matches the poller's slow-collector interval
+QUIET_MAX_INTERVAL = 120
+
+_lock = threading.Lock()
+_state = {}  # channel id -> {"latest", "checked", "quiet", "summary"}
+_listing = None  # Last complete conversations.list result
+
+
+def list_channels(api, token, params):
+    """Fetch every page of conversations.list. Returns channels or None.
+
+    If a page fails (network error, rate limit) the last complete listing
+    is returned instead, so cached results can still be served.
+    """
+    global _listing
+    channels, cursor = [], None
+    for _ in range(MAX_LIST_PAGES):
+        page = api(token, "conversations.list", dict(
+            params, limit=LIST_PAGE_SIZE, **({"cursor": cursor} if cursor else {})))
+        if not page:
+            return _listing if _listing is not None else (channels or None)
+        channels += page.get("channels") or []
+        cursor = (page.get("response_metadata") or {}).get("next_cursor")
+        if not cursor:
+            break
+    _listing = channels
+    return channels
+
+
+def listed_latest(ch):
+    """The channel's latest message ts from a listing entry, if Slack sent one."""
+    latest = ch.get("latest")
+    return latest.get("ts") if isinstance(latest, dict) else None
+
+
+def _quiet_interval(quiet):
+    return min(QUIET_BASE_INTERVAL * 2 ** max(quiet - 1, 0), QUIET_MAX_INTERVAL)
+
+
+def needs_history(ch, cursor_ts, now=None):
+    """Whether this poll should fetch the channel's history."""
+    now = time.monotonic() if now is None else now
+    with _lock:
+        st = _state.get(ch["id"])
+    hint = listed_latest(ch)
+    if hint is not None:
+        return hint > cursor_ts and (st is None or hint > st["latest"])
+    if st is None or not st["quiet"] or ch.get("is_im") or ch.get("is_mpim"):
+        return True
+    return now - st["checked"] >= _quiet_interval(st["quiet"])
+
+
+def record(channel_id, summary, newest="", now=None):
+    """Store a fetched history summary (None when nothing was unread).
+
+    newest is the newest ts in the raw history page. It can be a message
+    the summary filters out (our own, a join), and it must still count as
+    seen, or a listing hint pointing at it would refetch on every poll.
+    """
+    now = time.monotonic() if now is None else now
+    with _lock:
+        st = _state.setdefault(channel_id, {"latest": "", "quiet": 0})
+        quiet = newest <= st["latest"]
+        st["quiet"] = st["quiet"] + 1 if quiet else 0
+        st["latest"] = max(st["latest"], newest)
+        st["checked"] = now
+        st["summary"] = summary
+
+
+_SKIP_SUBTYPES = {"channel_join", "joiner_notification_for_inviter"}
+
+
+def summarize(ch, messages, cursor_ts, self_uid):
+    """Unread summary of a channel's history page (newest first), or None."""
+    msgs = [m for m in messages
+            if m.get("subtype") not in _SKIP_SUBTYPES
+            and m.get("user") != self_uid]
+    if not msgs or msgs[0].get("ts", "0") <= cursor_ts:
+        return None
+    # Include message previews (newest-first → reverse for chronological)
+    previews = [
+        {"user": m.get("user", ""), "text": m.get("text", ""), "ts": m.get("ts", "")}
+        for m in reversed(msgs[:5])
+    ]
+    return {
+        "id": ch["id"],
+        "name": ch.get("name", ch["id"]),
+        "unread": len(msgs),
+        "messages": previews,
+    }
+
+
+def cached_summary(channel_id, cursor_ts):
+    """The channel's last summary, if it still has messages past the cursor."""
+    with _lock:
+        summary = (_state.get(channel_id) or {}).get("summary")
+    if summary and summary["messages"] and summary["messages"][-1]["ts"] > cursor_ts:
+        return summary
+    return None
+
+
+def unread_latest():
+    """Newest cached unread message ts per channel."""
+    with _lock:
+        summaries = [st.get("summary") for st in _state.values()]
+    return {s["id"]: s["messages"][-1]["ts"] for s in summaries if s and s["messages"]}
+
+
+def load_cursors():
+    """Per-channel read cursors: {channel id: last read ts}."""
+    with get_db() as conn:
+        rows = conn.execute("SELECT channel_id, last_read_ts FROM slack_cursors").fetchall()
+    return {r["channel_id"]: r["last_read_ts"] for r in rows}
+
+
+def advance_cursors(cursors):
+    """Move channels' read cursors forward to the given ts (never back)."""
+    with get_db() as conn:
+        conn.executemany(
+            "INSERT INTO slack_cursors (channel_id, last_read_ts) VALUES (?, ?) "
+            "ON CONFLICT (channel_id) DO UPDATE SET "
+            "last_read_ts = max(last_read_ts, excluded.last_read_ts), "
+            "updated_at = CURRENT_TIMESTAMP",
+            list(cursors.items()),
+        )
+        conn.commit()
+
+
+def reset():
+    global _listing
+    with _lock:
+        _state.clear()
+        _listing = None
@@ -1,26 +1,43 @@
-"""Slack notification collector — checks all channels for new messages."""
+"""Slack notification collector — checks all channels for new messages.
+
+Imported on first use: routes registers collect() and the Slack HTTP
+views below through lazy stand-ins, so startup never loads this module.
+"""
 
 from __future__ import annotations
 
+import itertools
 import json
 import logging
 import os
-import time
-import urllib.error
-import urllib.parse
-import urllib.request
+import re
+from concurrent.futures import ThreadPoolExecutor
 
-from notif_config import app
-from flask import jsonify
+from flask import jsonify, request
+import slack_api
+import slack_channels
 
 logger = logging.getLogger(__name__)
 
+HISTORY_WORKERS = 8     # Concurrent conversations.history calls per poll
+
+_history_pool = ThreadPoolExecutor(
+    max_workers=HISTORY_WORKERS, thread_name_prefix="slack-history"
+)
+_rotation = itertools.count()  # Rotates which channels get tokens first
+_TS = re.compile(r"\d{10}\.\d{6}$")  # Slack message ts
+
 SLACK_TOKEN_PATH = os.path.join(
     os.path.expanduser("~"), ".relaygent", "slack", "token.json"
 )
 _LAST_CHECK_FILE = os.path.join(
     os.path.expanduser("~"), ".relaygent", "slack", ".last_check_ts"
 )
+# Mirror of the per-channel cursors for Socket Mode readers outside this
+# process (notification-poller, socket listener, Slack MCP server)
+_READ_CURSORS_FILE = os.path.join(
+    os.path.expanduser("~"), ".relaygent", "slack", "read_cursors.json"
+)
 
 
 _SELF_UID = None
@@ -31,43 +48,12 @@ def _get_self_uid(token):
     global _SELF_UID
     if _SELF_UID:
         return _SELF_UID
-    result = _slack_api(token, "auth.test")
+    result = slack_api.call(token, "auth.test")
     if result:
         _SELF_UID = result.get("user_id")
     return _SELF_UID
 
 
-def _slack_api(token, method, params=None, _retries=2):
-    """Call a Slack Web API method. Returns parsed JSON or None.
-
-    Retries on 429 (rate limit) up to _retries times, capped at 10s.
-    """
-    url = f"https://slack.com/api/{method}"
-    if params:
-        url += "?" + urllib.parse.urlencode(params)
-    req = urllib.request.Request(
-        url, headers={"Authorization": f"Bearer {token}"}
-    )
-    try:
-        with urllib.request.urlopen(req, timeout=5) as resp:
-            data = json.loads(resp.read().decode())
-        if not data.get("ok"):
-            logger.debug("Slack API %s returned ok=false: %s",
-                         method, data.get("error", "unknown"))
-        return data if data.get("ok") else None
-    except urllib.error.HTTPError as e:
-        if e.code == 429 and _retries > 0:
-            retry_after = min(int(e.headers.get("Retry-After", "5")), 10)
-            logger.info("Slack rate limited, waiting %ds", retry_after)
-            time.sleep(retry_after)
-            return _slack_api(token, method, params, _retries - 1)
-        logger.warning("Slack API %s HTTP %d", method, e.code)
-        return None
-    except (urllib.error.URLError, OSError) as e:
-        logger.warning("Slack API %s network error: %s", method, e)
-        return None
-
-
 def _load_token():
     """Read Slack token from disk. Returns token string or None."""
     if not os.path.exists(SLACK_TOKEN_PATH):
@@ -79,56 +65,59 @@ def _load_token():
         return None
 
 
+def _fetch_channel(token, ch, cursor_ts, self_uid):
+    """Fetch one channel's history since its cursor and record its summary."""
+    hist = slack_api.call(token, "conversations.history", {
+        "channel": ch["id"], "limit": 10, "oldest": cursor_ts,
+    })
+    if hist:  # On failure keep the cached state; the channel is retried next poll
+        messages = hist.get("messages") or []
+        slack_channels.record(
+            ch["id"], slack_channels.summarize(ch, messages, cursor_ts, self_uid),
+            messages[0].get("ts", "") if messages else "")
+
+
 def collect(notifications):
     """Check all Slack channels for new messages since last check.
 
     Uses conversations.history per-channel with timestamp tracking,
     because conversations.list doesn't return unread_count_display
-    for user (xoxp) tokens.
+    for user (xoxp) tokens. Only channels that may have new activity
+    are fetched (see slack_channels), concurrently on a bounded pool
+    paced by the shared rate limiter.
     """
     token = _load_token()
     if not token:
         return
-    last_ts = "0"
+    floor = "0"  # Global "read everything" mark, written by the Slack MCP server
     try:
         if os.path.exists(_LAST_CHECK_FILE):
             with open(_LAST_CHECK_FILE) as f:
-                last_ts = f.read().strip() or "0"
+                floor = f.read().strip() or "0"
     except OSError as e:
         logger.warning("Failed to read Slack last-check timestamp: %s", e)
+    read = slack_channels.load_cursors()
+    cursor = {}
 
     self_uid = _get_self_uid(token)
-    result = _slack_api(token, "conversations.list", {
-        "limit": 50,
+    channels = slack_channels.list_channels(slack_api.call, token, {
         "types": "public_channel,private_channel,im,mpim",
         "exclude_archived": "true",
     })
-    if not result:
+    if channels is None:
         return
 
-    skip_subtypes = {"channel_join", "joiner_notification_for_inviter"}
-    unread_channels = []
-    for ch in result.get("channels") or []:
-        hist = _slack_api(token, "conversations.history", {
-            "channel": ch["id"], "limit": 10, "oldest": last_ts,
-        })
-        if not hist:
-            continue
-        msgs = [m for m in (hist.get("messages") or [])
-                if m.get("subtype") not in skip_subtypes
-                and m.get("user") != self_uid]
-        if msgs and msgs[0].get("ts", "0") > last_ts:
-            # Include message previews (newest-first → reverse for chronological)
-            previews = [
-                {"user": m.get("user", ""), "text": m.get("text", ""), "ts": m.get("ts", "")}
-                for m in reversed(msgs[:5])
-            ]
-            unread_channels.append({
-                "id": ch["id"],
-                "name": ch.get("name", ch["id"]),
-                "unread": len(msgs),
-                "messages": previews,
-            })
+    for ch in channels:
+        cursor[ch["id"]] = max(floor, read.get(ch["id"], "0"))
+    due = [ch for ch in channels if slack_channels.needs_history(ch, cursor[ch["id"]])]
+    if due:
+        # Rotate so channels past the rate-limit burst aren't always last
+        start = next(_rotation) % len(due)
+        due = due[start:] + due[:start]
+    list(_history_pool.map(
+        lambda ch: _fetch_channel(token, ch, cursor[ch["id"]], self_uid), due))
+    unread_channels = [s for s in (slack_channels.cached_summary(ch["id"], cursor[ch["id"]])
+                                   for ch in channels) if s]
 
     if unread_channels:
         notifications.append({
@@ -139,19 +128,40 @@ def collect(notifications):
         })
 
 
-def ack():
-    """Advance Slack read marker to now."""
+def ack(cursors=None):
+    """Advance per-channel read cursors.
+
+    cursors maps channel id -> newest message ts the reader saw; without
+    it, every channel is acked up to the newest message last reported.
+    All cursors are then written to _READ_CURSORS_FILE, which the Socket
+    Mode readers use to filter acked messages per channel.
+    """
+    slack_channels.advance_cursors(
+        slack_channels.unread_latest() if cursors is None else cursors)
     try:
-        os.makedirs(os.path.dirname(_LAST_CHECK_FILE), exist_ok=True)
-        with open(_LAST_CHECK_FILE, "w") as f:
-            # Use 6 decimal places to match Slack ts format
-            f.write(f"{time.time():.6f}")
+        os.makedirs(os.path.dirname(_READ_CURSORS_FILE), exist_ok=True)
+        tmp = _READ_CURSORS_FILE + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(slack_channels.load_cursors(), f)
+        os.replace(tmp, _READ_CURSORS_FILE)
     except OSError as e:
-        logger.warning("Failed to write Slack ack timestamp: %s", e)
+        logger.warning("Failed to write Slack read cursors file: %s", e)
 
 
-@app.route("/notifications/ack-slack", methods=["POST"])
 def ack_slack():
-    """HTTP endpoint — called by harness after wake."""
-    ack()
+    """POST /notifications/ack-slack — called by harness after wake.
+
+    Optional JSON body: {"channels": {"<channel id>": "<newest seen ts>"}}.
+    """
+    cursors = (request.get_json(force=True, silent=True) or {}).get("channels")
+    if cursors is not None and not (isinstance(cursors, dict) and all(
+            isinstance(k, str) and isinstance(v, str) and _TS.match(v)
+            for k, v in cursors.items())):
+        return jsonify({"error": "channels must map channel ids to Slack ts strings"}), 400
+    ack(cursors)
     return jsonify({"status": "ok"})
+
+
+def slack_limits():
+    """GET /notifications/slack/limits — rate limiter metrics per Slack method."""
+    return jsonify(slack_api.limiter.metrics())
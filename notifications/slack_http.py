@@ -0,0 +1,108 @@
+"""Pooled keep-alive HTTP(S) client shared by all Slack API calls.
+
+urllib.request.urlopen opens a fresh connection for every call, paying
+DNS, TCP and TLS setup each time: 50 handshakes per poll for 50 channels.
+This keeps a small LIFO pool of http.client connections per origin, asks
+for gzip bodies, and transparently retries on a new connection when a
+pooled one turns out to have been closed by the server while idle.
+"""
+
+from __future__ import annotations
+
+import gzip
+import http.client
+import ssl
+import threading
+import urllib.parse
+from typing import NamedTuple
+
+POOL_SIZE = 8    # Idle connections kept per origin; matches the history workers
+SSL_CONTEXT = ssl.create_default_context()
+
+_idle = {}  # (scheme, host, port) -> [conn], used LIFO
+_lock = threading.Lock()
+
+
+class Response(NamedTuple):
+    status: int
+    headers: http.client.HTTPMessage
+    body: bytes
+
+
+def _connect(origin, timeout):
+    scheme, host, port = origin
+    if scheme == "https":
+        return http.client.HTTPSConnection(host, port, timeout=timeout, context=SSL_CONTEXT)
+    return http.client.HTTPConnection(host, port, timeout=timeout)
+
+
+def _acquire(origin, timeout):
+    """Return (conn, reused)."""
+    with _lock:
+        idle = _idle.get(origin)
+        conn = idle.pop() if idle else None
+    if conn is None:
+        return _connect(origin, timeout), False
+    conn.timeout = timeout
+    if conn.sock:
+        conn.sock.settimeout(timeout)
+    return conn, True
+
+
+def _release(origin, conn):
+    with _lock:
+        idle = _idle.setdefault(origin, [])
+        if len(idle) < POOL_SIZE:
+            idle.append(conn)
+            return
+    conn.close()
+
+
+def _discard(origin):
+    """Close every idle connection to origin (the server dropped one)."""
+    with _lock:
+        idle = _idle.pop(origin, [])
+    for conn in idle:
+        conn.close()
+
+
+def close_all():
+    with _lock:
+        idle = [conn for conns in _idle.values() for conn in conns]
+        _idle.clear()
+    for conn in idle:
+        conn.close()
+
+
+def get(url, headers=None, timeout=5):
+    """GET url over a pooled connection. Returns a Response.
+
+    Raises OSError or http.client.HTTPException on network failure.
+    """
+    parts = urllib.parse.urlsplit(url)
+    origin = (parts.scheme, parts.hostname,
+              parts.port or (443 if parts.scheme == "https" else 80))
+    path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    headers = dict(headers or {}, **{"Accept-Encoding": "gzip"})
+    while True:
+        conn, reused = _acquire(origin, timeout)
+        try:
+            conn.request("GET", path, headers=headers)
+            resp = conn.getresponse()
+            body = resp.read()
+        except ConnectionError:
+            conn.close()
+            if not reused:
+                raise
+            _discard(origin)  # Idle connections timed out server-side; start fresh
+            continue
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            raise
+        if resp.will_close:
+            conn.close()
+        else:
+            _release(origin, conn)
+        if resp.getheader("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        return Response(resp.status, resp.headers, body)
@@ -0,0 +1,122 @@
+"""Slack Web API rate limiting — shared token buckets per method.
+
+Slack rate-limits each method by tier (requests per minute, per workspace,
+with short bursts tolerated). Every Slack call in the service takes a token
+from its method's bucket first, so fanning out over a worker pool doesn't
+turn into a storm of 429s.
+
+Nothing here sleeps in a request thread. A call that finds no token, or
+whose method is still inside a 429 Retry-After window, is deferred: the
+caller skips it and serves cached data until a later poll.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+# Requests per minute for each Slack tier.
+TIER_RATES = {1: 1, 2: 20, 3: 50, 4: 100}
+
+METHOD_TIERS = {
+    "auth.test": 4,
+    "conversations.list": 2,
+    "conversations.history": 3,
+    "users.conversations": 2,
+    "users.info": 4,
+}
+DEFAULT_TIER = 3
+
+
+class TokenBucket:
+    """Thread-safe token bucket: rate tokens/sec, holding at most capacity."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def available(self) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+    def try_acquire(self) -> float:
+        """Take a token if one is available. Returns 0, or seconds until one is."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self, timeout: float) -> bool:
+        """Wait up to timeout seconds for a token."""
+        deadline = time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return True
+            if time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class SlackRateLimiter:
+    """One token bucket per Slack method, sized from its tier, plus 429 state."""
+
+    def __init__(self):
+        self._buckets: dict[str, TokenBucket] = {}
+        self._blocked_until: dict[str, float] = {}  # method -> monotonic deadline
+        self._stats: dict[str, dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, method: str) -> TokenBucket:
+        with self._lock:
+            if method not in self._buckets:
+                per_minute = TIER_RATES[METHOD_TIERS.get(method, DEFAULT_TIER)]
+                # Allow a burst of one minute's quota, refilled continuously
+                self._buckets[method] = TokenBucket(per_minute / 60, per_minute)
+                self._stats[method] = {"allowed": 0, "deferred": 0, "rate_limited": 0}
+            return self._buckets[method]
+
+    def blocked_for(self, method: str) -> float:
+        """Seconds left in the method's Retry-After window (0 if none)."""
+        with self._lock:
+            return max(self._blocked_until.get(method, 0) - time.monotonic(), 0)
+
+    def acquire(self, method: str, timeout: float = 0) -> bool:
+        """Take a token for one call. False means defer the call."""
+        bucket = self.bucket(method)
+        allowed = not self.blocked_for(method) and bucket.acquire(timeout)
+        with self._lock:
+            self._stats[method]["allowed" if allowed else "deferred"] += 1
+        return allowed
+
+    def rate_limited(self, method: str, retry_after: float) -> None:
+        """Record a 429: defer every call to method for retry_after seconds."""
+        self.bucket(method)
+        with self._lock:
+            until = time.monotonic() + retry_after
+            self._blocked_until[method] = max(self._blocked_until.get(method, 0), until)
+            self._stats[method]["rate_limited"] += 1
+
+    def metrics(self) -> dict:
+        """Per-method counters and current bucket state."""
+        with self._lock:
+            methods = {m: (b, dict(self._stats[m])) for m, b in self._buckets.items()}
+        return {
+            method: dict(stats, tokens=round(bucket.available(), 2),
+                         capacity=bucket.capacity,
+                         blocked_for=round(self.blocked_for(method), 1))
+            for method, (bucket, stats) in methods.items()
+        }
+
+
+limiter = SlackRateLimiter()
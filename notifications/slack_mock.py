@@ -0,0 +1,158 @@
+"""Local mock of the Slack Web API, for tests and benchmarks.
+
+Serves auth.test, conversations.list (cursor-paginated) and
+conversations.history from in-memory channels, with optional per-call
+latency on history requests. Every call is recorded in ``calls`` and
+every accepted connection counted in ``connections``. Speaks HTTP/1.1
+keep-alive, gzips bodies when asked, and serves HTTPS given a cert
+(see self_signed_cert).
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import ssl
+import subprocess
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SELF_UID = "USELF"
+
+
+def default_messages(n):
+    """Even channels hold one message from someone else plus one of our own."""
+    if n % 2:
+        return []
+    return [
+        {"user": "UOTHER", "text": f"hello {n}", "ts": f"{1700000000 + n}.000200"},
+        {"user": SELF_UID, "text": "mine", "ts": f"{1700000000 + n}.000100"},
+    ]
+
+
+def self_signed_cert(directory):
+    """Write a cert/key pair for 127.0.0.1 with openssl. Returns (cert, key)."""
+    cert, key = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    subprocess.run([
+        "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+        "-subj", "/CN=localhost", "-addext", "subjectAltName=IP:127.0.0.1,DNS:localhost",
+        "-keyout", key, "-out", cert,
+    ], check=True, capture_output=True)
+    return cert, key
+
+
+class MockSlack:
+    """A Slack Web API stand-in on 127.0.0.1. Use as a context manager."""
+
+    def __init__(self, channels=20, latency=0.0, latest_hints=False, tls=None,
+                 idle_timeout=None):
+        self.latency = latency
+        self.idle_timeout = idle_timeout  # Close keep-alive connections idle this long
+        self.latest_hints = latest_hints  # Include "latest" in conversations.list
+        self.messages = {f"C{i:02d}": default_messages(i) for i in range(channels)}
+        self.calls = []
+        self.limited = {}  # method -> Retry-After seconds; answered with 429
+        self.oldest = {}  # channel -> "oldest" of its last history request
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._scheme = "http"
+        if tls:
+            ctx = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+            ctx.load_cert_chain(*tls)
+            self._server.socket = ctx.wrap_socket(self._server.socket, server_side=True)
+            self._scheme = "https"
+
+    @property
+    def url(self):
+        return f"{self._scheme}://127.0.0.1:{self._server.server_port}/api"
+
+    def post(self, channel, text, user="UOTHER"):
+        """Add a message to a channel, newer than everything before it."""
+        ts = f"{time.time():.6f}"
+        self.messages.setdefault(channel, []).insert(0, {"user": user, "text": text, "ts": ts})
+        return ts
+
+    def count(self, method):
+        return self.calls.count(method)
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def handle(self, method, params):
+        self.calls.append(method)
+        if method == "auth.test":
+            return {"ok": True, "user_id": SELF_UID}
+        if method == "conversations.list":
+            return self._list(params)
+        if method == "conversations.history":
+            time.sleep(self.latency)
+            msgs = self.messages.get(params.get("channel"))
+            if msgs is None:
+                return {"ok": False, "error": "channel_not_found"}
+            oldest = self.oldest[params["channel"]] = params.get("oldest", "0")
+            limit = int(params.get("limit", 100))
+            return {"ok": True, "messages": [m for m in msgs if m["ts"] > oldest][:limit]}
+        return {"ok": False, "error": "unknown_method"}
+
+    def _list(self, params):
+        ids = sorted(self.messages)
+        start = int(params.get("cursor") or 0)
+        end = start + int(params.get("limit", 100))
+        channels = []
+        for cid in ids[start:end]:
+            ch = {"id": cid, "name": f"chan-{int(cid[1:])}"}
+            if self.latest_hints and self.messages[cid]:
+                ch["latest"] = {"ts": self.messages[cid][0]["ts"]}
+            channels.append(ch)
+        next_cursor = str(end) if end < len(ids) else ""
+        return {"ok": True, "channels": channels,
+                "response_metadata": {"next_cursor": next_cursor}}
+
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            timeout = mock.idle_timeout
+            disable_nagle_algorithm = True  # Headers and body go out as separate writes
+
+            def setup(self):
+                super().setup()
+                with mock._lock:
+                    mock.connections += 1
+
+            def do_GET(self):
+                url = urllib.parse.urlparse(self.path)
+                params = dict(urllib.parse.parse_qsl(url.query))
+                method = url.path.rsplit("/", 1)[-1]
+                if method in mock.limited:
+                    mock.calls.append(method)
+                    self.send_response(429)
+                    self.send_header("Retry-After", str(mock.limited[method]))
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                body = json.dumps(mock.handle(method, params)).encode()
+                self.send_response(200)
+                if "gzip" in self.headers.get("Accept-Encoding", ""):
+                    body = gzip.compress(body)
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,111 @@
+"""Relaygent Notifications — server-sent event stream.
+
+GET /notifications/stream pushes reminder fires and chat/Slack state
+changes as they happen:
+
+    id: <boot>-<seq>
+    event: reminder | chat | slack | reset
+    data: <notification JSON>
+
+Resume by sending the standard Last-Event-ID header (or ?last_event_id=).
+If events since that id are no longer available, a "reset" event is sent
+first and the client should re-read /notifications/pending.
+
+Reminders are published by the scheduler as they fire. Chat and Slack
+state is published whenever a poll collects it; while anyone is
+subscribed, a watcher thread also refreshes sources that no poll has
+touched recently, so subscribers don't depend on the poller.
+"""
+
+import functools
+import logging
+import threading
+import time
+
+import collectors
+import events
+import routes
+from notif_config import app
+from flask import Response, request, stream_with_context
+
+logger = logging.getLogger(__name__)
+
+KEEPALIVE = 15        # Seconds between comment pings on an idle stream
+CHAT_REFRESH = 1      # Watcher refresh intervals, matching the poller
+SLOW_REFRESH = 10
+
+_subscribers = 0
+_lock = threading.Lock()
+_watcher = None
+
+
+@app.route("/notifications/stream", methods=["GET"])
+def notification_stream():
+    last_id = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+    if last_id:
+        seq, gap = events.parse_id(last_id)
+    else:
+        seq, gap = events.parse_id(events.head())[0], False
+
+    @stream_with_context
+    def generate():
+        nonlocal seq
+        _subscribe()
+        try:
+            if gap:
+                yield events.format_sse(seq, "reset", {"reason": "events missed"})
+            while True:
+                batch = events.wait_since(seq, KEEPALIVE)
+                if not batch:
+                    yield ": keepalive\n\n"
+                for seq, kind, data in batch:
+                    yield events.format_sse(seq, kind, data)
+        finally:
+            _unsubscribe()
+
+    return Response(generate(), mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache", "X-Accel-Buffering": "no",
+    })
+
+
+def _subscribe():
+    global _subscribers, _watcher
+    with _lock:
+        _subscribers += 1
+        if _watcher is None or not _watcher.is_alive():
+            _watcher = threading.Thread(
+                target=_watch, name="stream-watcher", daemon=True
+            )
+            _watcher.start()
+
+
+def _unsubscribe():
+    global _subscribers
+    with _lock:
+        _subscribers -= 1
+
+
+def _watch():
+    """Refresh stale sources while there are subscribers."""
+    attempted = {}
+    while True:
+        with _lock:
+            if _subscribers <= 0:
+                return
+        sources = [("chat", routes._collect_chat_messages, CHAT_REFRESH)]
+        sources += [(name, functools.partial(_refresh_slow, name, fn), SLOW_REFRESH)
+                    for name, fn in routes._slow_collectors]
+        for name, collect, interval in sources:
+            since_try = time.monotonic() - attempted.get(name, float("-inf"))
+            if min(events.refreshed_ago(name), since_try) < interval:
+                continue  # A poll (or our last attempt) was recent enough
+            attempted[name] = time.monotonic()
+            try:
+                collect([])
+            except Exception:
+                logger.exception("Stream watcher failed to refresh %s", name)
+        time.sleep(CHAT_REFRESH)
+
+
+def _refresh_slow(name, collector, _notifications):
+    collectors.run_collector(name, collector)
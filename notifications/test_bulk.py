@@ -0,0 +1,149 @@
+"""Tests for POST /reminders/bulk (bulk.py)."""
+from __future__ import annotations
+
+import os
+import sqlite3
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+os.environ.setdefault("RELAYGENT_DATA_DIR", "/tmp/relaygent-test-notif")
+
+import pytest
+
+import notif_config as config  # noqa: E402
+import db as notif_db  # noqa: E402
+import bulk  # noqa: E402
+from scheduler import scheduler  # noqa: E402
+
+SOON = (datetime.now() + timedelta(hours=1)).isoformat()
+
+
+@pytest.fixture(autouse=True)
+def _isolated_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DB_PATH", str(tmp_path / "reminders.db"))
+    notif_db.init_db()
+    scheduler.load()
+
+
+@pytest.fixture
+def client():
+    config.app.config["TESTING"] = True
+    with config.app.test_client() as c:
+        yield c
+
+
+def create(n, **extra):
+    return [{"op": "create", "trigger_time": SOON, "message": f"m{i}", **extra}
+            for i in range(n)]
+
+
+def rows():
+    with notif_db.get_db() as conn:
+        return {r["id"]: dict(r) for r in conn.execute("SELECT * FROM reminders")}
+
+
+def test_mixed_operations_with_per_item_results(client):
+    ids = [r["id"] for r in client.post("/reminders/bulk", json={
+        "operations": create(3)}).get_json()["results"]]
+    resp = client.post("/reminders/bulk", json={"operations": [
+        *create(1, recurrence="0 9 * * *"),
+        {"op": "delete", "id": ids[0]},
+        {"op": "snooze", "id": ids[1], "minutes": 30},
+        {"op": "delete", "id": 9999},
+        {"op": "launch"},
+        {"op": "create", "message": "no time"},
+    ]})
+    assert resp.status_code == 200
+    body = resp.get_json()
+    assert [r["status"] for r in body["results"]] == [
+        "created", "deleted", "snoozed", "error", "error", "error"]
+    assert body["results"][3]["error"] == "reminder not found"
+    assert "trigger_time" in body["results"][5]["error"]
+    assert (body["applied"], body["failed"]) == (3, 3)
+    stored = rows()
+    assert ids[0] not in stored and len(stored) == 3
+    assert stored[ids[1]]["next_fire_at"] == body["results"][2]["next_fire_at"]
+    assert stored[body["results"][0]["id"]]["recurrence"] == "0 9 * * *"
+
+
+def test_atomic_batch_rolls_back_on_any_failure(client):
+    resp = client.post("/reminders/bulk", json={
+        "atomic": True, "operations": [*create(2), {"op": "delete", "id": 42}]})
+    assert resp.status_code == 400
+    body = resp.get_json()
+    assert [r["status"] for r in body["results"]] == ["rolled_back", "rolled_back", "error"]
+    assert body["applied"] == 0
+    assert rows() == {}
+
+
+def test_batch_of_500_is_one_commit(client, tmp_path):
+    observer = sqlite3.connect(tmp_path / "reminders.db")
+    before = observer.execute("PRAGMA data_version").fetchone()[0]
+    resp = client.post("/reminders/bulk", json={"operations": create(500)})
+    assert resp.get_json()["applied"] == 500
+    assert observer.execute("PRAGMA data_version").fetchone()[0] == before + 1
+    assert len(rows()) == 500
+    observer.close()
+
+
+def test_snooze_rearms_and_moves_deadline(client):
+    rid = client.post("/reminders/bulk", json={
+        "operations": create(1)}).get_json()["results"][0]["id"]
+    cron = client.post("/reminders/bulk", json={
+        "operations": create(1, recurrence="0 9 * * *")}).get_json()["results"][0]["id"]
+    with notif_db.get_db() as conn:
+        conn.execute("UPDATE reminders SET fired = 1 WHERE id = ?", (rid,))
+        conn.commit()
+    until = (datetime.now() + timedelta(days=2)).replace(microsecond=0).isoformat()
+    client.post("/reminders/bulk", json={"operations": [
+        {"op": "snooze", "id": rid, "until": until},
+        {"op": "snooze", "id": cron, "until": until}]})
+    stored = rows()
+    assert stored[rid]["fired"] == 0
+    assert stored[rid]["trigger_time"] == stored[rid]["next_fire_at"] == until
+    assert stored[cron]["trigger_time"] == SOON  # Recurring anchor unchanged
+    assert stored[cron]["next_fire_at"] == until
+    assert rid in scheduler._current and cron in scheduler._current
+
+
+def test_snooze_until_aware_is_stored_local(client):
+    rid = client.post("/reminders/bulk", json={
+        "operations": create(1)}).get_json()["results"][0]["id"]
+    due = datetime.now(timezone.utc) - timedelta(minutes=5)
+    client.post("/reminders/bulk", json={"operations": [
+        {"op": "snooze", "id": rid, "until": due.isoformat()}]})
+    local = due.astimezone().replace(tzinfo=None).isoformat()
+    assert rows()[rid]["next_fire_at"] == rows()[rid]["trigger_time"] == local
+    fired = client.get("/notifications/pending").get_json()
+    assert [n["id"] for n in fired if n.get("type") == "reminder"] == [rid]
+
+
+def test_deletes_leave_the_scheduler(client):
+    rid = client.post("/reminders/bulk", json={
+        "operations": create(1)}).get_json()["results"][0]["id"]
+    assert rid in scheduler._current
+    client.post("/reminders/bulk", json={"operations": [{"op": "delete", "id": rid}]})
+    assert rid not in scheduler._current
+
+
+@pytest.mark.parametrize("payload", [
+    None, {}, {"operations": []}, {"operations": {"op": "create"}},
+    {"operations": [{"op": "delete", "id": 1}] * (bulk.MAX_OPERATIONS + 1)},
+])
+def test_invalid_payloads_rejected(client, payload):
+    assert client.post("/reminders/bulk", json=payload).status_code == 400
+
+
+@pytest.mark.parametrize("op, error", [
+    ({"op": "snooze", "id": 1}, "until or minutes"),
+    ({"op": "snooze", "id": 1, "minutes": -5}, "until or minutes"),
+    ({"op": "snooze", "id": 1, "until": "tomorrow"}, "ISO"),
+    ({"op": "delete", "id": "1"}, "integer"),
+    ("create", "op must be"),
+])
+def test_invalid_operations_reported(client, op, error):
+    result = client.post("/reminders/bulk", json={"operations": [op]}).get_json()["results"][0]
+    assert result["status"] == "error" and error in result["error"]
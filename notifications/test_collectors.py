@@ -0,0 +1,153 @@
+"""Tests for concurrent slow-collector execution (collectors.py)."""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+os.environ.setdefault("RELAYGENT_DATA_DIR", "/tmp/relaygent-test-notif")
+
+import pytest
+
+import notif_config as config  # noqa: E402
+import collectors  # noqa: E402
+import db as notif_db  # noqa: E402
+import routes as routes_mod  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _isolated(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DB_PATH", str(tmp_path / "reminders.db"))
+    monkeypatch.setattr(collectors, "_inflight", {})
+    monkeypatch.setattr(collectors, "_last_good", {})
+    monkeypatch.setattr(collectors, "DEADLINES", {})
+    notif_db.close_all()
+    notif_db.init_db()
+
+
+def sleeper(seconds, source, release=None):
+    def collect(notifications):
+        if release:
+            release.wait(5)
+        else:
+            time.sleep(seconds)
+        notifications.append({"type": "message", "source": source, "count": 1})
+    return collect
+
+
+class TestRunAll:
+    def test_runs_concurrently(self):
+        notifications = []
+        start = time.monotonic()
+        meta = collectors.run_all([("a", sleeper(0.3, "a")), ("b", sleeper(0.3, "b"))], notifications)
+        assert time.monotonic() - start < 0.55
+        assert {n["source"] for n in notifications} == {"a", "b"}
+        assert meta["a"]["status"] == meta["b"]["status"] == "ok"
+        assert meta["a"]["ms"] >= 300
+
+    def test_deadline_serves_stale_last_good(self, monkeypatch):
+        collectors.run_all([("slow", sleeper(0, "slow"))], [])
+        monkeypatch.setitem(collectors.DEADLINES, "slow", 0.1)
+        release = threading.Event()
+        notifications = []
+        meta = collectors.run_all([("slow", sleeper(0, "slow", release))], notifications)
+        release.set()
+        assert meta["slow"]["status"] == "stale"
+        assert notifications[0]["stale"] is True
+        assert "stale_seconds" in notifications[0]
+
+    def test_timeout_does_not_delay_others(self, monkeypatch):
+        monkeypatch.setitem(collectors.DEADLINES, "stuck", 0.1)
+        release = threading.Event()
+        notifications = []
+        start = time.monotonic()
+        meta = collectors.run_all(
+            [("stuck", sleeper(0, "stuck", release)), ("quick", sleeper(0.05, "quick"))],
+            notifications)
+        release.set()
+        assert time.monotonic() - start < 0.5
+        assert meta["quick"]["status"] == "ok"
+        assert [n["source"] for n in notifications] == ["quick"]  # no last good for stuck
+
+    def test_partial_results(self, monkeypatch):
+        monkeypatch.setitem(collectors.DEADLINES, "pages", 0.1)
+        release = threading.Event()
+
+        def paged(notifications):
+            notifications.append({"type": "message", "source": "pages", "page": 1})
+            release.wait(5)
+            notifications.append({"type": "message", "source": "pages", "page": 2})
+
+        notifications = []
+        meta = collectors.run_all([("pages", paged)], notifications)
+        release.set()
+        assert meta["pages"]["status"] == "partial"
+        assert notifications == [{"type": "message", "source": "pages", "page": 1, "partial": True}]
+
+    def test_inflight_run_reused(self, monkeypatch):
+        monkeypatch.setitem(collectors.DEADLINES, "once", 0.05)
+        release, calls = threading.Event(), []
+
+        def counted(notifications):
+            calls.append(1)
+            release.wait(5)
+
+        collectors.run_all([("once", counted)], [])
+        collectors.run_all([("once", counted)], [])
+        release.set()
+        assert len(calls) == 1
+
+    def test_error_serves_stale(self):
+        collectors.run_all([("flaky", sleeper(0, "flaky"))], [])
+
+        def boom(notifications):
+            raise RuntimeError("api down")
+
+        notifications = []
+        meta = collectors.run_all([("flaky", boom)], notifications)
+        assert meta["flaky"]["status"] == "error"
+        assert notifications[0]["stale"] is True
+
+
+class TestEndpointMetadata:
+    def test_timings_header(self, monkeypatch):
+        monkeypatch.setattr(routes_mod, "_collect_chat_messages", lambda n: None)
+        monkeypatch.setattr(routes_mod, "_slow_collectors", [("mock", sleeper(0, "mock"))])
+        with config.app.test_client() as client:
+            resp = client.get("/notifications/pending")
+            fast = client.get("/notifications/pending?fast=1")
+        meta = json.loads(resp.headers["X-Relaygent-Collectors"])
+        assert set(meta) == {"reminders", "chat", "mock"}
+        assert meta["mock"]["status"] == "ok"
+        assert resp.get_json() == [{"type": "message", "source": "mock", "count": 1}]
+        assert set(json.loads(fast.headers["X-Relaygent-Collectors"])) == {"reminders", "chat"}
+
+
+class TestConditionalPending:
+    def test_unchanged_set_gets_304(self, monkeypatch):
+        monkeypatch.setattr(routes_mod, "_collect_chat_messages", lambda n: None)
+        with config.app.test_client() as client:
+            first = client.get("/notifications/pending?fast=1")
+            etag = first.headers["ETag"]
+            again = client.get("/notifications/pending?fast=1",
+                               headers={"If-None-Match": etag})
+        assert first.status_code == 200 and etag
+        assert again.status_code == 304
+        assert again.data == b""
+
+    def test_changed_set_gets_new_body(self, monkeypatch):
+        chat = []
+        monkeypatch.setattr(routes_mod, "_collect_chat_messages", lambda n: n.extend(chat))
+        with config.app.test_client() as client:
+            etag = client.get("/notifications/pending?fast=1").headers["ETag"]
+            chat.append({"type": "message", "source": "chat", "count": 1})
+            resp = client.get("/notifications/pending?fast=1",
+                              headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.headers["ETag"] != etag
+        assert resp.get_json() == chat
@@ -0,0 +1,62 @@
+"""Tests for the compiled-cron cache (schedule.compile_cron)."""
+from __future__ import annotations
+
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+os.environ.setdefault("RELAYGENT_DATA_DIR", "/tmp/relaygent-test-notif")
+
+import pytest
+from croniter import croniter
+
+import schedule  # noqa: E402
+
+EXPRESSIONS = ["* * * * *", "0 9 * * *", "*/15 9-17 * * 1-5", "30 2 1 * *", "0 0 29 2 *"]
+
+
+class TestCompiledCron:
+    def test_cached_by_expression(self):
+        assert schedule.compile_cron("0 9 * * *") is schedule.compile_cron("0 9 * * *")
+
+    def test_cache_bounded(self):
+        for minute in range(60):
+            for hour in range(6):
+                schedule.compile_cron(f"{minute} {hour} * * *")
+        assert schedule.compile_cron.cache_info().currsize <= schedule.CRON_CACHE_SIZE
+
+    def test_invalid_raises_value_error(self):
+        with pytest.raises(ValueError):
+            schedule.compile_cron("not a cron")
+
+    @pytest.mark.parametrize("expr", EXPRESSIONS)
+    def test_matches_croniter(self, expr):
+        rng = random.Random(expr)
+        cron = schedule.compile_cron(expr)
+        base = datetime(2026, 1, 1)
+        for _ in range(200):
+            t = base + timedelta(seconds=rng.randrange(0, 3 * 365 * 86400),
+                                 microseconds=rng.choice([0, 250000]))
+            assert cron.prev(t) == croniter(expr, t).get_prev(datetime)
+            assert cron.next(t) == croniter(expr, t).get_next(datetime)
+
+    def test_exact_occurrence_is_strict(self):
+        cron = schedule.compile_cron("0 * * * *")
+        t = datetime(2026, 3, 1, 12, 0)
+        assert cron.prev(t) == datetime(2026, 3, 1, 11, 0)
+        assert cron.next(t) == datetime(2026, 3, 1, 13, 0)
+
+    def test_sequential_lookups_reuse_table(self, monkeypatch):
+        cron = schedule.CompiledCron("* * * * *")
+        t = datetime(2026, 3, 1, 12, 0, 30)
+        cron.prev(t)
+        rebuilds = []
+        monkeypatch.setattr(cron, "_rebuild", lambda at: rebuilds.append(at))
+        for i in range(10):
+            cron.prev(t + timedelta(minutes=i))
+            cron.next(t + timedelta(minutes=i))
+        assert rebuilds == []
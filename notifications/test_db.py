@@ -0,0 +1,89 @@
+"""Tests for the pooled SQLite access layer (db.py)."""
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+os.environ.setdefault("RELAYGENT_DATA_DIR", "/tmp/relaygent-test-notif")
+
+import pytest
+
+import notif_config as config  # noqa: E402
+import db as notif_db  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _isolated_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DB_PATH", str(tmp_path / "reminders.db"))
+    notif_db.close_all()
+    notif_db.init_db()
+    yield
+    notif_db.close_all()
+
+
+class TestPool:
+    def test_connection_reused(self):
+        with notif_db.get_db() as a:
+            pass
+        with notif_db.get_db() as b:
+            pass
+        assert a is b
+
+    def test_nested_gets_distinct_connections(self):
+        with notif_db.get_db() as a, notif_db.get_db() as b:
+            assert a is not b
+
+    def test_pragmas_applied(self):
+        with notif_db.get_db() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert conn.execute("PRAGMA cache_size").fetchone()[0] == -8192
+
+    def test_uncommitted_changes_rolled_back(self):
+        with notif_db.get_db() as conn:
+            conn.execute("INSERT INTO reminders (trigger_time, message) VALUES ('t', 'm')")
+        with notif_db.get_db() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM reminders").fetchone()[0] == 0
+
+    def test_db_path_change_opens_new_connection(self, tmp_path, monkeypatch):
+        with notif_db.get_db() as a:
+            pass
+        monkeypatch.setattr(config, "DB_PATH", str(tmp_path / "other.db"))
+        with notif_db.get_db() as b:
+            pass
+        assert a is not b
+
+    def test_pool_bounded(self, monkeypatch):
+        monkeypatch.setattr(notif_db, "POOL_SIZE", 2)
+        with notif_db.get_db(), notif_db.get_db(), notif_db.get_db():
+            pass
+        assert len(notif_db._idle) == 2
+
+    def test_close_all_empties_pool(self):
+        with notif_db.get_db():
+            pass
+        notif_db.close_all()
+        assert notif_db._idle == []
+
+    def test_threads_share_pool(self):
+        errors = []
+
+        def worker():
+            try:
+                for _ in range(20):
+                    with notif_db.get_db() as conn:
+                        conn.execute("SELECT COUNT(*) FROM reminders").fetchone()
+            except Exception as e:  # pragma: no cover — surfaced below
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert errors == []
+        assert len(notif_db._idle) <= notif_db.POOL_SIZE
@@ -0,0 +1,102 @@
+"""Tests for the fast JSON backend (fastjson.py) and SQLite-rendered listings."""
+from __future__ import annotations
+
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+os.environ.setdefault("RELAYGENT_DATA_DIR", "/tmp/relaygent-test-notif")
+
+import pytest
+
+import notif_config as config  # noqa: E402
+import db as notif_db  # noqa: E402
+import events  # noqa: E402
+import fastjson  # noqa: E402
+import listing  # noqa: E402
+import reminders  # noqa: E402, F401
+import routes  # noqa: E402
+
+PAYLOAD = [{"type": "message", "source": "slack", "count": 2, "channels": [
+    {"id": "C1", "name": "général", "unread": 2, "messages": [
+        {"user": "U1", "text": 'quote " and\nnewline ☃', "ts": "1700000000.000100"},
+        {"user": "U2", "text": "", "ts": "1700000001.000200"}]}]},
+    {"type": "reminder", "id": 3, "recurrence": None, "ratio": 0.5}]
+
+
+@pytest.fixture(params=[True, False], ids=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    if request.param and not fastjson.ORJSON_AVAILABLE:
+        pytest.skip("orjson not installed")
+    monkeypatch.setattr(fastjson, "ORJSON_AVAILABLE", request.param)
+    return request.param
+
+
+@pytest.fixture(autouse=True)
+def _isolated_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DB_PATH", str(tmp_path / "reminders.db"))
+    notif_db.init_db()
+
+
+@pytest.fixture
+def client():
+    config.app.config["TESTING"] = True
+    with config.app.test_client() as c:
+        yield c
+
+
+def test_round_trip_matches_stdlib(backend):
+    encoded = fastjson.dumps(PAYLOAD)
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded) == PAYLOAD
+    assert fastjson.loads(encoded) == PAYLOAD
+    assert fastjson.loads(encoded.decode()) == PAYLOAD
+
+
+def test_sorted_and_compact(backend):
+    assert fastjson.dumps({"b": 1, "a": [1, 2]}, sort_keys=True) == b'{"a":[1,2],"b":1}'
+
+
+def test_invalid_input_raises_value_error(backend):
+    with pytest.raises(ValueError):
+        fastjson.loads(b"{not json")
+
+
+def test_backends_agree_on_state_encoding(monkeypatch):
+    """events compares encoded states, so both backends must produce the same bytes."""
+    if not fastjson.ORJSON_AVAILABLE:
+        pytest.skip("orjson not installed")
+    fast = fastjson.dumps(PAYLOAD, sort_keys=True)
+    monkeypatch.setattr(fastjson, "ORJSON_AVAILABLE", False)
+    assert fastjson.dumps(PAYLOAD, sort_keys=True) == fast
+
+
+def test_pending_serves_payload(client, backend, monkeypatch):
+    monkeypatch.setattr(routes, "_collect_chat_messages", lambda n: n.extend(PAYLOAD))
+    monkeypatch.setattr(events, "_states", {})
+    resp = client.get("/notifications/pending?fast=1")
+    assert resp.status_code == 200 and resp.mimetype == "application/json"
+    assert resp.get_json() == PAYLOAD
+    again = client.get("/notifications/pending?fast=1",
+                       headers={"If-None-Match": resp.headers["ETag"]})
+    assert again.status_code == 304
+
+
+def test_listing_rows_rendered_by_sqlite(client):
+    with notif_db.get_db() as conn:
+        conn.executemany(
+            "INSERT INTO reminders (trigger_time, message, recurrence) VALUES (?, ?, ?)",
+            [("2030-01-01T09:00:00", 'say "hi"\n☃ \\ done', None),
+             ("2030-01-02T09:00:00", "daily", "0 9 * * *")])
+        conn.commit()
+    rows = client.get("/upcoming").get_json()
+    assert [(r["message"], r["recurrence"]) for r in rows] == [
+        ('say "hi"\n☃ \\ done', None), ("daily", "0 9 * * *")]
+    assert set(rows[0]) == set(listing.FIELDS)
+    assert isinstance(rows[0]["id"], int)
+    page = client.get("/upcoming?limit=1&fields=message")
+    assert page.get_json() == [{"message": 'say "hi"\n☃ \\ done'}]
+    assert "after_id=" in page.headers["Link"]
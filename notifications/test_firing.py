@@ -0,0 +1,110 @@
+"""Tests for batched, single-transaction reminder firing."""
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+os.environ.setdefault("RELAYGENT_DATA_DIR", "/tmp/relaygent-test-notif")
+
+import pytest
+
+import notif_config as config  # noqa: E402
+import db as notif_db  # noqa: E402
+import routes as routes_mod  # noqa: E402
+from firing import fire_due  # noqa: E402
+
+FIRE_10K_BUDGET = 2.0  # Seconds to fire 10k due reminders in one poll
+
+
+@pytest.fixture(autouse=True)
+def _isolated_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DB_PATH", str(tmp_path / "reminders.db"))
+    notif_db.close_all()
+    notif_db.init_db()
+    yield
+    notif_db.close_all()
+
+
+def _seed(count, recurring=0):
+    due = (datetime.now() - timedelta(minutes=1)).isoformat()
+    old = (datetime.now() - timedelta(hours=2)).isoformat()
+    rows = [(due, f"one-off {i}", None, due) for i in range(count)]
+    rows += [(old, f"recurring {i}", "0 * * * *", due) for i in range(recurring)]
+    with notif_db.get_db() as conn:
+        conn.executemany(
+            "INSERT INTO reminders (trigger_time, message, recurrence, next_fire_at) "
+            "VALUES (?, ?, ?, ?)", rows,
+        )
+        conn.commit()
+
+
+class TestFireDue:
+    def test_single_commit_per_poll(self, monkeypatch):
+        _seed(50, recurring=10)
+        statements = []
+        connect = notif_db._connect
+
+        def traced(path):
+            conn = connect(path)
+            conn.set_trace_callback(statements.append)
+            return conn
+
+        notif_db.close_all()
+        monkeypatch.setattr(notif_db, "_connect", traced)
+        with notif_db.get_db() as conn:
+            notifications, reschedules = fire_due(conn, datetime.now())
+        assert len(notifications) == 60
+        assert len(reschedules) == 10
+        assert [s for s in statements if s.strip().upper() == "COMMIT"] == ["COMMIT"]
+
+    def test_rollback_on_error(self, monkeypatch):
+        _seed(5)
+        monkeypatch.setattr("firing._plan_fires", lambda rows, now: 1 / 0)
+        with notif_db.get_db() as conn, pytest.raises(ZeroDivisionError):
+            fire_due(conn, datetime.now())
+        with notif_db.get_db() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM reminders WHERE fired = 0").fetchone()[0] == 5
+
+    def test_only_selected_ids(self):
+        _seed(5)
+        with notif_db.get_db() as conn:
+            notifications, _ = fire_due(conn, datetime.now(), ids=[2, 4])
+        assert [n["id"] for n in notifications] == [2, 4]
+
+    def test_fires_10k_within_budget(self):
+        _seed(10_000)
+        notifications = []
+        start = time.perf_counter()
+        routes_mod._collect_due_reminders(notifications)
+        elapsed = time.perf_counter() - start
+        assert len(notifications) == 10_000
+        assert elapsed < FIRE_10K_BUDGET, f"fired 10k in {elapsed:.2f}s"
+        with notif_db.get_db() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM reminders WHERE fired = 0").fetchone()[0] == 0
+
+    def test_concurrent_pollers_fire_each_once(self):
+        _seed(2000, recurring=50)
+        results, errors = [], []
+
+        def poll():
+            try:
+                for _ in range(3):
+                    found = []
+                    routes_mod._collect_due_reminders(found)
+                    results.extend(n["id"] for n in found)
+            except Exception as e:  # pragma: no cover — surfaced below
+                errors.append(e)
+
+        threads = [threading.Thread(target=poll) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert errors == []
+        assert len(results) == len(set(results)) == 2050
@@ -0,0 +1,130 @@
+"""Tests for the delivery history (history.py)."""
+from __future__ import annotations
+
+import os
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+os.environ.setdefault("RELAYGENT_DATA_DIR", "/tmp/relaygent-test-notif")
+
+import pytest
+
+import notif_config as config  # noqa: E402
+import db as notif_db  # noqa: E402
+import history  # noqa: E402
+import routes as routes_mod  # noqa: E402
+
+NOW = datetime(2026, 3, 10, 12, 0, 0)
+
+
+@pytest.fixture(autouse=True)
+def _isolated_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DB_PATH", str(tmp_path / "reminders.db"))
+    notif_db.init_db()
+    history.reset()
+    yield
+    history.reset()
+
+
+@pytest.fixture
+def client():
+    config.app.config["TESTING"] = True
+    with config.app.test_client() as c:
+        yield c
+
+
+def reminder(rid, minutes_late=1):
+    trigger = (NOW - timedelta(minutes=minutes_late)).isoformat()
+    return {"type": "reminder", "id": rid, "message": f"r{rid}", "trigger_time": trigger}
+
+
+SLACK = {"type": "message", "source": "slack", "channels": [
+    {"id": "C1", "name": "general", "unread": 2,
+     "messages": [{"ts": f"{NOW.timestamp() - 30:.6f}"}]}]}
+CHAT = {"type": "message", "source": "chat", "count": 1,
+        "messages": [{"timestamp": "2026-03-10 11:59:00", "content": "hi"}]}
+
+
+def rows(since=NOW - timedelta(days=1), until=NOW + timedelta(days=1), **kw):
+    with notif_db.get_db() as conn:
+        return history.query(conn, since, until, **kw)
+
+
+def test_each_delivery_recorded_once():
+    assert history.record([reminder(1), SLACK, CHAT], now=NOW) == 3
+    assert history.record([SLACK, CHAT], now=NOW + timedelta(seconds=5)) == 0
+    history.reset()  # Cold key cache (restart): the unique index still dedupes
+    assert history.record([SLACK, CHAT], now=NOW + timedelta(seconds=10)) == 0
+    stored = {r["source"]: r for r in rows()}
+    assert set(stored) == {"reminder", "slack", "chat"}
+    assert stored["reminder"]["latency_s"] == 60
+    assert stored["slack"]["latency_s"] == pytest.approx(30, abs=0.01)
+    assert stored["chat"]["latency_s"] is None
+
+
+def test_recurring_occurrences_are_separate_deliveries():
+    history.record([reminder(7, minutes_late=60)], now=NOW)
+    history.record([reminder(7, minutes_late=0)], now=NOW + timedelta(hours=1))
+    assert len(rows(source="reminder")) == 2
+
+
+def test_day_partitions_and_retention(monkeypatch):
+    monkeypatch.setattr(history, "RETENTION_DAYS", 3)
+    for day in range(6):
+        history.record([reminder(day)], now=NOW + timedelta(days=day))
+    with notif_db.get_db() as conn:
+        tables = history.partitions(conn)
+        assert tables == ["history_20260312", "history_20260313",
+                          "history_20260314", "history_20260315"]
+        reminders_tables = conn.execute(
+            "SELECT count(*) FROM sqlite_master WHERE name = 'reminders'").fetchone()[0]
+    assert reminders_tables == 1
+    assert [r["summary"] for r in rows(NOW, NOW + timedelta(days=7))] == ["r2", "r3", "r4", "r5"]
+
+
+def test_query_spans_partitions_in_time_order():
+    for day in (0, 1, 2):
+        history.record([reminder(10 + day), reminder(20 + day)], now=NOW + timedelta(days=day))
+    got = rows(NOW + timedelta(hours=1), NOW + timedelta(days=3))
+    assert [r["summary"] for r in got] == ["r11", "r21", "r12", "r22"]
+    assert len(rows(NOW, NOW + timedelta(days=3), limit=3)) == 3
+
+
+def test_endpoint_pages_with_link_header(client):
+    now = datetime.now()
+    history.record([reminder(i) for i in range(5)], now=now)
+    seen, url = [], "/notifications/history?limit=2&source=reminder"
+    while url:
+        resp = client.get(url)
+        assert resp.status_code == 200
+        seen += [r["summary"] for r in resp.get_json()]
+        link = resp.headers.get("Link")
+        url = link[1:link.index(">")] if link else None
+    assert sorted(seen) == [f"r{i}" for i in range(5)]
+
+
+def test_stats_summarise_frequency_and_latency(client):
+    now = datetime.now().replace(microsecond=0)
+    history.record([reminder(1, 2), reminder(2, 4)], now=now)
+    history.record([CHAT], now=now)
+    stats = client.get("/notifications/history?stats=1").get_json()
+    assert stats["sources"]["chat"] == {"count": 1, "latency_avg_s": None,
+                                        "latency_max_s": None}
+    assert stats["sources"]["reminder"]["count"] == 2
+    assert stats["per_hour"] == {now.isoformat()[:13]: 3}
+
+
+@pytest.mark.parametrize("query", ["since=yesterday", "limit=0", "limit=x", "after_id=z"])
+def test_invalid_parameters_rejected(client, query):
+    assert client.get(f"/notifications/history?{query}").status_code == 400
+
+
+def test_pending_poll_records_deliveries(client, monkeypatch):
+    monkeypatch.setattr(routes_mod, "_collect_chat_messages", lambda n: n.append(CHAT))
+    client.get("/notifications/pending?fast=1")
+    client.get("/notifications/pending?fast=1")
+    recorded = rows(datetime.now() - timedelta(minutes=1), datetime.now() + timedelta(minutes=1))
+    assert [r["source"] for r in recorded] == ["chat"]
@@ -0,0 +1,133 @@
+"""Tests for hub chat change detection (hub_chat.py, routes chat collector)."""
+from __future__ import annotations
+
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+os.environ.setdefault("RELAYGENT_DATA_DIR", "/tmp/relaygent-test-notif")
+
+import pytest
+
+import hub_chat  # noqa: E402
+import routes as routes_mod  # noqa: E402
+
+SCHEMA = """
+    CREATE TABLE messages (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        role TEXT NOT NULL,
+        content TEXT NOT NULL,
+        created_at TEXT NOT NULL DEFAULT (datetime('now')),
+        read INTEGER NOT NULL DEFAULT 0
+    )
+"""
+
+
+@pytest.fixture
+def chat_db(tmp_path, monkeypatch):
+    path = tmp_path / "chat.db"
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute(SCHEMA)
+    monkeypatch.setattr(hub_chat, "CHAT_DB_PATH", str(path))
+    monkeypatch.setattr(routes_mod, "_chat_cache", {"signature": None, "notif": None})
+    hub_chat.reset()
+    yield conn
+    hub_chat.reset()
+    conn.close()
+
+
+@pytest.fixture
+def fetches(monkeypatch, chat_db):
+    calls = []
+
+    def fetch():
+        rows = chat_db.execute(
+            "SELECT created_at, content FROM messages WHERE role = 'human' AND read = 0"
+        ).fetchall()
+        calls.append(len(rows))
+        if not rows:
+            return None
+        return {"type": "message", "source": "chat", "count": len(rows),
+                "messages": [{"timestamp": t, "content": c} for t, c in rows]}
+
+    monkeypatch.setattr(routes_mod, "_fetch_chat_messages", fetch)
+    return calls
+
+
+def collect():
+    found = []
+    routes_mod._collect_chat_messages(found)
+    return found
+
+
+def send(conn, content, role="human"):
+    conn.execute("INSERT INTO messages (role, content, read) VALUES (?, ?, ?)",
+                 (role, content, int(role == "assistant")))
+
+
+def test_idle_polls_never_hit_the_hub(chat_db, fetches):
+    for _ in range(100):
+        assert collect() == []
+    assert fetches == []
+
+
+def test_new_message_fetched_once(chat_db, fetches):
+    collect()
+    send(chat_db, "hello")
+    assert collect()[0]["messages"][0]["content"] == "hello"
+    for _ in range(50):
+        assert collect()[0]["count"] == 1  # Served from cache
+    assert fetches == [1]
+
+
+def test_assistant_messages_do_not_refetch(chat_db, fetches):
+    send(chat_db, "hi")
+    collect()
+    send(chat_db, "reply", role="assistant")
+    assert collect()[0]["count"] == 1
+    assert fetches == [1]
+
+
+def test_mark_read_clears_without_fetch(chat_db, fetches):
+    send(chat_db, "a")
+    send(chat_db, "b")
+    assert collect()[0]["count"] == 2
+    chat_db.execute("UPDATE messages SET read = 1 WHERE id = 1")
+    assert collect()[0]["count"] == 1
+    chat_db.execute("UPDATE messages SET read = 1")
+    assert collect() == []
+    assert fetches == [2, 1]
+
+
+def test_signature_tracks_unread_set(chat_db):
+    assert hub_chat.unread_signature() == (0, None, 0.0)
+    send(chat_db, "x")
+    send(chat_db, "y")
+    assert hub_chat.unread_signature() == (2, 2, 3.0)
+
+
+def test_missing_database_falls_back_to_http(chat_db, fetches, monkeypatch, tmp_path):
+    monkeypatch.setattr(hub_chat, "CHAT_DB_PATH", str(tmp_path / "absent.db"))
+    hub_chat.reset()
+    for _ in range(3):
+        collect()
+    assert fetches == [0, 0, 0]
+    assert hub_chat.unread_signature() is None
+
+
+def test_failed_fetch_is_retried(chat_db, monkeypatch):
+    send(chat_db, "hello")
+    attempts = []
+
+    def failing():
+        attempts.append(1)
+        raise OSError("hub down")
+
+    monkeypatch.setattr(routes_mod, "_fetch_chat_messages", failing)
+    assert collect() == []
+    assert collect() == []
+    assert len(attempts) == 2
@@ -0,0 +1,136 @@
+"""Tests for paginated, projectable /upcoming and /pending (listing.py)."""
+from __future__ import annotations
+
+import os
+import sys
+import urllib.parse
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+os.environ.setdefault("RELAYGENT_DATA_DIR", "/tmp/relaygent-test-notif")
+
+import pytest
+
+import notif_config as config  # noqa: E402
+import db as notif_db  # noqa: E402
+import listing  # noqa: E402
+import reminders  # noqa: E402, F401
+
+
+@pytest.fixture(autouse=True)
+def _isolated_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DB_PATH", str(tmp_path / "reminders.db"))
+    notif_db.init_db()
+
+
+@pytest.fixture
+def client():
+    config.app.config["TESTING"] = True
+    with config.app.test_client() as c:
+        yield c
+
+
+def seed(times):
+    with notif_db.get_db() as conn:
+        conn.executemany(
+            "INSERT INTO reminders (trigger_time, message, next_fire_at) VALUES (?, ?, ?)",
+            [(t, f"r{i}", t) for i, t in enumerate(times)])
+        conn.commit()
+
+
+def next_link(resp):
+    link = resp.headers.get("Link")
+    return link[1:link.index(">")] if link else None
+
+
+def walk(client, url):
+    ids, pages = [], 0
+    while url:
+        resp = client.get(url)
+        assert resp.status_code == 200
+        ids += [r["id"] for r in resp.get_json()]
+        url, pages = next_link(resp), pages + 1
+    return ids, pages
+
+
+def test_pages_cover_every_row_once_including_ties(client):
+    future = datetime.now() + timedelta(days=1)
+    times = [(future + timedelta(minutes=i // 3)).isoformat() for i in range(10)]
+    seed(list(reversed(times)))
+    ids, pages = walk(client, "/upcoming?limit=4")
+    assert pages == 3
+    assert sorted(ids) == list(range(1, 11))
+    assert ids == [r["id"] for r in client.get("/upcoming").get_json()]
+
+
+def test_link_keeps_other_parameters(client):
+    seed([(datetime.now() + timedelta(hours=i + 1)).isoformat() for i in range(3)])
+    resp = client.get("/upcoming?limit=2&fields=id")
+    args = urllib.parse.parse_qs(urllib.parse.urlparse(next_link(resp)).query)
+    assert args["fields"] == ["id"] and args["limit"] == ["2"]
+    assert args["after_id"] == ["2"]
+    assert client.get("/upcoming?limit=3").headers.get("Link") is None
+
+
+def test_after_time_alone_skips_that_time(client):
+    t1, t2 = (datetime.now() + timedelta(hours=1)).isoformat(), (
+        datetime.now() + timedelta(hours=2)).isoformat()
+    seed([t1, t1, t2])
+    rows = client.get(f"/upcoming?after_time={urllib.parse.quote(t1)}").get_json()
+    assert [r["id"] for r in rows] == [3]
+
+
+def test_field_projection(client):
+    seed([(datetime.now() + timedelta(hours=1)).isoformat()])
+    assert client.get("/upcoming?fields=message,id").get_json() == [
+        {"message": "r0", "id": 1}]
+    resp = client.get("/upcoming?fields=id,secret")
+    assert resp.status_code == 400
+    assert "secret" in resp.get_json()["error"]
+
+
+@pytest.mark.parametrize("query", [
+    "limit=0", f"limit={listing.MAX_LIMIT + 1}", "limit=x", "after_id=3",
+    "after_time=2026-01-01&after_id=x",
+])
+def test_invalid_parameters_rejected(client, query):
+    assert client.get(f"/upcoming?{query}").status_code == 400
+
+
+def test_default_limit_bounds_response(client, monkeypatch):
+    monkeypatch.setattr(listing, "DEFAULT_LIMIT", 5)
+    seed([(datetime.now() + timedelta(hours=1)).isoformat()] * 12)
+    resp = client.get("/upcoming")
+    assert len(resp.get_json()) == 5
+    assert next_link(resp) is not None
+
+
+def test_count_only(client):
+    now = datetime.now()
+    seed([(now - timedelta(hours=1)).isoformat(), (now - timedelta(minutes=1)).isoformat(),
+          (now + timedelta(hours=1)).isoformat()])
+    assert client.get("/upcoming?count=1").get_json() == {"count": 3}
+    assert client.get("/pending?count=1").get_json() == {"count": 2}
+
+
+def test_pending_pages_by_next_fire(client):
+    now = datetime.now()
+    seed([(now - timedelta(minutes=m)).isoformat() for m in (1, 5, 3, 2)]
+         + [(now + timedelta(hours=1)).isoformat()])
+    ids, pages = walk(client, "/pending?limit=2&fields=id")
+    assert ids == [2, 3, 4, 1] and pages == 2
+
+
+@pytest.mark.parametrize("sort, where", [
+    ("trigger_time", "fired = 0"), ("next_fire_at", "fired = 0 AND next_fire_at <= ?")])
+def test_pages_are_index_range_scans(sort, where):
+    params = ["2030-01-01"] if "?" in where else []
+    with notif_db.get_db() as conn:
+        plan = " ".join(r[3] for r in conn.execute(
+            f"EXPLAIN QUERY PLAN SELECT id FROM reminders WHERE {where} "
+            f"AND ({sort}, id) > (?, ?) ORDER BY {sort}, id LIMIT 10",
+            (*params, "2026-01-01", 5)).fetchall())
+    assert "USING INDEX" in plan or "USING COVERING INDEX" in plan
+    assert "TEMP B-TREE" not in plan
@@ -0,0 +1,143 @@
+"""Tests for background SQLite maintenance (maintenance.py)."""
+from __future__ import annotations
+
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+os.environ.setdefault("RELAYGENT_DATA_DIR", "/tmp/relaygent-test-notif")
+
+import pytest
+
+import notif_config as config  # noqa: E402
+import db as notif_db  # noqa: E402
+import history  # noqa: E402
+import maintenance  # noqa: E402
+import routes  # noqa: E402, F401
+
+
+@pytest.fixture(autouse=True)
+def _isolated_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DB_PATH", str(tmp_path / "reminders.db"))
+    notif_db.close_all()
+    notif_db.init_db()
+    history.reset()
+    yield
+    notif_db.close_all()
+
+
+def churn(rows=2000):
+    with notif_db.get_db() as conn:
+        conn.executemany("INSERT INTO reminders (trigger_time, message) VALUES (?, ?)",
+                         [("2030-01-01T00:00:00", "x" * 500)] * rows)
+        conn.commit()
+        conn.execute("DELETE FROM reminders")
+        conn.commit()
+
+
+def pragma(name):
+    with notif_db.get_db() as conn:
+        return conn.execute(f"PRAGMA {name}").fetchone()[0]
+
+
+def test_new_databases_use_incremental_auto_vacuum():
+    assert pragma("auto_vacuum") == 2
+
+
+def test_truncating_checkpoint_empties_wal():
+    churn()
+    assert maintenance.sizes()["wal_bytes"] > 0
+    busy, _, _ = maintenance.checkpoint("TRUNCATE")
+    assert busy == 0
+    assert maintenance.sizes()["wal_bytes"] == 0
+
+
+def test_truncate_skipped_while_a_reader_holds_a_snapshot():
+    churn()
+    reader = sqlite3.connect(config.DB_PATH)
+    reader.execute("BEGIN")
+    reader.execute("SELECT count(*) FROM reminders").fetchone()
+    start = time.monotonic()
+    busy, _, _ = maintenance.checkpoint("TRUNCATE")
+    assert busy == 1 and time.monotonic() - start < 1  # Short busy timeout
+    reader.rollback()
+    reader.close()
+    assert pragma("busy_timeout") == 5000
+
+
+def test_vacuum_releases_free_pages():
+    churn()
+    maintenance.checkpoint("TRUNCATE")
+    assert maintenance.sizes()["free_bytes"] > 0
+    before = maintenance.sizes()["db_bytes"]
+    maintenance.vacuum()
+    maintenance.checkpoint("TRUNCATE")
+    after = maintenance.sizes()
+    assert after["free_bytes"] == 0 and after["db_bytes"] < before
+
+
+def test_vacuum_converts_old_databases(tmp_path, monkeypatch):
+    legacy = tmp_path / "legacy.db"
+    sqlite3.connect(legacy).execute("CREATE TABLE t (x)").connection.close()
+    monkeypatch.setattr(config, "DB_PATH", str(legacy))
+    assert pragma("auto_vacuum") == 0
+    maintenance.vacuum()
+    assert pragma("auto_vacuum") == 2
+
+
+def test_vacuum_prunes_expired_history(monkeypatch):
+    history.record([{"type": "reminder", "id": 1, "trigger_time": "x"}],
+                   now=datetime.now() - timedelta(days=history.RETENTION_DAYS + 2))
+    maintenance.vacuum()
+    with notif_db.get_db() as conn:
+        assert history.partitions(conn) == []
+
+
+def test_analyze_gathers_statistics():
+    with notif_db.get_db() as conn:
+        conn.executemany("INSERT INTO reminders (trigger_time, message) VALUES (?, ?)",
+                         [("2030-01-01T00:00:00", "x")] * 10)
+        conn.commit()
+    maintenance.analyze()
+    with notif_db.get_db() as conn:
+        assert conn.execute("SELECT count(*) FROM sqlite_stat1").fetchone()[0] > 0
+
+
+def test_run_due_respects_intervals():
+    m = maintenance.DbMaintenance()
+    now = time.time()
+    assert m.run_due(now) == ["checkpoint", "truncate", "vacuum", "analyze"]
+    assert m.run_due(now + 1) == []
+    assert m.run_due(now + maintenance.CHECKPOINT_INTERVAL) == ["checkpoint"]
+    assert maintenance.MAINTENANCE_RUNS.value(task="analyze") >= 1
+
+
+def test_large_wal_forces_truncate(monkeypatch):
+    m = maintenance.DbMaintenance()
+    now = time.time()
+    m.run_due(now)
+    monkeypatch.setattr(maintenance, "WAL_TRUNCATE_BYTES", 1)
+    churn(10)
+    assert m.run_due(now + 1) == ["truncate"]
+
+
+def test_idle_tracks_requests(monkeypatch):
+    monkeypatch.setattr(maintenance, "IDLE_GAP", 0.05)
+    client = config.app.test_client()
+    client.get("/health")
+    assert not maintenance.idle()
+    time.sleep(0.06)
+    assert maintenance.idle()
+
+
+def test_status_endpoint_and_metrics():
+    client = config.app.test_client()
+    status = client.get("/notifications/maintenance").get_json()
+    assert status["db_bytes"] > 0 and "wal_bytes" in status and "last_run" in status
+    body = client.get("/metrics").get_data(as_text=True)
+    assert 'relaygent_db_size_bytes{file="wal"}' in body
@@ -0,0 +1,150 @@
+"""Tests for the metrics registry and GET /metrics."""
+from __future__ import annotations
+
+import os
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+os.environ.setdefault("RELAYGENT_DATA_DIR", "/tmp/relaygent-test-notif")
+
+import pytest
+
+import notif_config as config  # noqa: E402
+import collectors  # noqa: E402
+import db as notif_db  # noqa: E402
+import metrics  # noqa: E402
+import routes  # noqa: E402, F401
+import reminders  # noqa: E402
+import slack_api  # noqa: E402
+import slack_limits  # noqa: E402
+from slack_mock import MockSlack  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _isolated_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DB_PATH", str(tmp_path / "reminders.db"))
+    notif_db.init_db()
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    monkeypatch.setattr(metrics, "_registry", {})
+    return metrics
+
+
+@pytest.fixture
+def client():
+    config.app.config["TESTING"] = True
+    with config.app.test_client() as c:
+        yield c
+
+
+def test_counter_and_gauge_exposition(registry):
+    c = registry.Counter("jobs_total", "Jobs done.", ("kind",))
+    c.inc(kind="a")
+    c.inc(2, kind='we"ird\n')
+    registry.Gauge("queue", "Queue depth.").set(3)
+    registry.Gauge("ages", "Computed.", ("name",), fn=lambda: {("x",): 1.5})
+    text = registry.render()
+    assert text.endswith("\n")
+    assert "# HELP jobs_total Jobs done.\n# TYPE jobs_total counter\n" in text
+    assert 'jobs_total{kind="a"} 1\n' in text
+    assert 'jobs_total{kind="we\\"ird\\n"} 2\n' in text
+    assert "# TYPE queue gauge\nqueue 3\n" in text
+    assert 'ages{name="x"} 1.5\n' in text
+    assert c.value(kind="a") == 1
+
+
+def test_histogram_buckets_are_cumulative(registry):
+    h = registry.Histogram("lat_seconds", "Latency.", ("op",), buckets=(0.1, 1))
+    for v in (0.05, 0.1, 0.5, 3):
+        h.observe(v, op="get")
+    with h.time(op="put"):
+        pass
+    lines = registry.render().splitlines()
+    assert 'lat_seconds_bucket{op="get",le="0.1"} 2' in lines
+    assert 'lat_seconds_bucket{op="get",le="1"} 3' in lines
+    assert 'lat_seconds_bucket{op="get",le="+Inf"} 4' in lines
+    assert 'lat_seconds_sum{op="get"} 3.65' in lines
+    assert 'lat_seconds_count{op="get"} 4' in lines
+    assert h.count(op="put") == 1
+
+
+def test_endpoint_serves_text_format(client):
+    client.get("/health")
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.content_type == metrics.CONTENT_TYPE
+    body = resp.get_data(as_text=True)
+    assert "# TYPE relaygent_http_requests_total counter" in body
+    assert 'route="/health",method="GET",status="200"' in body
+
+
+def test_requests_labelled_by_rule_not_path(client):
+    before = metrics.HTTP_REQUESTS.value(
+        route="/reminder/<int:reminder_id>", method="DELETE", status=404)
+    unmatched = metrics.HTTP_REQUESTS.value(route="unmatched", method="GET", status=404)
+    client.delete("/reminder/12345")
+    client.get("/no/such/path")
+    assert metrics.HTTP_REQUESTS.value(
+        route="/reminder/<int:reminder_id>", method="DELETE", status=404) == before + 1
+    assert metrics.HTTP_REQUESTS.value(
+        route="unmatched", method="GET", status=404) == unmatched + 1
+
+
+def test_reminder_changes_and_queries_counted(client):
+    created = reminders.REMINDER_CHANGES.value(action="created")
+    queries = metrics.DB_QUERY.count(query="upcoming")
+    when = (datetime.now() + timedelta(hours=1)).isoformat()
+    rid = client.post("/reminder", json={"trigger_time": when, "message": "m"}).get_json()["id"]
+    client.get("/upcoming")
+    client.delete(f"/reminder/{rid}")
+    assert reminders.REMINDER_CHANGES.value(action="created") == created + 1
+    assert metrics.DB_QUERY.count(query="upcoming") == queries + 1
+    assert "relaygent_reminder_changes_total" in client.get("/metrics").get_data(as_text=True)
+
+
+def test_fire_counts_only_existing_reminders(client):
+    fired = reminders.REMINDER_CHANGES.value(action="fired")
+    assert client.post("/reminder/999999/fire").status_code == 200
+    assert reminders.REMINDER_CHANGES.value(action="fired") == fired
+    when = (datetime.now() + timedelta(hours=1)).isoformat()
+    rid = client.post("/reminder", json={"trigger_time": when, "message": "m"}).get_json()["id"]
+    client.post(f"/reminder/{rid}/fire")
+    assert reminders.REMINDER_CHANGES.value(action="fired") == fired + 1
+
+
+def test_collector_runs_counted(client):
+    fast = metrics.COLLECTOR_DURATION.count(collector="reminders")
+    client.get("/notifications/pending?fast=1")
+    assert metrics.COLLECTOR_DURATION.count(collector="reminders") == fast + 1
+
+    def broken(found):
+        raise RuntimeError("boom")
+
+    collectors.run_all([("probe", lambda found: None), ("broken", broken)], [])
+    assert metrics.COLLECTOR_RUNS.value(collector="probe", status="ok") >= 1
+    assert metrics.COLLECTOR_RUNS.value(collector="broken", status="error") >= 1
+    assert 'relaygent_collector_result_age_seconds{collector="probe"}' in metrics.render()
+
+
+def test_slack_calls_counted_by_outcome(monkeypatch):
+    monkeypatch.setattr(slack_api, "limiter", slack_limits.SlackRateLimiter())
+    with MockSlack(channels=1) as mock:
+        monkeypatch.setattr(slack_api, "SLACK_API_BASE", mock.url)
+        ok = slack_api.SLACK_CALLS.value(method="auth.test", outcome="ok")
+        limited = slack_api.SLACK_CALLS.value(method="auth.test", outcome="rate_limited")
+        assert slack_api.call("xoxp-test", "auth.test")
+        mock.limited["auth.test"] = 30
+        assert slack_api.call("xoxp-test", "auth.test") is None
+        assert slack_api.call("xoxp-test", "auth.test") is None  # Deferred locally
+    assert slack_api.SLACK_CALLS.value(method="auth.test", outcome="ok") == ok + 1
+    assert slack_api.SLACK_CALLS.value(
+        method="auth.test", outcome="rate_limited") == limited + 1
+    assert slack_api.SLACK_CALLS.value(method="auth.test", outcome="deferred") >= 1
+    text = metrics.render()
+    assert 'relaygent_slack_blocked_seconds{method="auth.test"}' in text
+    assert 'relaygent_slack_api_duration_seconds_count{method="auth.test"}' in text
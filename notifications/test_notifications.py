@@ -39,7 +39,7 @@ class TestDatabase:
                 "SELECT name FROM sqlite_master WHERE type='table'"
             ).fetchall()
         names = [r["name"] for r in rows]
-        assert "reminders" in names
+        assert "reminders" in names and "slack_cursors" in names
 
     def test_get_db_row_factory(self):
         with notif_db.get_db() as conn:
@@ -144,19 +144,6 @@ class TestReminderCRUD:
         assert "next_trigger" in data
 
 
-class TestRecurringLogic:
-    def test_due_when_stale(self):
-        old = (datetime.now() - timedelta(hours=1)).isoformat()
-        is_due, prev = rem_mod.is_recurring_reminder_due("* * * * *", old)
-        assert is_due is True
-        assert prev
-
-    def test_not_due_when_fresh(self):
-        future = (datetime.now() + timedelta(hours=1)).isoformat()
-        is_due, _ = rem_mod.is_recurring_reminder_due("* * * * *", future)
-        assert is_due is False
-
-
 class TestNotificationsEndpoint:
     def test_health(self, client):
         resp = client.get("/health")
@@ -181,13 +168,20 @@ class TestNotificationsEndpoint:
 
 
 class TestSlackCollectorHelpers:
-    def test_ack_creates_timestamp_file(self, tmp_path, monkeypatch):
-        import slack_collector
+    def test_ack_advances_channel_cursors(self, tmp_path, monkeypatch):
+        import json, slack_channels, slack_collector
         ts_file = str(tmp_path / ".last_check_ts")
+        cursors_file = tmp_path / "slack" / "read_cursors.json"
         monkeypatch.setattr(slack_collector, "_LAST_CHECK_FILE", ts_file)
-        slack_collector.ack()
-        assert os.path.exists(ts_file)
-        assert float(open(ts_file).read().strip()) > 0
+        monkeypatch.setattr(slack_collector, "_READ_CURSORS_FILE", str(cursors_file))
+        slack_collector.ack({"C1": "1700000000.000100"})
+        slack_collector.ack({"C2": "1700000000.000300", "C1": "1600000000.000000"})
+        expected = {"C1": "1700000000.000100", "C2": "1700000000.000300"}
+        assert slack_channels.load_cursors() == expected
+        # Socket Mode readers filter on the mirrored per-channel cursors; a
+        # global mark would hide unseen messages in other channels
+        assert json.loads(cursors_file.read_text()) == expected
+        assert not os.path.exists(ts_file)
 
     def test_collect_skips_without_token(self, tmp_path, monkeypatch):
         import slack_collector
@@ -0,0 +1,126 @@
+"""Tests for precomputed next_fire_at scheduling and its migration."""
+from __future__ import annotations
+
+import os
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+os.environ.setdefault("RELAYGENT_DATA_DIR", "/tmp/relaygent-test-notif")
+
+import pytest
+
+import notif_config as config  # noqa: E402
+import db as notif_db  # noqa: E402
+import routes as routes_mod  # noqa: E402
+import schedule  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _isolated_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DB_PATH", str(tmp_path / "reminders.db"))
+    notif_db.close_all()
+    yield
+    notif_db.close_all()
+
+
+def _insert(trigger_time, message="m", recurrence=None):
+    with notif_db.get_db() as conn:
+        cur = conn.execute(
+            "INSERT INTO reminders (trigger_time, message, recurrence, next_fire_at) "
+            "VALUES (?, ?, ?, ?)",
+            (trigger_time, message, recurrence,
+             schedule.next_fire_at(trigger_time, recurrence)),
+        )
+        conn.commit()
+        return cur.lastrowid
+
+
+def _next_fire(rid):
+    with notif_db.get_db() as conn:
+        return conn.execute(
+            "SELECT next_fire_at FROM reminders WHERE id = ?", (rid,)
+        ).fetchone()[0]
+
+
+class TestNextFireAt:
+    def test_one_off_is_trigger_time(self):
+        assert schedule.next_fire_at("2026-03-01T09:00") == "2026-03-01T09:00:00"
+
+    def test_recurring_is_next_occurrence(self):
+        assert schedule.next_fire_at("2026-03-01T09:00:00", "0 9 * * *") == "2026-03-02T09:00:00"
+
+    def test_aware_converted_to_local(self):
+        aware = "2026-03-01T09:00:00+00:00"
+        expected = datetime.fromisoformat(aware).astimezone().replace(tzinfo=None)
+        assert schedule.next_fire_at(aware) == expected.isoformat()
+
+    def test_invalid_cron_never_fires(self):
+        assert schedule.next_fire_at("2026-03-01T09:00:00", "not cron") is None
+
+    def test_advance_brackets_now(self):
+        now = datetime(2026, 3, 1, 12, 30)
+        assert schedule.advance("0 * * * *", now) == ("2026-03-01T12:00:00", "2026-03-01T13:00:00")
+
+
+class TestMigration:
+    def test_backfills_existing_rows(self):
+        path = config.DB_PATH
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        old = sqlite3.connect(path)
+        old.execute(
+            "CREATE TABLE reminders (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "trigger_time TEXT NOT NULL, message TEXT NOT NULL, "
+            "created_at TEXT DEFAULT CURRENT_TIMESTAMP, fired INTEGER DEFAULT 0, "
+            "recurrence TEXT DEFAULT NULL)"
+        )
+        old.execute("INSERT INTO reminders (trigger_time, message) VALUES ('2026-05-01T08:00:00', 'a')")
+        old.execute("INSERT INTO reminders (trigger_time, message, recurrence) "
+                    "VALUES ('2026-05-01T08:00:00', 'b', '0 9 * * *')")
+        old.commit()
+        old.close()
+        notif_db.init_db()
+        assert _next_fire(1) == "2026-05-01T08:00:00"
+        assert _next_fire(2) == "2026-05-01T09:00:00"
+
+    def test_due_query_uses_index(self):
+        notif_db.init_db()
+        with notif_db.get_db() as conn:
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN SELECT id FROM reminders "
+                "WHERE fired = 0 AND next_fire_at <= ? ORDER BY next_fire_at",
+                (datetime.now().isoformat(),),
+            ).fetchall()
+        assert any("idx_reminders_due" in row[-1] for row in plan)
+
+
+class TestCollectDue:
+    def test_future_reminders_not_read(self):
+        notif_db.init_db()
+        _insert((datetime.now() + timedelta(days=1)).isoformat())
+        notifications = []
+        routes_mod._collect_due_reminders(notifications)
+        assert notifications == []
+
+    def test_recurring_advances_next_fire(self):
+        notif_db.init_db()
+        rid = _insert((datetime.now() - timedelta(hours=2)).isoformat(), "hourly", "0 * * * *")
+        notifications = []
+        routes_mod._collect_due_reminders(notifications)
+        assert [n["id"] for n in notifications] == [rid]
+        assert _next_fire(rid) > datetime.now().isoformat()
+        again = []
+        routes_mod._collect_due_reminders(again)
+        assert again == []
+
+    def test_one_off_fires_once(self):
+        notif_db.init_db()
+        rid = _insert((datetime.now() - timedelta(minutes=1)).isoformat(), "once")
+        first, second = [], []
+        routes_mod._collect_due_reminders(first)
+        routes_mod._collect_due_reminders(second)
+        assert [n["id"] for n in first] == [rid]
+        assert second == []
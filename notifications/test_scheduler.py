@@ -0,0 +1,141 @@
+"""Tests for the in-process reminder scheduler."""
+from __future__ import annotations
+
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+os.environ.setdefault("RELAYGENT_DATA_DIR", "/tmp/relaygent-test-notif")
+
+import pytest
+
+import notif_config as config  # noqa: E402
+import db as notif_db  # noqa: E402
+import reminders as rem_mod  # noqa: E402, F401 — registers routes
+import routes as routes_mod  # noqa: E402
+from scheduler import scheduler  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _running_scheduler(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DB_PATH", str(tmp_path / "reminders.db"))
+    monkeypatch.setattr(routes_mod, "_collect_chat_messages", lambda n: None)
+    notif_db.close_all()
+    notif_db.init_db()
+    scheduler.start()
+    yield
+    scheduler.stop()
+    scheduler.drain()
+    notif_db.close_all()
+
+
+@pytest.fixture()
+def client():
+    config.app.config["TESTING"] = True
+    with config.app.test_client() as c:
+        yield c
+
+
+def _create(client, delay, message="m", recurrence=None):
+    body = {"trigger_time": (datetime.now() + timedelta(seconds=delay)).isoformat(),
+            "message": message}
+    if recurrence:
+        body["recurrence"] = recurrence
+    return client.post("/reminder", json=body).get_json()["id"]
+
+
+def _poll_until(client, deadline=3.0):
+    end = time.time() + deadline
+    while time.time() < end:
+        data = client.get("/notifications/pending?fast=1").get_json()
+        if data:
+            return data
+        time.sleep(0.02)
+    return []
+
+
+class TestScheduler:
+    def test_running(self):
+        assert scheduler.running
+
+    def test_fires_at_deadline(self, client):
+        rid = _create(client, 0.2, "soon")
+        assert client.get("/notifications/pending?fast=1").get_json() == []
+        data = _poll_until(client)
+        assert [n["id"] for n in data] == [rid]
+        assert client.get("/notifications/pending?fast=1").get_json() == []
+
+    def test_loads_existing_on_start(self, client):
+        scheduler.stop()
+        rid = _create(client, -30, "overdue")
+        scheduler.start()
+        assert [n["id"] for n in _poll_until(client)] == [rid]
+
+    def test_delete_cancels(self, client):
+        rid = _create(client, 0.2)
+        client.delete(f"/reminder/{rid}")
+        time.sleep(0.4)
+        assert client.get("/notifications/pending?fast=1").get_json() == []
+
+    def test_manual_fire_cancels(self, client):
+        rid = _create(client, 0.2)
+        client.post(f"/reminder/{rid}/fire")
+        time.sleep(0.4)
+        assert client.get("/notifications/pending?fast=1").get_json() == []
+
+    def test_recurring_rescheduled_after_fire(self, client):
+        scheduler.stop()
+        with notif_db.get_db() as conn:
+            conn.execute(
+                "INSERT INTO reminders (trigger_time, message, recurrence, next_fire_at) "
+                "VALUES (?, 'hourly', '0 * * * *', ?)",
+                ((datetime.now() - timedelta(hours=2)).isoformat(),
+                 (datetime.now() - timedelta(seconds=1)).isoformat()),
+            )
+            conn.commit()
+        scheduler.start()
+        data = _poll_until(client)
+        assert data and data[0]["message"] == "hourly"
+        rid = data[0]["id"]
+        assert scheduler._current[rid] > time.time()
+
+    def test_idle_scheduler_makes_no_queries(self, client, monkeypatch):
+        _create(client, 3600)
+        calls = []
+        monkeypatch.setattr("scheduler.get_db", lambda: calls.append(1))
+        time.sleep(0.2)
+        client.get("/notifications/pending?fast=1")
+        assert calls == []
+
+    def test_failed_fire_is_retried(self, client, monkeypatch):
+        import scheduler as sched_mod
+        calls, real = [], sched_mod.fire_due
+
+        def flaky(conn, now, ids=None):
+            calls.append(ids)
+            if len(calls) == 1:
+                raise sqlite3.OperationalError("database is locked")
+            return real(conn, now, ids)
+        monkeypatch.setattr(sched_mod, "RETRY_DELAY", 0.05)
+        monkeypatch.setattr(sched_mod, "fire_due", flaky)
+        rid = _create(client, 0.1, "retry me")
+        assert [n["id"] for n in _poll_until(client)] == [rid]
+        assert len(calls) == 2
+
+    def test_due_ids_not_selected_are_rescheduled(self, client, monkeypatch):
+        import scheduler as sched_mod
+        calls, real = [], sched_mod.fire_due
+
+        def skipping(conn, now, ids=None):
+            calls.append(ids)
+            return ([], []) if len(calls) == 1 else real(conn, now, ids)
+        monkeypatch.setattr(sched_mod, "RETRY_DELAY", 0.05)
+        monkeypatch.setattr(sched_mod, "fire_due", skipping)
+        rid = _create(client, 0.1, "skipped once")
+        assert [n["id"] for n in _poll_until(client)] == [rid]
+        assert len(calls) == 2
@@ -0,0 +1,43 @@
+"""Tests for the production server entry point (serve.py)."""
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+os.environ.setdefault("RELAYGENT_DATA_DIR", "/tmp/relaygent-test-notif")
+
+import serve  # noqa: E402
+
+
+class TestSettings:
+    def test_defaults(self, monkeypatch):
+        for var in ("RELAYGENT_NOTIFICATIONS_PORT", "RELAYGENT_BIND_HOST",
+                    "RELAYGENT_NOTIFICATIONS_THREADS", "RELAYGENT_NOTIFICATIONS_KEEPALIVE"):
+            monkeypatch.delenv(var, raising=False)
+        assert serve._settings() == {
+            "host": "127.0.0.1", "port": 8083, "threads": 16, "keepalive": 75}
+
+    def test_env_overrides(self, monkeypatch):
+        monkeypatch.setenv("RELAYGENT_NOTIFICATIONS_PORT", "9000")
+        monkeypatch.setenv("RELAYGENT_NOTIFICATIONS_THREADS", "4")
+        cfg = serve._settings()
+        assert cfg["port"] == 9000 and cfg["threads"] == 4
+
+    def test_all_routes_registered(self):
+        rules = {r.rule for r in serve.app.url_map.iter_rules()}
+        assert {"/notifications/pending", "/notifications/stream",
+                "/reminder", "/upcoming", "/health", "/notifications/ack-slack",
+                "/notifications/slack/limits"} <= rules
+
+
+def test_optional_sources_load_lazily():
+    """Startup leaves Slack (and its TLS stack) and croniter unimported."""
+    probe = ("import sys, serve; print(' '.join(m for m in ('slack_collector', "
+             "'slack_api', 'croniter') if m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", probe], cwd=Path(__file__).parent,
+                         capture_output=True, text=True, check=True).stdout
+    assert out.strip() == ""
@@ -0,0 +1,186 @@
+"""Tests for the Slack channel activity cache (slack_channels.py)."""
+from __future__ import annotations
+
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+os.environ.setdefault("RELAYGENT_DATA_DIR", "/tmp/relaygent-test-notif")
+
+import pytest
+
+import notif_config as config  # noqa: E402
+import db as notif_db  # noqa: E402
+import slack_api  # noqa: E402
+import slack_channels  # noqa: E402
+import routes  # noqa: E402, F401 — registers the Slack views
+import slack_collector  # noqa: E402
+import slack_limits  # noqa: E402
+from slack_mock import SELF_UID, MockSlack  # noqa: E402
+
+
+@pytest.fixture
+def slack(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DB_PATH", str(tmp_path / "reminders.db"))
+    notif_db.init_db()
+    token = tmp_path / "token.json"
+    token.write_text(json.dumps({"access_token": "xoxp-test"}))
+    monkeypatch.setattr(slack_collector, "SLACK_TOKEN_PATH", str(token))
+    monkeypatch.setattr(slack_collector, "_LAST_CHECK_FILE", str(tmp_path / "last"))
+    monkeypatch.setattr(slack_collector, "_READ_CURSORS_FILE", str(tmp_path / "cursors.json"))
+    monkeypatch.setattr(slack_collector, "_SELF_UID", None)
+    monkeypatch.setattr(slack_limits, "TIER_RATES", {1: 1, 2: 20, 3: 500, 4: 100})
+    monkeypatch.setattr(slack_api, "limiter", slack_limits.SlackRateLimiter())
+    slack_channels.reset()
+
+    def start(**kwargs):
+        mock = MockSlack(**kwargs).__enter__()
+        monkeypatch.setattr(slack_api, "SLACK_API_BASE", mock.url)
+        started.append(mock)
+        return mock
+
+    started = []
+    yield start
+    for mock in started:
+        mock.__exit__(None, None, None)
+
+
+def poll():
+    found = []
+    slack_collector.collect(found)
+    return {c["id"]: c for c in found[0]["channels"]} if found else {}
+
+
+def test_listing_follows_pagination(slack, monkeypatch):
+    monkeypatch.setattr(slack_channels, "LIST_PAGE_SIZE", 40)
+    mock = slack(channels=130)
+    unread = poll()
+    assert mock.count("conversations.list") == 4
+    assert mock.count("conversations.history") == 130
+    assert len(unread) == 65 and "C128" in unread  # Past the old 50-channel cutoff
+
+
+def test_latest_hints_skip_idle_channels(slack):
+    mock = slack(channels=100, latest_hints=True)
+    first = poll()
+    assert mock.count("conversations.history") == 100  # Empty channels have no hint
+    assert len(first) == 50
+
+    mock.calls.clear()
+    assert poll() == first  # Nothing changed: served from the cache
+    assert mock.count("conversations.history") == 0
+
+    mock.post("C07", "new here")
+    mock.calls.clear()
+    unread = poll()
+    assert mock.count("conversations.history") == 1
+    assert unread["C07"]["messages"][-1]["text"] == "new here"
+    assert len(unread) == 51
+
+
+def test_own_newest_message_is_fetched_once(slack):
+    mock = slack(channels=4, latest_hints=True)
+    poll()
+    mock.post("C01", "from me", user=SELF_UID)  # Filtered out of the summary
+    fetches = []
+    for _ in range(3):
+        mock.calls.clear()
+        poll()
+        fetches.append(mock.count("conversations.history"))
+    assert fetches == [1, 0, 0]
+
+
+def age_checks(seconds):
+    for st in slack_channels._state.values():
+        st["checked"] -= seconds
+
+
+def test_quiet_channels_back_off_without_hints(slack, monkeypatch):
+    mock = slack(channels=100)
+    poll()
+    assert mock.count("conversations.history") == 100
+
+    mock.calls.clear()
+    age_checks(5)
+    poll()
+    # Channels with unread messages are re-checked; empty ones wait
+    assert mock.count("conversations.history") == 50
+
+    mock.calls.clear()
+    age_checks(slack_channels.QUIET_BASE_INTERVAL)
+    poll()
+    assert mock.count("conversations.history") == 100
+
+
+def test_direct_messages_never_back_off():
+    slack_channels.reset()
+    for _ in range(5):  # Quiet long enough for the maximum back-off
+        for channel_id in ("C1", "D1", "G1"):
+            slack_channels.record(channel_id, None, now=0)
+    later = slack_channels.QUIET_BASE_INTERVAL
+    assert not slack_channels.needs_history({"id": "C1"}, "", now=later)
+    assert slack_channels.needs_history({"id": "D1", "is_im": True}, "", now=later)
+    assert slack_channels.needs_history({"id": "G1", "is_mpim": True}, "", now=later)
+    slack_channels.reset()
+
+
+def test_ack_clears_cached_unread(slack):
+    mock = slack(channels=10, latest_hints=True)
+    assert len(poll()) == 5
+    slack_collector.ack()
+    mock.calls.clear()
+    assert poll() == {}
+    assert mock.count("conversations.history") == 0
+
+
+def test_failed_history_is_retried_next_poll(slack, monkeypatch):
+    mock = slack(channels=4, latest_hints=True)
+    mock.post("C01", "hi")
+    mock.post("C03", "hi")
+    monkeypatch.setattr(slack_limits, "TIER_RATES", {1: 1, 2: 20, 3: 1, 4: 100})
+    monkeypatch.setattr(slack_api, "limiter", slack_limits.SlackRateLimiter())
+    assert len(poll()) == 1  # Only one history token
+    monkeypatch.setattr(slack_api, "limiter", slack_limits.SlackRateLimiter())
+    assert len(poll()) == 2
+    assert mock.count("conversations.history") == 2
+
+
+def test_ack_is_per_channel(slack):
+    mock = slack(channels=4, latest_hints=True)
+    mock.post("C01", "one")
+    assert set(poll()) == {"C00", "C01", "C02"}
+    slack_collector.ack({"C00": "1700000000.000200"})
+    assert set(poll()) == {"C01", "C02"}  # Acking C00 leaves the others unread
+
+    slack_collector.ack()  # Everything reported so far
+    new_ts = mock.post("C02", "two")
+    mock.calls.clear()
+    assert set(poll()) == {"C02"}
+    assert mock.oldest["C02"] == "1700000002.000200"  # Only the delta is fetched
+    assert poll()["C02"]["messages"][-1]["ts"] == new_ts
+
+
+def test_global_mark_is_a_floor(slack, tmp_path):
+    slack(channels=4, latest_hints=True)
+    (tmp_path / "last").write_text("9999999999.000000")
+    assert poll() == {}
+
+
+def test_ack_endpoint_validates_cursors(slack):
+    client = config.app.test_client()
+    bad = client.post("/notifications/ack-slack", json={"channels": {"C1": "tomorrow"}})
+    assert bad.status_code == 400
+    ok = client.post("/notifications/ack-slack", json={"channels": {"C1": "1700000000.000100"}})
+    assert ok.status_code == 200
+    assert slack_channels.load_cursors() == {"C1": "1700000000.000100"}
+    assert client.post("/notifications/ack-slack").status_code == 200  # Ack all, no body
+
+
+def test_quiet_interval_is_capped():
+    intervals = [slack_channels._quiet_interval(q) for q in range(1, 10)]
+    assert intervals[0] == slack_channels.QUIET_BASE_INTERVAL
+    assert intervals == sorted(intervals)
+    assert intervals[-1] == slack_channels.QUIET_MAX_INTERVAL
@@ -0,0 +1,105 @@
+"""Tests for concurrent Slack history fan-out and rate limiting.
+
+Runs slack_collector.collect() against a local mock Slack Web API with
+injected per-call latency.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+os.environ.setdefault("RELAYGENT_DATA_DIR", "/tmp/relaygent-test-notif")
+
+import pytest
+
+import notif_config as config  # noqa: E402
+import db as notif_db  # noqa: E402
+import slack_api  # noqa: E402
+import slack_channels  # noqa: E402
+import slack_collector  # noqa: E402
+import slack_limits  # noqa: E402
+from slack_mock import MockSlack  # noqa: E402
+
+CHANNELS = 20
+LATENCY = 0.2
+
+
+@pytest.fixture
+def mock_slack(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DB_PATH", str(tmp_path / "reminders.db"))
+    notif_db.init_db()
+    token = tmp_path / "token.json"
+    token.write_text(json.dumps({"access_token": "xoxp-test"}))
+    monkeypatch.setattr(slack_collector, "SLACK_TOKEN_PATH", str(token))
+    monkeypatch.setattr(slack_collector, "_LAST_CHECK_FILE", str(tmp_path / "last"))
+    monkeypatch.setattr(slack_collector, "_SELF_UID", None)
+    monkeypatch.setattr(slack_api, "limiter", slack_limits.SlackRateLimiter())
+    slack_channels.reset()
+    with MockSlack(channels=CHANNELS, latency=LATENCY) as mock:
+        monkeypatch.setattr(slack_api, "SLACK_API_BASE", mock.url)
+        yield mock
+
+
+def test_history_calls_run_concurrently(mock_slack):
+    found = []
+    start = time.monotonic()
+    slack_collector.collect(found)
+    elapsed = time.monotonic() - start
+    # Sequentially this is CHANNELS * LATENCY = 4s; 8 workers need ~0.6s
+    assert elapsed < 1.5
+    assert mock_slack.count("conversations.history") == CHANNELS
+    assert len(found) == 1
+    channels = found[0]["channels"]
+    assert sorted(c["id"] for c in channels) == [f"C{i:02d}" for i in range(0, CHANNELS, 2)]
+    assert found[0]["count"] == CHANNELS // 2  # Own messages excluded
+    assert all(c["messages"][0]["text"] == f"hello {int(c['id'][1:])}" for c in channels)
+
+
+def test_rate_limited_channels_are_skipped_not_waited_for(mock_slack, monkeypatch):
+    monkeypatch.setattr(slack_limits, "TIER_RATES", {1: 1, 2: 20, 3: 5, 4: 100})
+    monkeypatch.setattr(slack_api, "limiter", slack_limits.SlackRateLimiter())
+    found = []
+    slack_collector.collect(found)
+    assert mock_slack.count("conversations.history") == 5
+
+
+def test_rotation_gives_every_channel_a_turn(mock_slack, monkeypatch):
+    monkeypatch.setattr(slack_limits, "TIER_RATES", {1: 1, 2: 20, 3: 5, 4: 100})
+    mock_slack.latency = 0
+    seen = set()
+    for _ in range(CHANNELS):
+        monkeypatch.setattr(slack_api, "limiter", slack_limits.SlackRateLimiter())
+        slack_channels.reset()  # Isolate rotation from the activity cache
+        found = []
+        slack_collector.collect(found)
+        if found:
+            seen.update(c["id"] for c in found[0]["channels"])
+    assert seen == {f"C{i:02d}" for i in range(0, CHANNELS, 2)}
+
+
+def test_token_bucket_bursts_then_paces():
+    bucket = slack_limits.TokenBucket(rate=100, capacity=3)
+    assert [bucket.try_acquire() for _ in range(3)] == [0, 0, 0]
+    assert bucket.try_acquire() > 0
+    assert bucket.acquire(timeout=0.5)
+
+
+def test_token_bucket_acquire_times_out():
+    bucket = slack_limits.TokenBucket(rate=0.5, capacity=1)
+    assert bucket.acquire(0)
+    start = time.monotonic()
+    assert not bucket.acquire(0.1)
+    assert time.monotonic() - start < 0.1  # Gives up without sleeping past the deadline
+
+
+def test_limiter_sizes_buckets_by_tier():
+    limiter = slack_limits.SlackRateLimiter()
+    assert limiter.bucket("conversations.history").capacity == 50
+    assert limiter.bucket("conversations.list").capacity == 20
+    assert limiter.bucket("some.new.method").capacity == 50
+    assert limiter.bucket("auth.test") is limiter.bucket("auth.test")
@@ -0,0 +1,83 @@
+"""Tests for the pooled Slack HTTP client (slack_http.py)."""
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import ssl
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+os.environ.setdefault("RELAYGENT_DATA_DIR", "/tmp/relaygent-test-notif")
+
+import pytest
+
+import slack_http  # noqa: E402
+from slack_mock import MockSlack, self_signed_cert  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _fresh_pool():
+    slack_http.close_all()
+    yield
+    slack_http.close_all()
+
+
+def test_sequential_calls_reuse_one_connection():
+    with MockSlack() as mock:
+        for _ in range(20):
+            resp = slack_http.get(f"{mock.url}/auth.test")
+            assert resp.status == 200
+            assert json.loads(resp.body)["user_id"] == "USELF"
+        assert mock.connections == 1
+
+
+def test_gzip_bodies_are_decoded():
+    with MockSlack(channels=50) as mock:
+        resp = slack_http.get(f"{mock.url}/conversations.list?limit=50")
+        assert resp.headers["Content-Encoding"] == "gzip"
+        assert len(json.loads(resp.body)["channels"]) == 50
+
+
+def test_concurrent_calls_are_bounded_by_pool():
+    with MockSlack() as mock:
+        def worker():
+            for _ in range(10):
+                slack_http.get(f"{mock.url}/auth.test")
+        threads = [threading.Thread(target=worker) for _ in range(slack_http.POOL_SIZE)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert mock.count("auth.test") == 10 * slack_http.POOL_SIZE
+        assert mock.connections <= slack_http.POOL_SIZE
+
+
+def test_connection_closed_while_idle_is_retried():
+    with MockSlack(idle_timeout=0.1) as mock:
+        slack_http.get(f"{mock.url}/auth.test")
+        time.sleep(0.3)  # Server drops the idle keep-alive connection
+        assert slack_http.get(f"{mock.url}/auth.test").status == 200
+        assert mock.connections == 2
+
+
+def test_unreachable_host_raises_oserror():
+    with MockSlack() as mock:
+        url = f"{mock.url}/auth.test"
+    with pytest.raises(OSError):
+        slack_http.get(url, timeout=1)
+
+
+@pytest.mark.skipif(not shutil.which("openssl"), reason="openssl CLI not installed")
+def test_tls_connections_are_reused(tmp_path, monkeypatch):
+    cert = self_signed_cert(str(tmp_path))
+    monkeypatch.setattr(slack_http, "SSL_CONTEXT", ssl.create_default_context(cafile=cert[0]))
+    with MockSlack(tls=cert) as mock:
+        assert mock.url.startswith("https://")
+        for _ in range(5):
+            assert slack_http.get(f"{mock.url}/auth.test").status == 200
+        assert mock.connections == 1
@@ -0,0 +1,100 @@
+"""Tests for non-blocking Slack 429 handling and limiter metrics."""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+os.environ.setdefault("RELAYGENT_DATA_DIR", "/tmp/relaygent-test-notif")
+
+import pytest
+
+import notif_config as config  # noqa: E402
+import db as notif_db  # noqa: E402
+import slack_api  # noqa: E402
+import slack_channels  # noqa: E402
+import routes  # noqa: E402, F401 — registers the Slack views
+import slack_collector  # noqa: E402
+import slack_limits  # noqa: E402
+from slack_mock import MockSlack  # noqa: E402
+
+
+@pytest.fixture
+def mock_slack(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DB_PATH", str(tmp_path / "reminders.db"))
+    notif_db.init_db()
+    token = tmp_path / "token.json"
+    token.write_text(json.dumps({"access_token": "xoxp-test"}))
+    monkeypatch.setattr(slack_collector, "SLACK_TOKEN_PATH", str(token))
+    monkeypatch.setattr(slack_collector, "_LAST_CHECK_FILE", str(tmp_path / "last"))
+    monkeypatch.setattr(slack_collector, "_SELF_UID", None)
+    monkeypatch.setattr(slack_api, "limiter", slack_limits.SlackRateLimiter())
+    slack_channels.reset()
+    with MockSlack(channels=6, latest_hints=True) as mock:
+        monkeypatch.setattr(slack_api, "SLACK_API_BASE", mock.url)
+        yield mock
+
+
+def poll():
+    found = []
+    slack_collector.collect(found)
+    return {c["id"] for c in found[0]["channels"]} if found else set()
+
+
+def test_429_defers_without_sleeping(mock_slack):
+    mock_slack.limited["conversations.history"] = 30
+    start = time.monotonic()
+    assert poll() == set()
+    assert time.monotonic() - start < 1  # Previously slept up to 10s per retry
+    # Only calls already in flight reach Slack; then the method is deferred
+    sent = mock_slack.count("conversations.history")
+    assert 1 <= sent <= slack_collector.HISTORY_WORKERS
+    assert poll() == set()
+    assert mock_slack.count("conversations.history") == sent
+    assert slack_api.limiter.blocked_for("conversations.history") > 25
+
+
+def test_listing_429_serves_cached_results(mock_slack):
+    assert poll() == {"C00", "C02", "C04"}
+    mock_slack.limited["conversations.list"] = 60
+    mock_slack.post("C04", "newer")
+    mock_slack.calls.clear()
+    assert poll() == {"C00", "C02", "C04"}  # From the cached listing and summaries
+    assert mock_slack.count("conversations.list") == 1
+    assert mock_slack.count("conversations.history") == 0  # Listing hints are stale too
+
+
+def test_deferred_method_recovers_after_window(mock_slack):
+    mock_slack.limited["conversations.history"] = 1
+    assert poll() == set()
+    del mock_slack.limited["conversations.history"]
+    assert poll() == set()  # Still inside Retry-After
+    time.sleep(1.1)
+    assert poll() == {"C00", "C02", "C04"}
+
+
+def test_limits_endpoint_reports_metrics(mock_slack):
+    mock_slack.limited["conversations.history"] = 30
+    poll()
+    poll()
+    metrics = config.app.test_client().get("/notifications/slack/limits").get_json()
+    history = metrics["conversations.history"]
+    assert history["rate_limited"] == history["allowed"] == mock_slack.count(
+        "conversations.history")
+    assert history["deferred"] >= 1
+    assert history["blocked_for"] > 25
+    assert history["capacity"] == 50
+    assert metrics["conversations.list"]["allowed"] == 2
+
+
+def test_rate_limited_window_extends_never_shrinks():
+    limiter = slack_limits.SlackRateLimiter()
+    limiter.rate_limited("users.info", 30)
+    limiter.rate_limited("users.info", 1)
+    assert limiter.blocked_for("users.info") > 25
+    assert not limiter.acquire("users.info")
+    assert limiter.acquire("auth.test")
@@ -0,0 +1,126 @@
+"""Tests for the notification event bus and SSE stream."""
+from __future__ import annotations
+
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+os.environ.setdefault("RELAYGENT_DATA_DIR", "/tmp/relaygent-test-notif")
+
+import pytest
+
+import notif_config as config  # noqa: E402
+import db as notif_db  # noqa: E402
+import collectors  # noqa: E402
+import events  # noqa: E402
+import reminders  # noqa: E402, F401 — registers /reminder
+import routes as routes_mod  # noqa: E402
+import stream  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _isolated(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DB_PATH", str(tmp_path / "reminders.db"))
+    monkeypatch.setattr(stream, "KEEPALIVE", 0.05)
+    monkeypatch.setattr(stream, "_watch", lambda: None)
+    monkeypatch.setattr(events, "_states", {})
+    notif_db.close_all()
+    notif_db.init_db()
+
+
+@pytest.fixture()
+def client():
+    config.app.config["TESTING"] = True
+    with config.app.test_client() as c:
+        yield c
+
+
+def _read(resp, count):
+    """Read count SSE events (skipping keepalives) from a streaming response."""
+    out, chunks = [], iter(resp.response)
+    for _ in range(200):  # ~10s of keepalives before giving up
+        if len(out) == count:
+            break
+        chunk = next(chunks).decode()
+        if chunk.startswith(":"):
+            continue
+        fields = dict(line.split(": ", 1) for line in chunk.strip().split("\n"))
+        out.append((fields["id"], fields["event"], json.loads(fields["data"])))
+    resp.close()
+    return out
+
+
+class TestEventBus:
+    def test_ids_increase(self):
+        a = events.publish("test", {})
+        b = events.publish("test", {})
+        assert events.parse_id(b)[0] == events.parse_id(a)[0] + 1
+
+    def test_state_published_only_on_change(self):
+        assert events.publish_state("chat", {"count": 1}) is not None
+        assert events.publish_state("chat", {"count": 1}) is None
+        assert events.publish_state("chat", None) is not None
+
+    def test_empty_initial_state_not_published(self):
+        assert events.publish_state("slack", None) is None
+
+    def test_unknown_boot_is_gap(self):
+        assert events.parse_id("deadbeef-3")[1] is True
+
+    def test_evicted_is_gap(self, monkeypatch):
+        monkeypatch.setattr(events, "_buffer", events.collections.deque(maxlen=2))
+        first = events.publish("test", {})
+        for _ in range(3):
+            events.publish("test", {})
+        assert events.parse_id(first)[1] is True
+
+
+class TestStreamEndpoint:
+    def test_content_type(self, client):
+        resp = client.get("/notifications/stream", buffered=False)
+        assert resp.mimetype == "text/event-stream"
+        resp.close()
+
+    def test_resume_from_last_event_id(self, client):
+        start = events.head()
+        events.publish("reminder", {"id": 1})
+        events.publish("chat", {"count": 2})
+        resp = client.get("/notifications/stream", buffered=False,
+                          headers={"Last-Event-ID": start})
+        got = _read(resp, 2)
+        assert [(kind, data) for _, kind, data in got] == [
+            ("reminder", {"id": 1}), ("chat", {"count": 2})]
+
+    def test_resume_via_query_param(self, client):
+        start = events.head()
+        events.publish("slack", {"count": 1})
+        resp = client.get(f"/notifications/stream?last_event_id={start}", buffered=False)
+        assert _read(resp, 1)[0][1] == "slack"
+
+    def test_reset_on_unknown_id(self, client):
+        resp = client.get("/notifications/stream", buffered=False,
+                          headers={"Last-Event-ID": "0-1"})
+        assert _read(resp, 1)[0][1] == "reset"
+
+    def test_reminder_fire_published(self, client):
+        start = events.head()
+        client.post("/reminder", json={
+            "trigger_time": (datetime.now() - timedelta(minutes=1)).isoformat(),
+            "message": "streamed"})
+        routes_mod._collect_due_reminders([])
+        resp = client.get("/notifications/stream", buffered=False,
+                          headers={"Last-Event-ID": start})
+        _, kind, data = _read(resp, 1)[0]
+        assert kind == "reminder" and data["message"] == "streamed"
+
+    def test_slow_collector_state_published(self):
+        start = events.head()
+        found = collectors.run_collector(
+            "slack", lambda n: n.append({"source": "slack", "count": 3}))
+        assert found == [{"source": "slack", "count": 3}]
+        batch = events.wait_since(events.parse_id(start)[0], 0)
+        assert batch[-1][1:] == ("slack", {"source": "slack", "count": 3})
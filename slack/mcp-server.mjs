@@ -11,6 +11,7 @@ import { userName, dmName, formatText } from "./slack-helpers.mjs";
 
 const SOCKET_CACHE = "/tmp/relaygent-slack-socket-cache.json";
 const LAST_ACK = join(homedir(), ".relaygent", "slack", ".last_check_ts");
+const READ_CURSORS = join(homedir(), ".relaygent", "slack", "read_cursors.json");  // Per-channel acks
 
 const server = new McpServer({ name: "slack", version: "1.0.0" });
 const txt = (t) => ({ content: [{ type: "text", text: t }] });
@@ -145,8 +146,11 @@ server.tool("unread", "Check channels with unread messages.", {},
 			if (existsSync(SOCKET_CACHE)) {
 				let ackTs = 0;
 				try { ackTs = parseFloat(readFileSync(LAST_ACK, "utf-8").trim()) || 0; } catch {}
+				let cursors = {};
+				try { cursors = JSON.parse(readFileSync(READ_CURSORS, "utf-8")); } catch {}
 				const sock = JSON.parse(readFileSync(SOCKET_CACHE, "utf-8"));
-				const msgs = (sock.messages || []).filter(m => parseFloat(m.ts || "0") > ackTs);
+				const msgs = (sock.messages || []).filter(m => parseFloat(m.ts || "0") >
+					Math.max(ackTs, parseFloat(cursors[m.channel] || "0")));
 				if (msgs.length > 0) {
 					const lines = await Promise.all(msgs.map(async m => {
 						const ts = new Date(parseFloat(m.ts) * 1000)